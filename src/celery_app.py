@@ -5,7 +5,11 @@ from stores.llm.templates.template_parser import TemplateParser
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from motor.motor_asyncio import AsyncIOMotorClient
 import logging
-from models.enums import DatabaseType
+from models import ModelFactory
+from models.enums import DatabaseType, IdempotencyBackendEnum
+from utils.worker_metrics import setup_worker_metrics
+from utils.task_progress import TaskProgressChannel
+from utils.task_lease import TaskLeaseStore
 
 logger = logging.getLogger("celery.worker")
 
@@ -15,13 +19,19 @@ class CeleryContext:
     def __init__(self):
         self.db_engine = None
         self.db_client = None
+        self.pg_session_factory = None
         self.generation_client = None
         self.embedding_client = None
         self.vectordb_client = None
         self.template_parser = None
+        self.project_model = None
+        self.asset_model = None
+        self.chunk_model = None
+        self.task_progress = None
+        self.lease_store = None
         self.DB_TYPE = settings.DB_TYPE
 
-async def get_setup_utils():
+async def get_setup_utils(with_llm_clients: bool = True):
     settings = get_settings()
     ctx = CeleryContext()
     
@@ -37,28 +47,36 @@ async def get_setup_utils():
     
     # Set active db_client based on DB_TYPE
     if settings.DB_TYPE == DatabaseType.MONGODB.value:
-        db_client = AsyncIOMotorClient(settings.MONGO_URI)
+        db_client = AsyncIOMotorClient(settings.MONGO_URI)[settings.MONGODB_NAME]
         logger.info("✅ Using MongoDB as active database")
     else:
         db_client = pg_session_factory
         logger.info("✅ Using PostgreSQL as active database")
     
     ctx.db_client = db_client
+    ctx.pg_session_factory = pg_session_factory
+    
+    # built once per task run, the task steps share them
+    data_models = await ModelFactory.create_all_models(db_type=settings.DB_TYPE, db_client=db_client)
+    ctx.project_model = data_models['project']
+    ctx.asset_model = data_models['asset']
+    ctx.chunk_model = data_models['chunk']
 
     llm_provider_factory = LLMFactory(settings)
     vectordb_provider_factory = VectorDBFactory(settings=settings, db_client=db_client)
 
-    # generation client
-    generation_client = llm_provider_factory.create(provider_cls=settings.GENERATION_BACKEND)
-    generation_client.set_generation_model(model_id = settings.GENERATION_MODEL_ID)
-    
-    ctx.generation_client = generation_client
+    if with_llm_clients:
+        # generation client
+        generation_client = llm_provider_factory.create(provider_cls=settings.GENERATION_BACKEND)
+        generation_client.set_generation_model(model_id = settings.GENERATION_MODEL_ID)
+        
+        ctx.generation_client = generation_client
 
-    # embedding client
-    embedding_client = llm_provider_factory.create(provider_cls=settings.EMBEDDING_BACKEND)
-    embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
-                                             embedding_size=settings.EMBEDDING_MODEL_SIZE)
-    ctx.embedding_client = embedding_client
+        # embedding client
+        embedding_client = llm_provider_factory.create(provider_cls=settings.EMBEDDING_BACKEND)
+        embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                                 embedding_size=settings.EMBEDDING_MODEL_SIZE)
+        ctx.embedding_client = embedding_client
     
     # vector db client
     vectordb_client = vectordb_provider_factory.create(
@@ -75,8 +93,28 @@ async def get_setup_utils():
 
     ctx.template_parser = template_parser
     
+    # batch-level progress, streamed to clients by the tasks route
+    ctx.task_progress = TaskProgressChannel(
+        redis_url=settings.TASK_PROGRESS_REDIS_URL or settings.CELERY_RESULT_BACKEND,
+        ttl_seconds=settings.TASK_PROGRESS_TTL_SECONDS
+    )
+    
+    ctx.lease_store = get_lease_store(settings)
+    
     return ctx
 
+
+def get_lease_store(settings):
+    """Redis leases of the idempotency manager, None with the DATABASE backend."""
+    if settings.IDEMPOTENCY_BACKEND != IdempotencyBackendEnum.REDIS.value:
+        return None
+    
+    return TaskLeaseStore(
+        redis_url=settings.IDEMPOTENCY_REDIS_URL or settings.CELERY_RESULT_BACKEND,
+        lease_ms=settings.IDEMPOTENCY_LEASE_MS,
+        state_ttl_seconds=settings.IDEMPOTENCY_STATE_TTL_SECONDS
+    )
+
 # Create Celery application instance
 celery_app = Celery(
     "minirag",
@@ -88,6 +126,7 @@ celery_app = Celery(
         "tasks.data_indexing",
         "tasks.process_workflow",
         "tasks.maintenance",
+        "tasks.vector_migration",
     ]
 )
 
@@ -123,6 +162,7 @@ celery_app.conf.update(
         "tasks.process_workflow.process_and_push_workflow": {"queue": "process_push_workflow_queue"},
         "tasks.process_workflow.push_task": {"queue": "data_indexing_queue"},
         "tasks.maintenance.clean_celery_executions_table": {"queue": "default"},
+        "tasks.vector_migration.migrate_vectors": {"queue": "data_indexing_queue"},
     },
     
     beat_schedule={
@@ -137,3 +177,5 @@ celery_app.conf.update(
 )
 
 celery_app.conf.default_queue = "default"
+
+setup_worker_metrics(settings)
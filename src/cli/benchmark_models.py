@@ -0,0 +1,110 @@
+"""
+Measure the database round trips and latency per request of creating the data
+models with ModelFactory on every request, against using the models built once
+at startup. Each simulated request loads one project, like the nlp routes do.
+
+MongoDB round trips are counted with command monitoring, PostgreSQL round trips
+as executed statements.
+
+Run from src/:
+
+    python -m cli.benchmark_models 1                 # 100 requests per mode for project 1
+    python -m cli.benchmark_models 1 -n 1000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from sqlalchemy import event
+
+from helpers.config import get_settings
+from models import ModelFactory, DatabaseType
+from .utils import setup_cli_logging, create_pg_session_factory
+
+logger = logging.getLogger(__name__)
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+    
+    def started(self, event):
+        self.count += 1
+    
+    def succeeded(self, event):
+        pass
+    
+    def failed(self, event):
+        pass
+    
+    def on_cursor_execute(self, *args):
+        self.count += 1
+
+
+async def run_benchmark(project_id: str, requests_count: int = 100) -> dict:
+    """
+    Returns:
+        Per mode: round trips and milliseconds per request
+    """
+    settings = get_settings()
+    counter = RoundTripCounter()
+    db_engine, session_factory = create_pg_session_factory(settings)
+    
+    if settings.DB_TYPE == DatabaseType.MONGODB.value:
+        db_client = AsyncIOMotorClient(settings.MONGO_URI, event_listeners=[counter])[settings.MONGODB_NAME]
+    else:
+        project_id = int(project_id)
+        event.listen(db_engine.sync_engine, "before_cursor_execute", counter.on_cursor_execute)
+        db_client = session_factory
+    
+    try:
+        startup_project_model = await ModelFactory.create_project_model(db_type=settings.DB_TYPE, db_client=db_client)
+        
+        async def per_request_models():
+            project_model = await ModelFactory.create_project_model(db_type=settings.DB_TYPE, db_client=db_client)
+            return await project_model.get_project_or_create_one(project_id=project_id)
+        
+        async def startup_models():
+            return await startup_project_model.get_project_or_create_one(project_id=project_id)
+        
+        report = {}
+        for mode, handle_request in (("per_request", per_request_models), ("startup", startup_models)):
+            # warm up connections, and create the project if it does not exist yet
+            await handle_request()
+            
+            counter.count = 0
+            start = time.perf_counter()
+            for _ in range(requests_count):
+                await handle_request()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            report[mode] = {
+                "round_trips": round(counter.count / requests_count, 2),
+                "latency_ms": round(elapsed_ms / requests_count, 3)
+            }
+            logger.info(
+                f"{mode} models | {settings.DB_TYPE} | round trips per request: {report[mode]['round_trips']} | "
+                f"ms per request: {report[mode]['latency_ms']}"
+            )
+        
+        return report
+    
+    finally:
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-request and startup-time data models.")
+    parser.add_argument("project_id", help="project loaded by every simulated request")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="simulated requests per mode")
+    args = parser.parse_args()
+    
+    setup_cli_logging()
+    asyncio.run(run_benchmark(project_id=args.project_id, requests_count=args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Micro-benchmark the template rendering of RAG prompt assembly: the system and
+footer prompts plus one document prompt per retrieved chunk, as PromptBuilder
+renders them for every answer.
+
+Run from src/:
+
+    python -m cli.benchmark_prompt                   # top_k=50, english templates
+    python -m cli.benchmark_prompt --top-k 10 --language ar -n 5000
+"""
+import argparse
+import logging
+import time
+
+from stores.llm.templates.template_parser import TemplateParser
+from .utils import setup_cli_logging
+
+logger = logging.getLogger(__name__)
+
+
+def run_benchmark(top_k: int = 50, language: str = "en", iterations: int = 1000) -> float:
+    """
+    Returns:
+        Microseconds per assembled prompt
+    """
+    template_parser = TemplateParser(language=language)
+    chunk_text = " ".join(["retrieved chunk text"] * 60)
+    
+    start = time.perf_counter()
+    for _ in range(iterations):
+        template_parser.get_text(group="rag", key="system_prompt")
+        for doc_num in range(1, top_k + 1):
+            template_parser.get_text(group="rag", key="document_prompt", vars={"doc_num": doc_num, "chunk_text": chunk_text})
+        template_parser.get_text(group="rag", key="footer_prompt", vars={"query": "What does the document say?"})
+    elapsed_us = (time.perf_counter() - start) * 1e6 / iterations
+    
+    logger.info(f"top_k: {top_k} | language: {template_parser.language} | {elapsed_us:.1f} us per prompt "
+                f"({elapsed_us / (top_k + 2):.2f} us per template)")
+    return elapsed_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RAG prompt template rendering.")
+    parser.add_argument("--top-k", type=int, default=50, help="document prompts per assembled prompt")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("-n", "--iterations", type=int, default=1000, help="prompts assembled")
+    args = parser.parse_args()
+    
+    setup_cli_logging()
+    run_benchmark(top_k=args.top_k, language=args.language, iterations=args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Copy vector collections from one VECTOR_DB_BACKEND to another without re-embedding:
+vectors, texts and metadata are streamed from the source backend in batches
+and bulk loaded into the target, then record counts are compared.
+
+Run from src/, then switch VECTOR_DB_BACKEND to the target:
+    
+    python -m cli.migrate_vectors QDRANT PGVECTOR                 # every project
+    python -m cli.migrate_vectors QDRANT PGVECTOR -p 1 -p 2       # selected projects
+    python -m cli.migrate_vectors QDRANT PGVECTOR --reset         # recreate target collections first
+"""
+import argparse
+import asyncio
+import logging
+
+from helpers.config import get_settings
+from models import ModelFactory
+from stores import VectorDBFactory
+from controllers import VectorMigrationController
+from .utils import setup_cli_logging, create_pg_session_factory, create_db_client
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_vectors(source_backend: str, 
+                          target_backend: str, 
+                          project_ids: list = None, 
+                          batch_size: int = 1000, 
+                          do_reset: bool = False) -> bool:
+    settings = get_settings()
+    
+    if source_backend == target_backend:
+        raise SystemExit("Source and target vector db backends must differ.")
+    
+    db_engine, session_factory = create_pg_session_factory(settings)
+    vectordb_factory = VectorDBFactory(settings, db_client=session_factory)
+    source_client = vectordb_factory.create(source_backend)
+    target_client = vectordb_factory.create(target_backend)
+    
+    if not source_client or not target_client:
+        raise SystemExit(f"Invalid vector db backend: {source_backend if not source_client else target_backend}")
+    
+    try:
+        await source_client.connect()
+        await target_client.connect()
+        
+        if not project_ids:
+            project_model = await ModelFactory.create_project_model(
+                db_type=settings.DB_TYPE,
+                db_client=create_db_client(settings, session_factory)
+            )
+            project_ids = await VectorMigrationController.get_all_project_ids(project_model)
+        logger.info(f"Migrating {len(project_ids)} project(s) from {source_backend} to {target_backend}.")
+        
+        migration_controller = VectorMigrationController(source_client=source_client, target_client=target_client)
+        reports = await migration_controller.migrate_projects(
+            project_ids=project_ids,
+            batch_size=batch_size,
+            do_reset=do_reset
+        )
+        
+        for report in reports:
+            logger.info(
+                f"{report['collection_name']}: migrated {report['migrated_count']} | "
+                f"source {report['source_count']} | target {report['target_count']} | "
+                f"{'verified' if report['verified'] else 'COUNT MISMATCH'}"
+            )
+        
+        is_verified = all(report["verified"] for report in reports)
+        logger.info(
+            f"Migrated {sum(report['migrated_count'] for report in reports)} record(s) "
+            f"from {len(reports)} collection(s); {'all counts match' if is_verified else 'some counts do not match'}."
+        )
+        return is_verified
+    
+    finally:
+        await source_client.disconnect()
+        await target_client.disconnect()
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy vector collections between vector db backends without re-embedding.")
+    parser.add_argument("source_backend", help="backend to read from, e.g. QDRANT")
+    parser.add_argument("target_backend", help="backend to write to, e.g. PGVECTOR")
+    parser.add_argument("-p", "--project", action="append", dest="project_ids",
+                        help="project to migrate (repeatable); defaults to every project")
+    parser.add_argument("--batch-size", type=int, default=1000, help="records read and written per batch")
+    parser.add_argument("--reset", action="store_true", help="recreate the target collections before copying")
+    args = parser.parse_args()
+    
+    setup_cli_logging()
+    is_verified = asyncio.run(migrate_vectors(
+        source_backend=args.source_backend,
+        target_backend=args.target_backend,
+        project_ids=args.project_ids,
+        batch_size=args.batch_size,
+        do_reset=args.reset
+    ))
+    
+    if not is_verified:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
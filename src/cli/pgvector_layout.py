@@ -0,0 +1,71 @@
+"""
+Move PgVector collections from the per-project table layout
+(collection_{size}_{project_id}) into the shared hash-partitioned layout.
+
+Set VECTOR_DB_PGVEC_TABLE_LAYOUT="partitioned" in .env first, then run from src/:
+
+    python -m cli.pgvector_layout                     # migrate every per-project table
+    python -m cli.pgvector_layout -c collection_384_1 # migrate a single collection
+    python -m cli.pgvector_layout --dry-run           # only list what would be moved
+"""
+import argparse
+import asyncio
+import logging
+
+from helpers.config import get_settings
+from stores import VectorDBFactory
+from stores.vectordb.VectorDBEnums import VectorDBEnums, PgVectorTableLayoutEnums
+from .utils import setup_cli_logging, create_pg_session_factory
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate_layout(collections: list = None, dry_run: bool = False) -> int:
+    settings = get_settings()
+    
+    if settings.VECTOR_DB_PGVEC_TABLE_LAYOUT != PgVectorTableLayoutEnums.PARTITIONED.value:
+        raise SystemExit("VECTOR_DB_PGVEC_TABLE_LAYOUT must be 'partitioned' before migrating.")
+    
+    db_engine, session_factory = create_pg_session_factory(settings)
+    
+    try:
+        vectordb_client = VectorDBFactory(settings, db_client=session_factory).create(VectorDBEnums.PGVECTOR.value)
+        await vectordb_client.connect()
+        
+        collections = collections or await vectordb_client.list_per_project_tables()
+        logger.info(f"Found {len(collections)} per-project collection(s) to migrate.")
+        
+        moved_count = 0
+        migrated_tables = set()
+        for collection_name in collections:
+            if dry_run:
+                logger.info(f"[dry-run] would migrate: {collection_name}")
+                continue
+            
+            moved_count += await vectordb_client.migrate_collection_to_partitioned(collection_name=collection_name)
+            migrated_tables.add(collection_name)
+        
+        # build the (per-partition) vector indexes once, after all rows are in place
+        for collection_name in migrated_tables:
+            await vectordb_client.create_vector_index(collection_name=collection_name)
+        
+        logger.info(f"Migrated {moved_count} record(s) from {len(migrated_tables)} collection(s).")
+        return moved_count
+    
+    finally:
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate PgVector per-project tables to the partitioned layout.")
+    parser.add_argument("-c", "--collection", action="append", dest="collections",
+                        help="collection to migrate (repeatable); defaults to all per-project tables")
+    parser.add_argument("--dry-run", action="store_true", help="list the collections without moving them")
+    args = parser.parse_args()
+    
+    setup_cli_logging()
+    asyncio.run(migrate_layout(collections=args.collections, dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Export a project (assets metadata, chunks and vectors) to a snapshot directory of
+zstd-compressed Arrow IPC files, or import a snapshot into a project, e.g. to back
+up a project or move it between environments without reprocessing its files.
+
+Run from src/:
+
+    python -m cli.snapshot export 1 ./snapshots/project_1             # export project 1
+    python -m cli.snapshot import 7 ./snapshots/project_1             # import into project 7
+    python -m cli.snapshot import 7 ./snapshots/project_1 --reset     # replace project 7 chunks and vectors
+"""
+import argparse
+import asyncio
+import logging
+
+from helpers.config import get_settings
+from models import ModelFactory, DatabaseType
+from stores import VectorDBFactory
+from controllers import SnapshotController
+from .utils import setup_cli_logging, create_pg_session_factory, create_db_client
+
+logger = logging.getLogger(__name__)
+
+
+async def run_snapshot(action: str, 
+                       project_id: str, 
+                       snapshot_path: str, 
+                       batch_size: int = 1000, 
+                       do_reset: bool = False) -> bool:
+    settings = get_settings()
+    
+    if settings.DB_TYPE == DatabaseType.POSTGRES.value:
+        project_id = int(project_id)
+    
+    db_engine, session_factory = create_pg_session_factory(settings)
+    vectordb_client = VectorDBFactory(settings, db_client=session_factory).create(settings.VECTOR_DB_BACKEND)
+    
+    try:
+        await vectordb_client.connect()
+        
+        db_client = create_db_client(settings, session_factory)
+        project_model = await ModelFactory.create_project_model(db_type=settings.DB_TYPE, db_client=db_client)
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+        
+        snapshot_controller = SnapshotController(
+            vectordb_client=vectordb_client,
+            db_client=db_client,
+            db_type=settings.DB_TYPE
+        )
+        
+        if action == "export":
+            await snapshot_controller.export_project(project=project, snapshot_path=snapshot_path, batch_size=batch_size)
+            return True
+        
+        report = await snapshot_controller.import_project(project=project, snapshot_path=snapshot_path, do_reset=do_reset)
+        logger.info(
+            f"Imported into project: {report['project_id']} | assets: {report['asset_count']} | "
+            f"chunks: {report['chunk_count']} | vectors: {report['vector_count']} | "
+            f"{'verified' if report['verified'] else 'COUNT MISMATCH'}"
+        )
+        return report["verified"]
+    
+    finally:
+        await vectordb_client.disconnect()
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import a project snapshot.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("project_id", help="project to export from or import into")
+    parser.add_argument("snapshot_path", help="snapshot directory")
+    parser.add_argument("--batch-size", type=int, default=1000, help="chunks and vectors read per batch on export")
+    parser.add_argument("--reset", action="store_true", help="delete the project chunks and vectors before importing")
+    args = parser.parse_args()
+    
+    setup_cli_logging()
+    is_verified = asyncio.run(run_snapshot(
+        action=args.action,
+        project_id=args.project_id,
+        snapshot_path=args.snapshot_path,
+        batch_size=args.batch_size,
+        do_reset=args.reset
+    ))
+    
+    if not is_verified:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
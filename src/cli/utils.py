@@ -0,0 +1,33 @@
+import logging
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from motor.motor_asyncio import AsyncIOMotorClient
+from helpers.config import Settings
+from models.enums import DatabaseType
+
+
+def setup_cli_logging():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+
+def create_pg_session_factory(settings: Settings):
+    """
+    Returns:
+        (db_engine, session_factory)
+    """
+    pg_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DB}"
+    db_engine = create_async_engine(pg_conn)
+    
+    session_factory = async_sessionmaker(
+        db_engine, 
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+    
+    return db_engine, session_factory
+
+
+def create_db_client(settings: Settings, session_factory: async_sessionmaker):
+    """The client the data models expect for DB_TYPE."""
+    if settings.DB_TYPE == DatabaseType.MONGODB.value:
+        return AsyncIOMotorClient(settings.MONGO_URI)[settings.MONGODB_NAME]
+    return session_factory
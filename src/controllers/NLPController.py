@@ -1,19 +1,32 @@
 from typing import List, Union
 
 from models.enums.DatabaseTypeEnum import DatabaseType
+from models.enums import AnswerStageEnums, IndexingStageEnums
 from .BaseController import BaseController
 from stores.vectordb import VectorDBInterface
 from stores.llm import LLMInterface
 from stores.llm.LLMEnums import DocumentTypeEnums
+from stores.vectordb.VectorDBEnums import SearchModeEnums
 from stores.llm.templates.template_parser import TemplateParser
+from stores.reranker import RerankerInterface
+from stores.llm.templates.prompt_builder import PromptBuilder
+from utils.semantic_cache import SemanticAnswerCache
+from utils.tracing import observe_stage, get_backend_name
+from utils.worker_metrics import observe_indexing_batch
+import asyncio
 import json
+import logging
+
+logger = logging.getLogger('uvicorn')
 
 class NLPController(BaseController):
     def __init__(self, 
                  vectordb_client, 
                  generation_client, 
                  embedding_client, 
-                 template_parser):
+                 template_parser, 
+                 reranker_client=None, 
+                 answer_cache=None):
         
         super().__init__()
         
@@ -21,7 +34,9 @@ class NLPController(BaseController):
         self.generation_client: LLMInterface = generation_client
         self.embedding_client: LLMInterface = embedding_client
         self.template_parser: TemplateParser = template_parser
-        
+        self.reranker_client: RerankerInterface = reranker_client
+        self.answer_cache: SemanticAnswerCache = answer_cache
+    
     def generate_collection_name(self, project_id: Union[int, str]):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
     
@@ -29,9 +44,9 @@ class NLPController(BaseController):
         collection_name = self.generate_collection_name(project_id=project.project_id)
         return await self.vectordb_client.delete_collection(collection_name=collection_name)
         
-    async def get_vector_collection_info(self, project):
+    async def get_vector_collection_info(self, project, exact: bool=False):
         collection_name = self.generate_collection_name(project_id=project.project_id)
-        collection_info = await self.vectordb_client.get_collection_info(collection_name=collection_name)
+        collection_info = await self.vectordb_client.get_collection_info(collection_name=collection_name, exact=exact)
         return json.loads(
             json.dumps(collection_info, default=lambda o: o.__dict__)
             )
@@ -48,7 +63,8 @@ class NLPController(BaseController):
         # manage items
         filtered_items = [(c.chunk_text, c.chunk_metadata) for c in chunks] # get texts and metadatas
         texts, metadatas = zip(*filtered_items) # transpose into two tiples
-        vectors = self.embedding_client.embed_text(text=texts, document_type=DocumentTypeEnums.DOCUMENT.value) 
+        with observe_indexing_batch(IndexingStageEnums.EMBEDDING.value, backend=get_backend_name(self.embedding_client)):
+            vectors = self.embedding_client.embed_text(text=texts, document_type=DocumentTypeEnums.DOCUMENT.value) 
         
         # create collection
         await self.vectordb_client.create_collection(
@@ -59,22 +75,58 @@ class NLPController(BaseController):
         
         
         # insert into db
-        await self.vectordb_client.insert_many(
-            collection_name=collection_name,
-            texts=list(texts),
-            vectors=vectors,
-            metadatas=list(metadatas),
-            record_ids=chunks_ids
-        )
+        with observe_indexing_batch(IndexingStageEnums.UPSERT.value, backend=get_backend_name(self.vectordb_client)):
+            await self.vectordb_client.insert_many(
+                collection_name=collection_name,
+                texts=list(texts),
+                vectors=vectors,
+                metadatas=list(metadatas),
+                record_ids=chunks_ids
+            )
         
         return True
 
     async def search_vector_db(self, 
                          project, 
                          query_text: str, 
-                         top_k: int =5):
+                         top_k: int =5,
+                         search_mode: str =None,
+                         filters: dict =None,
+                         query_vector: list =None,
+                         with_vectors: bool =False):
+        search_mode = search_mode or self.app_settings.VECTOR_DB_SEARCH_MODE
         collection_name = self.generate_collection_name(project_id=project.project_id)
         
+        if query_vector is None:
+            query_vector = self.embed_query(query_text=query_text)
+        
+        if not query_vector or len(query_vector) == 0:
+            return False
+        
+        if search_mode == SearchModeEnums.HYBRID.value:
+            results = await self.vectordb_client.search_hybrid(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                query_text=query_text,
+                top_k=top_k,
+                filters=filters,
+                with_vectors=with_vectors
+            )
+        else:
+            results = await self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                top_k=top_k,
+                filters=filters,
+                with_vectors=with_vectors
+            )
+        
+        if not results:
+            return False
+        
+        return results
+
+    def embed_query(self, query_text: str):
         query_vector = self.embedding_client.embed_text(
             text=query_text,
             document_type=DocumentTypeEnums.QUERY.value
@@ -83,13 +135,86 @@ class NLPController(BaseController):
         if isinstance(query_vector, list) and len(query_vector) > 0:
             query_vector = query_vector[0]
         
-        if not query_vector or len(query_vector) == 0:
+        return query_vector
+
+    async def rerank_documents(self, 
+                               query_text: str, 
+                               documents: List, 
+                               top_k: int, 
+                               query_vector: list =None) -> List:
+        if not self.reranker_client:
+            return documents[:top_k]
+        
+        document_vectors = None
+        if self.reranker_client.requires_vectors:
+            # candidates come with their stored vectors, only the ones without are embedded
+            document_vectors = [doc.vector for doc in documents]
+            missing = [idx for idx, vector in enumerate(document_vectors) if vector is None]
+            if missing:
+                embedded_vectors = await asyncio.to_thread(
+                    self.embedding_client.embed_text,
+                    text=[documents[idx].text for idx in missing],
+                    document_type=DocumentTypeEnums.DOCUMENT.value
+                )
+                for idx, vector in zip(missing, embedded_vectors or []):
+                    document_vectors[idx] = vector
+            
+            if any(vector is None for vector in document_vectors):
+                document_vectors = None
+        
+        # reranking is CPU bound, keep it off the event loop
+        return await asyncio.to_thread(
+            self.reranker_client.rerank,
+            query_text=query_text,
+            documents=documents,
+            top_k=top_k,
+            query_vector=query_vector,
+            document_vectors=document_vectors
+        )
+
+    async def search_vector_db_many(self, 
+                              project, 
+                              query_texts: List[str], 
+                              top_k: int =5,
+                              search_mode: str =None,
+                              filters: dict =None):
+        search_mode = search_mode or self.app_settings.VECTOR_DB_SEARCH_MODE
+        collection_name = self.generate_collection_name(project_id=project.project_id)
+        
+        if not query_texts:
             return False
         
-        results = await self.vectordb_client.search_by_vector(
+        # a single provider call embeds every query
+        query_vectors = self.embedding_client.embed_text(
+            text=list(query_texts),
+            document_type=DocumentTypeEnums.QUERY.value
+        )
+        
+        if not query_vectors or len(query_vectors) != len(query_texts):
+            return False
+        
+        if search_mode == SearchModeEnums.HYBRID.value:
+            # the lexical side has no batched form, the fused searches run concurrently
+            results = await asyncio.gather(*[
+                self.vectordb_client.search_hybrid(
+                    collection_name=collection_name,
+                    query_vector=query_vector,
+                    query_text=query_text,
+                    top_k=top_k,
+                    filters=filters
+                ) for query_text, query_vector in zip(query_texts, query_vectors)
+            ])
+            
+            if any(query_results is False for query_results in results):
+                return False
+            
+            return [query_results or [] for query_results in results]
+        
+        results = await self.vectordb_client.search_many(
             collection_name=collection_name,
-            query_vector=query_vector,
-            top_k=top_k
+            query_vectors=query_vectors,
+            top_k=top_k,
+            filters=filters
         )
         
         if not results:
@@ -102,48 +227,140 @@ class NLPController(BaseController):
                      query_text: str, 
                      top_k: int =5, 
                      max_output_tokens: int = 512, 
-                     temperature: float = 0.2):
+                     temperature: float = 0.2,
+                     search_mode: str = None,
+                     filters: dict = None):
         
+        """
+        With a reranker configured, RERANKER_CANDIDATES documents are fetched
+        and reranked down to top_k before they reach the prompt.
+        
+        The prompt is assembled within GENERATION_INPUT_MAX_TOKENS, minus the
+        tokens reserved for the answer.
+        
+        With an answer cache, a query close enough to one already answered for
+        the same project and parameters returns the stored answer.
+        
+        Returns:
+            Tuple of (answer, full_prompt, chat_history, answer_stats); answer_stats
+            holds the stage timings in milliseconds, the token counts and whether
+            the answer came from the cache
+        """
         answer, full_prompt, chat_history = (None,) * 3
+        answer_stats = {"stage_timings": {}, "token_counts": None, "cache_hit": False}
+        stage_timings = answer_stats["stage_timings"]
+        collection_name = self.generate_collection_name(project_id=project.project_id)
+        
+        embedding_backend = get_backend_name(self.embedding_client)
+        generation_backend = get_backend_name(self.generation_client)
+        vectordb_backend = get_backend_name(self.vectordb_client)
+        
+        # embedded once, for the cache, the search and the reranker
+        with observe_stage(AnswerStageEnums.QUERY_EMBEDDING.value, 
+                           backend=embedding_backend, 
+                           model=self.embedding_client.embedding_model_id) as stage:
+            query_vector = self.embed_query(query_text=query_text)
+        stage_timings[AnswerStageEnums.QUERY_EMBEDDING.value] = stage.elapsed_ms
+        
+        cache_key = None
+        cached = None
+        if self.answer_cache and query_vector and await self.vectordb_client.is_collection_existed(collection_name):
+            with observe_stage(AnswerStageEnums.CACHE_LOOKUP.value, backend=get_backend_name(self.answer_cache)) as stage:
+                # bumped when the project is reindexed, cached answers go with it
+                index_version = await self.answer_cache.get_index_version(collection_name)
+                if index_version is not None:
+                    cache_key = {
+                        "params_key": SemanticAnswerCache.make_params_key(
+                            top_k=top_k,
+                            max_output_tokens=max_output_tokens,
+                            temperature=temperature,
+                            search_mode=search_mode,
+                            filters=filters
+                        ),
+                        "index_version": index_version,
+                    }
+                    cached = self.answer_cache.lookup(
+                        project_id=project.project_id,
+                        query_vector=query_vector,
+                        **cache_key
+                    )
+            stage_timings[AnswerStageEnums.CACHE_LOOKUP.value] = stage.elapsed_ms
+            
+            if cached:
+                answer_stats["token_counts"] = cached["token_counts"]
+                answer_stats["cache_hit"] = True
+                return cached["answer"], cached["full_prompt"], cached["chat_history"], answer_stats
         
         # search vector db
-        retrieved_docs = await self.search_vector_db(
-            project=project,
-            query_text=query_text,
-            top_k=top_k
-        )
+        with observe_stage(AnswerStageEnums.RETRIEVAL.value, 
+                           backend=vectordb_backend, 
+                           model=search_mode or self.app_settings.VECTOR_DB_SEARCH_MODE) as stage:
+            retrieved_docs = await self.search_vector_db(
+                project=project,
+                query_text=query_text,
+                top_k=max(top_k, self.app_settings.RERANKER_CANDIDATES) if self.reranker_client else top_k,
+                search_mode=search_mode,
+                filters=filters,
+                query_vector=query_vector,
+                with_vectors=bool(self.reranker_client and self.reranker_client.requires_vectors)
+            )
+        stage_timings[AnswerStageEnums.RETRIEVAL.value] = stage.elapsed_ms
         
         if not retrieved_docs or len(retrieved_docs) == 0:
-            return answer, full_prompt, chat_history
-        
-        # prepare context
-        system_prompt = self.template_parser.get_text(group="rag", key="system_prompt")
-        documents_prompts = '\n'.join(
-            self.template_parser.get_text(
-                group="rag", 
-                key="document_prompt", 
-                vars={"doc_num": idx + 1,"chunk_text": self.generation_client.process_text(doc.text)}
-            ) for idx, doc in enumerate(retrieved_docs)
-        )
+            return answer, full_prompt, chat_history, answer_stats
         
-        footer_prompt = self.template_parser.get_text(
-            group="rag", key="footer_prompt", vars={"query": query_text})
+        if self.reranker_client:
+            with observe_stage(AnswerStageEnums.RERANK.value, backend=get_backend_name(self.reranker_client)) as stage:
+                retrieved_docs = await self.rerank_documents(
+                    query_text=query_text,
+                    documents=retrieved_docs,
+                    top_k=top_k,
+                    query_vector=query_vector
+                )
+            stage_timings[AnswerStageEnums.RERANK.value] = stage.elapsed_ms
         
-        # chat history
-        chat_history = [
-            self.generation_client.construct_prompt(prompt=system_prompt, role=self.generation_client.enums.SYSTEM.value),
-        ]
+        # prepare context within the token budget
+        with observe_stage(AnswerStageEnums.PROMPT_ASSEMBLY.value, 
+                           backend=generation_backend, 
+                           model=self.generation_client.generation_model_id) as stage:
+            prompt_builder = PromptBuilder(
+                generation_client=self.generation_client,
+                template_parser=self.template_parser,
+                token_budget=self.app_settings.GENERATION_INPUT_MAX_TOKENS - max_output_tokens,
+                dedup_threshold=self.app_settings.CONTEXT_DEDUP_THRESHOLD if self.app_settings.CONTEXT_PACKING else 1.0,
+                merge_adjacent=self.app_settings.CONTEXT_PACKING and self.app_settings.CONTEXT_MERGE_ADJACENT
+            )
+            full_prompt, chat_history, token_counts = prompt_builder.build(query_text=query_text, documents=retrieved_docs)
+        answer_stats["token_counts"] = token_counts
+        stage_timings[AnswerStageEnums.PROMPT_ASSEMBLY.value] = stage.elapsed_ms
         
-        full_prompt = '\n\n'.join([documents_prompts, footer_prompt])
+        with observe_stage(AnswerStageEnums.GENERATION.value, 
+                           backend=generation_backend, 
+                           model=self.generation_client.generation_model_id) as stage:
+            answer = self.generation_client.generate_text(
+                prompt=full_prompt,
+                chat_history=chat_history,
+                max_output_tokens=max_output_tokens,
+                temperature=temperature
+                )
+        stage_timings[AnswerStageEnums.GENERATION.value] = stage.elapsed_ms
+        
+        logger.info(f"Answer stages (ms) for project: {project.project_id} | {stage_timings} | tokens: {token_counts}")
         
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history,
-            max_output_tokens=max_output_tokens,
-            temperature=temperature
+        if cache_key and answer:
+            self.answer_cache.store(
+                project_id=project.project_id,
+                query_vector=query_vector,
+                answer={
+                    "answer": answer,
+                    "full_prompt": full_prompt,
+                    "chat_history": chat_history,
+                    "token_counts": token_counts
+                },
+                **cache_key
             )
         
-        return answer, full_prompt, chat_history
+        return answer, full_prompt, chat_history, answer_stats
     
     
     async def simple_chat(self,
@@ -0,0 +1,331 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Iterator
+
+import numpy as np
+import pyarrow as pa
+
+from .BaseController import BaseController
+from .NLPController import NLPController
+from models import ModelFactory
+from models.db_schemas import SchemaFactory
+from models.enums import AssetTypeEnum, SnapshotFileEnum
+from stores.vectordb import VectorDBInterface
+import logging
+
+logger = logging.getLogger('uvicorn')
+
+# bumped whenever the snapshot columns change
+SNAPSHOT_FORMAT_VERSION = 1
+
+ASSETS_SCHEMA = pa.schema([
+    ("asset_id", pa.string()),
+    ("asset_name", pa.string()),
+    ("asset_type", pa.string()),
+    ("asset_size", pa.int64()),
+    ("asset_config", pa.string()),
+])
+
+CHUNKS_SCHEMA = pa.schema([
+    ("chunk_id", pa.string()),
+    ("chunk_asset_id", pa.string()),
+    ("chunk_order", pa.int64()),
+    ("chunk_text", pa.string()),
+    ("chunk_metadata", pa.string()),
+])
+
+def vectors_schema(embedding_size: int) -> pa.Schema:
+    return pa.schema([
+        ("record_id", pa.string()),
+        ("text", pa.string()),
+        ("metadata", pa.string()),
+        ("vector", pa.list_(pa.float32(), embedding_size)),
+    ])
+
+class SnapshotController(BaseController):
+    """
+    Exports a project (assets metadata, chunks and vectors) into a directory of
+    zstd-compressed Arrow IPC files and imports it back into any project.
+    
+    Both directions work one batch at a time: export pages through the chunk
+    model and scrolls the vector collection, import reads the files memory-mapped
+    and writes through insert_many_chunks and the vector db bulk-load path.
+    Uploaded files are not part of a snapshot.
+    """
+    def __init__(self, 
+                 vectordb_client, 
+                 db_client, 
+                 db_type: str):
+        
+        super().__init__()
+        
+        self.vectordb_client: VectorDBInterface = vectordb_client
+        self.db_client = db_client
+        self.db_type = db_type
+        
+        # collection names only depend on the vector db client, no llm client is needed
+        self.nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=None,
+            embedding_client=None,
+            template_parser=None
+        )
+    
+    def _open_writer(self, snapshot_path: str, snapshot_file: SnapshotFileEnum, schema: pa.Schema):
+        return pa.ipc.new_file(
+            os.path.join(snapshot_path, snapshot_file.value),
+            schema,
+            options=pa.ipc.IpcWriteOptions(compression="zstd")
+        )
+    
+    def _read_batches(self, snapshot_path: str, snapshot_file: SnapshotFileEnum) -> Iterator[pa.RecordBatch]:
+        file_path = os.path.join(snapshot_path, snapshot_file.value)
+        if not os.path.exists(file_path):
+            return
+        
+        with pa.memory_map(file_path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for batch_index in range(reader.num_record_batches):
+                yield reader.get_batch(batch_index)
+    
+    async def export_project(self, 
+                             project, 
+                             snapshot_path: str, 
+                             batch_size: int = 1000) -> dict:
+        """
+        Returns:
+            The snapshot manifest, also written to manifest.json
+        """
+        os.makedirs(snapshot_path, exist_ok=True)
+        
+        asset_model = await ModelFactory.create_asset_model(db_type=self.db_type, db_client=self.db_client)
+        chunk_model = await ModelFactory.create_chunk_model(db_type=self.db_type, db_client=self.db_client)
+        
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "project_id": str(project.project_id),
+            "db_type": self.db_type,
+            "embedding_size": None,
+            "asset_count": 0,
+            "chunk_count": 0,
+            "vector_count": 0,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+        # assets
+        with self._open_writer(snapshot_path, SnapshotFileEnum.ASSETS, ASSETS_SCHEMA) as writer:
+            for asset_type in AssetTypeEnum:
+                assets = await asset_model.get_all_assets(asset_project_id=project.project_id, asset_type=asset_type.value)
+                if not assets:
+                    continue
+                
+                writer.write_batch(pa.RecordBatch.from_pydict({
+                    "asset_id": [str(asset.asset_id) for asset in assets],
+                    "asset_name": [asset.asset_name for asset in assets],
+                    "asset_type": [asset.asset_type for asset in assets],
+                    "asset_size": [asset.asset_size for asset in assets],
+                    "asset_config": [json.dumps(asset.asset_config) for asset in assets],
+                }, schema=ASSETS_SCHEMA))
+                manifest["asset_count"] += len(assets)
+        
+        # chunks
+        with self._open_writer(snapshot_path, SnapshotFileEnum.CHUNKS, CHUNKS_SCHEMA) as writer:
+            # keyset pages: a stable order, so no chunk is exported twice or skipped
+            last_chunk = None
+            while True:
+                chunks = await chunk_model.get_project_chunks_after(
+                    project_id=project.project_id, after_chunk=last_chunk, page_size=batch_size)
+                if not chunks:
+                    break
+                
+                writer.write_batch(pa.RecordBatch.from_pydict({
+                    "chunk_id": [str(chunk.chunk_id) for chunk in chunks],
+                    "chunk_asset_id": [str(chunk.chunk_asset_id) for chunk in chunks],
+                    "chunk_order": [chunk.chunk_order for chunk in chunks],
+                    "chunk_text": [chunk.chunk_text for chunk in chunks],
+                    "chunk_metadata": [json.dumps(chunk.chunk_metadata) for chunk in chunks],
+                }, schema=CHUNKS_SCHEMA))
+                manifest["chunk_count"] += len(chunks)
+                last_chunk = chunks[-1]
+        
+        # vectors, as stored (the schema needs the embedding size of the first batch)
+        collection_name = self.nlp_controller.generate_collection_name(project_id=project.project_id)
+        if await self.vectordb_client.is_collection_existed(collection_name):
+            writer = None
+            offset = None
+            try:
+                while True:
+                    records, offset = await self.vectordb_client.scroll(
+                        collection_name=collection_name,
+                        batch_size=batch_size,
+                        offset=offset
+                    )
+                    
+                    if records:
+                        vectors = np.asarray([record.vector for record in records], dtype=np.float32)
+                        if writer is None:
+                            manifest["embedding_size"] = vectors.shape[1]
+                            schema = vectors_schema(manifest["embedding_size"])
+                            writer = self._open_writer(snapshot_path, SnapshotFileEnum.VECTORS, schema)
+                        
+                        writer.write_batch(pa.RecordBatch.from_arrays([
+                            pa.array([str(record.record_id) if record.record_id is not None else None for record in records], pa.string()),
+                            pa.array([record.text for record in records], pa.string()),
+                            pa.array([json.dumps(record.metadata) for record in records], pa.string()),
+                            pa.FixedSizeListArray.from_arrays(pa.array(vectors.ravel()), manifest["embedding_size"]),
+                        ], schema=schema))
+                        manifest["vector_count"] += len(records)
+                    
+                    if offset is None:
+                        break
+            finally:
+                if writer is not None:
+                    writer.close()
+        
+        with open(os.path.join(snapshot_path, SnapshotFileEnum.MANIFEST.value), "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        
+        logger.info(
+            f"Exported project: {project.project_id} to {snapshot_path} | "
+            f"assets: {manifest['asset_count']} | chunks: {manifest['chunk_count']} | vectors: {manifest['vector_count']}"
+        )
+        return manifest
+    
+    def read_manifest(self, snapshot_path: str) -> dict:
+        manifest_path = os.path.join(snapshot_path, SnapshotFileEnum.MANIFEST.value)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No snapshot manifest found at: {manifest_path}")
+        
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version: {manifest.get('format_version')}")
+        
+        return manifest
+    
+    async def import_project(self, 
+                             project, 
+                             snapshot_path: str, 
+                             do_reset: bool = False) -> dict:
+        """
+        Chunk ids are reassigned by the target database, so vector record ids
+        are remapped to the new chunk ids while importing.
+        
+        Returns:
+            Import report: imported counts and whether they match the manifest
+        """
+        manifest = self.read_manifest(snapshot_path)
+        
+        embedding_size = manifest["embedding_size"]
+        if embedding_size and embedding_size != self.vectordb_client.default_vector_size:
+            raise ValueError(
+                f"Snapshot embedding size {embedding_size} does not match "
+                f"the configured embedding size {self.vectordb_client.default_vector_size}"
+            )
+        
+        asset_model = await ModelFactory.create_asset_model(db_type=self.db_type, db_client=self.db_client)
+        chunk_model = await ModelFactory.create_chunk_model(db_type=self.db_type, db_client=self.db_client)
+        asset_schema = SchemaFactory.get_asset_schema(self.db_type)
+        chunk_schema = SchemaFactory.get_chunk_schema(self.db_type)
+        collection_name = self.nlp_controller.generate_collection_name(project_id=project.project_id)
+        
+        if do_reset:
+            await chunk_model.delete_chunks_by_id(project_id=project.project_id)
+            await self.vectordb_client.delete_collection(collection_name=collection_name)
+        
+        report = {
+            "project_id": str(project.project_id),
+            "asset_count": 0,
+            "chunk_count": 0,
+            "vector_count": 0,
+            "verified": False
+        }
+        
+        # assets: reuse the ones already uploaded under the same name
+        asset_id_map = {}
+        for batch in self._read_batches(snapshot_path, SnapshotFileEnum.ASSETS):
+            for row in batch.to_pylist():
+                asset = await asset_model.get_asset_by_name(asset_name=row["asset_name"], asset_project_id=project.project_id)
+                if asset is None:
+                    asset = await asset_model.create_asset(asset_schema(
+                        asset_project_id=project.project_id,
+                        asset_name=row["asset_name"],
+                        asset_type=row["asset_type"],
+                        asset_size=row["asset_size"],
+                        asset_config=json.loads(row["asset_config"])
+                    ))
+                asset_id_map[row["asset_id"]] = asset.asset_id
+                report["asset_count"] += 1
+        
+        # chunks
+        chunk_id_map = {}
+        for batch in self._read_batches(snapshot_path, SnapshotFileEnum.CHUNKS):
+            columns = batch.to_pydict()
+            chunks = [
+                chunk_schema(
+                    chunk_text=chunk_text,
+                    chunk_metadata=json.loads(chunk_metadata),
+                    chunk_order=chunk_order,
+                    chunk_project_id=project.project_id,
+                    chunk_asset_id=asset_id_map[chunk_asset_id]
+                )
+                for chunk_asset_id, chunk_order, chunk_text, chunk_metadata in zip(
+                    columns["chunk_asset_id"], columns["chunk_order"], columns["chunk_text"], columns["chunk_metadata"]
+                )
+            ]
+            report["chunk_count"] += await chunk_model.insert_many_chunks(chunks=chunks, batch_size=len(chunks))
+            
+            # both chunk models fill in the new chunk ids on the inserted objects
+            chunk_id_map.update(zip(columns["chunk_id"], (chunk.chunk_id for chunk in chunks)))
+        
+        # vectors
+        is_bulk_load = False
+        try:
+            for batch in self._read_batches(snapshot_path, SnapshotFileEnum.VECTORS):
+                if not is_bulk_load:
+                    await self.vectordb_client.create_collection(
+                        collection_name=collection_name,
+                        embedding_size=embedding_size,
+                        do_reset=do_reset
+                    )
+                    await self.vectordb_client.start_bulk_load(collection_name=collection_name)
+                    is_bulk_load = True
+                
+                record_ids = [chunk_id_map.get(record_id) for record_id in batch.column("record_id").to_pylist()]
+                # zero-copy view over the memory-mapped float32 column
+                vectors = batch.column("vector").values.to_numpy().reshape(-1, embedding_size)
+                
+                is_inserted = await self.vectordb_client.insert_many(
+                    collection_name=collection_name,
+                    texts=batch.column("text").to_pylist(),
+                    vectors=vectors.tolist(),
+                    metadatas=[json.loads(metadata) for metadata in batch.column("metadata").to_pylist()],
+                    record_ids=record_ids if None not in record_ids else None,
+                    batch_size=batch.num_rows
+                )
+                if not is_inserted:
+                    raise Exception(f"Inserting snapshot vectors failed for collection: {collection_name}")
+                
+                report["vector_count"] += batch.num_rows
+        except Exception:
+            # the vectors inserted so far are searched through the vector index
+            if is_bulk_load:
+                try:
+                    await self.vectordb_client.finish_bulk_load(collection_name=collection_name)
+                except Exception as e:
+                    logger.error(f"Failed to finish the bulk load of collection: {collection_name}: {str(e)}")
+            raise
+        
+        if is_bulk_load:
+            await self.vectordb_client.finish_bulk_load(collection_name=collection_name)
+        
+        report["verified"] = all(
+            report[count_key] == manifest[count_key]
+            for count_key in ("asset_count", "chunk_count", "vector_count")
+        )
+        if not report["verified"]:
+            logger.error(f"Import of snapshot: {snapshot_path} does not add up: {report} | manifest: {manifest}")
+        
+        return report
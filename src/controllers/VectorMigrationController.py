@@ -0,0 +1,160 @@
+from typing import List, Union
+
+from .BaseController import BaseController
+from .NLPController import NLPController
+from stores.vectordb import VectorDBInterface
+import logging
+
+logger = logging.getLogger('uvicorn')
+
+class VectorMigrationController(BaseController):
+    """
+    Copies collections from one vector DB backend to another as stored:
+    vectors, texts, metadata and chunk ids are streamed with scroll and
+    written with insert_many, so nothing is embedded again.
+    """
+    def __init__(self, 
+                 source_client, 
+                 target_client):
+        
+        super().__init__()
+        
+        self.source_client: VectorDBInterface = source_client
+        self.target_client: VectorDBInterface = target_client
+    
+    async def migrate_collection(self, 
+                                 collection_name: str, 
+                                 batch_size: int = 1000, 
+                                 do_reset: bool = False, 
+                                 progress_callback=None) -> dict:
+        """
+        Returns:
+            Migration report: source/target counts and whether they match
+        """
+        report = {
+            "collection_name": collection_name,
+            "migrated_count": 0,
+            "source_count": 0,
+            "target_count": 0,
+            "verified": False
+        }
+        
+        if not await self.source_client.is_collection_existed(collection_name):
+            logger.warning(f"Collection: {collection_name} does not exist in the source backend; skipping.")
+            report["verified"] = True
+            return report
+        
+        report["source_count"] = await self.source_client.count_records(collection_name=collection_name, exact=True)
+        
+        target_count_before = 0
+        if not do_reset and await self.target_client.is_collection_existed(collection_name):
+            target_count_before = await self.target_client.count_records(collection_name=collection_name, exact=True)
+        
+        offset = None
+        is_bulk_load = False
+        try:
+            while True:
+                records, offset = await self.source_client.scroll(
+                    collection_name=collection_name,
+                    batch_size=batch_size,
+                    offset=offset
+                )
+                
+                if records:
+                    if not is_bulk_load:
+                        # the embedding size comes from the stored vectors, not from the settings
+                        await self.target_client.create_collection(
+                            collection_name=collection_name,
+                            embedding_size=len(records[0].vector),
+                            do_reset=do_reset
+                        )
+                        await self.target_client.start_bulk_load(collection_name=collection_name)
+                        is_bulk_load = True
+                    
+                    record_ids = [record.record_id for record in records]
+                    is_inserted = await self.target_client.insert_many(
+                        collection_name=collection_name,
+                        texts=[record.text for record in records],
+                        vectors=[record.vector for record in records],
+                        metadatas=[record.metadata for record in records],
+                        record_ids=record_ids if None not in record_ids else None,
+                        batch_size=batch_size
+                    )
+                    
+                    if not is_inserted:
+                        raise Exception(f"Inserting into the target backend failed for collection: {collection_name}")
+                    
+                    report["migrated_count"] += len(records)
+                    if progress_callback:
+                        progress_callback(report)
+                
+                if offset is None:
+                    break
+        except Exception:
+            # the records inserted so far are searched through the vector index
+            if is_bulk_load:
+                try:
+                    await self.target_client.finish_bulk_load(collection_name=collection_name)
+                except Exception as e:
+                    logger.error(f"Failed to finish the bulk load of collection: {collection_name}: {str(e)}")
+            raise
+        
+        if is_bulk_load:
+            await self.target_client.finish_bulk_load(collection_name=collection_name)
+        
+        if await self.target_client.is_collection_existed(collection_name):
+            report["target_count"] = await self.target_client.count_records(collection_name=collection_name, exact=True)
+        
+        report["verified"] = (
+            report["migrated_count"] == report["source_count"]
+            and report["target_count"] - target_count_before == report["migrated_count"]
+        )
+        
+        if not report["verified"]:
+            logger.error(f"Migration of collection: {collection_name} does not add up: {report}")
+        
+        return report
+    
+    async def migrate_projects(self, 
+                               project_ids: List[Union[int, str]], 
+                               batch_size: int = 1000, 
+                               do_reset: bool = False, 
+                               progress_callback=None) -> List[dict]:
+        """
+        Returns:
+            One migration report per project collection
+        """
+        # collection names only depend on the vector db client, no llm client is needed
+        nlp_controller = NLPController(
+            vectordb_client=self.source_client,
+            generation_client=None,
+            embedding_client=None,
+            template_parser=None
+        )
+        
+        reports = []
+        for project_id in project_ids:
+            collection_name = nlp_controller.generate_collection_name(project_id=project_id)
+            logger.info(f"Migrating collection: {collection_name}")
+            
+            reports.append(await self.migrate_collection(
+                collection_name=collection_name,
+                batch_size=batch_size,
+                do_reset=do_reset,
+                progress_callback=progress_callback
+            ))
+        
+        return reports
+    
+    @staticmethod
+    async def get_all_project_ids(project_model, page_size: int = 100) -> List[Union[int, str]]:
+        project_ids = []
+        page = 1
+        while True:
+            projects, total_pages = await project_model.get_all_projects(page=page, page_size=page_size)
+            project_ids.extend(project.project_id for project in projects)
+            if page >= total_pages:
+                break
+            page += 1
+        
+        return project_ids
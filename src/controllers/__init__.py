@@ -3,3 +3,5 @@ from .DataController import DataController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
 from .NLPController import NLPController
+from .VectorMigrationController import VectorMigrationController
+from .SnapshotController import SnapshotController
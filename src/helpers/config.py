@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
@@ -40,6 +40,7 @@ class Settings(BaseSettings):
     DEFAULT_GENERATION_TEMPERATURE: float
     DEFAULT_GENERATION_OUTPUT_MAX_TOKENS: int
     DEFAULT_GENERATION_INPUT_MAX_CHARACTERS: int
+    GENERATION_INPUT_MAX_TOKENS: int = 8192
     
     VECTOR_DB_BACKEND_OPTIONS: List[str] = None
     VECTOR_DB_DISTANCE_METRIC_OPTIONS: List[str] = None
@@ -50,10 +51,76 @@ class Settings(BaseSettings):
     VECTOR_DB_PATH_NAME: str
     VECTOR_DB_DISTANCE_METRIC: str = None
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int=100
+    VECTOR_DB_PGVEC_TABLE_LAYOUT_OPTIONS: List[str] = None
+    VECTOR_DB_PGVEC_TABLE_LAYOUT: str = "per_project"
+    VECTOR_DB_PGVEC_PARTITIONS: int = 16
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = "512MB"
+    VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS: int = 2
+    VECTOR_DB_BULK_LOAD: bool = True
+    
+    VECTOR_DB_FAISS_INDEX_TYPE_OPTIONS: List[str] = None
+    VECTOR_DB_FAISS_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_FAISS_HNSW_M: int = 32
+    VECTOR_DB_FAISS_HNSW_EF_SEARCH: int = 64
+    VECTOR_DB_FAISS_IVF_NLIST: int = 256
+    VECTOR_DB_FAISS_IVF_NPROBE: int = 16
+    VECTOR_DB_FAISS_PQ_M: int = 16
+    VECTOR_DB_FAISS_CACHE_SIZE: int = 32
+    
+    VECTOR_DB_LANCEDB_IVF_PQ_THRESHOLD: int = 100000
+    VECTOR_DB_LANCEDB_IVF_PARTITIONS: int = 256
+    VECTOR_DB_LANCEDB_PQ_SUB_VECTORS: int = 16
+    VECTOR_DB_LANCEDB_NPROBES: int = 20
+    VECTOR_DB_LANCEDB_REFINE_FACTOR: int = 10
+    
+    VECTOR_DB_TIERED_DURABLE_BACKEND: str = "PGVECTOR"
+    VECTOR_DB_TIERED_THRESHOLD: int = 20000
+    VECTOR_DB_TIERED_REVALIDATE_SECONDS: int = 60
+    VECTOR_DB_TIERED_CACHE_SIZE: int = 64
+    VECTOR_DB_TIERED_MAX_MEMORY_MB: int = 1024
+    
+    INDEX_VERSION_REDIS_URL: str = None
+    
+    VECTOR_DB_SEARCH_MODE_OPTIONS: List[str] = None
+    VECTOR_DB_SEARCH_MODE: str = "dense"
+    VECTOR_DB_HYBRID_PREFETCH: int = 50
+    VECTOR_DB_HYBRID_RRF_K: int = 60
+    
+    RERANKER_BACKEND_OPTIONS: List[str] = None
+    RERANKER_BACKEND: str = None
+    RERANKER_CANDIDATES: int = 50
+    RERANKER_MMR_LAMBDA: float = 0.7
+    RERANKER_MODEL_PATH: str = None
+    RERANKER_MAX_LENGTH: int = 512
+    RERANKER_BATCH_SIZE: int = 32
+    
+    CONTEXT_PACKING: bool = True
+    CONTEXT_DEDUP_THRESHOLD: float = 0.8
+    CONTEXT_MERGE_ADJACENT: bool = True
+    
+    ANSWER_CACHE_ENABLED: bool = False
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    ANSWER_CACHE_TTL_SECONDS: int = 3600
+    ANSWER_CACHE_MAX_ENTRIES: int = 1000
+    ANSWER_CACHE_PROJECT_TTL_SECONDS: Dict[str, int] = {}
+    
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_REDIS_URL: str = None
+    RESPONSE_CACHE_TTL_SECONDS: int = 86400
+    RESPONSE_CACHE_L1_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_MAX_TEMPERATURE: float = 0.0
+    
+    PROJECT_CACHE_MAX_SIZE: int = 1024
+    PROJECT_CACHE_TTL_SECONDS: int = 300
     
     LANGUAGE_OPTIONS: List[str] = None
     PRIMARY_LANGUAGE: str = "en"
     DEFAULT_LANGUAGE: str = "en"
+    TEMPLATE_WATCH: bool = False
+    
+    OTEL_ENABLED: bool = False
+    OTEL_SERVICE_NAME: str = "minirag"
+    OTEL_EXPORTER_OTLP_ENDPOINT: str = None
     
     CELERY_BROKER_URL: str = None
     CELERY_RESULT_BACKEND: str = None
@@ -61,9 +128,21 @@ class Settings(BaseSettings):
     CELERY_RESULT_SERIALIZER: str = "json"
     CELERY_ACCEPT_CONTENT: List[str] = ["json"]
     CELERY_TASK_TIME_LIMIT: int = 600
+    CELERY_TASK_QUEUE_TIMEOUT: int = 21600
     CELERY_ACKS_LATE: bool = True
     CELERY_WORKER_CONCURRENCY: int = 2
     CELERY_FLOWER_PASSWORD: str = None
+    CELERY_METRICS_PORT: int = None
+    
+    TASK_PROGRESS_REDIS_URL: str = None
+    TASK_PROGRESS_TTL_SECONDS: int = 3600
+    TASK_PROGRESS_HEARTBEAT_SECONDS: int = 15
+    
+    IDEMPOTENCY_BACKEND: str = "DATABASE"
+    IDEMPOTENCY_REDIS_URL: str = None
+    IDEMPOTENCY_LEASE_MS: int = 60000
+    IDEMPOTENCY_STATE_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_FLUSH_INTERVAL_SECONDS: float = 1.0
     
     class Config:
         env_file = ".env" 
@@ -1,14 +1,22 @@
 import logging
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from routes import base, data, nlp, settings
+from routes import base, data, nlp, settings, tasks
 from helpers.config import get_settings
-from stores import LLMFactory, VectorDBFactory
+from stores import LLMFactory, VectorDBFactory, RerankerFactory
 from stores.llm.templates.template_parser import TemplateParser
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from motor.motor_asyncio import AsyncIOMotorClient
+from models import ModelFactory
 from models.enums import DatabaseType
 from utils.metrics import setup_metrics
+from utils.tracing import setup_tracing
+from utils.semantic_cache import SemanticAnswerCache
+from utils.index_version import IndexVersionStore
+from utils.response_cache import ResponseCache
+from utils.project_cache import ProjectCache
+from utils.task_progress import TaskProgressChannel
+from celery_app import get_lease_store
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -44,6 +52,23 @@ async def initialize_database_connection(app: FastAPI, settings):
         logger.info("✅ Using PostgreSQL as active database")
 
 
+async def initialize_data_models(app: FastAPI, settings):
+    """Initialize or reinitialize the data models of the active database, shared by all requests"""
+    # MongoDB models check their collections and indexes on creation, once instead of per request
+    data_models = await ModelFactory.create_all_models(db_type=settings.DB_TYPE, db_client=app.db_client)
+    app.project_model = data_models['project']
+    app.asset_model = data_models['asset']
+    app.chunk_model = data_models['chunk']
+    
+    # project lookups of the read routes
+    app.project_cache = ProjectCache(
+        project_model=app.project_model,
+        max_size=settings.PROJECT_CACHE_MAX_SIZE,
+        ttl_seconds=settings.PROJECT_CACHE_TTL_SECONDS
+    )
+    logger.info("✅ Data models initialized")
+
+
 async def initialize_llm_clients(app: FastAPI, settings):
     """Initialize or reinitialize LLM clients"""
     llm_factory = LLMFactory(settings)
@@ -81,18 +106,88 @@ async def initialize_vector_db(app: FastAPI, settings):
     logger.info(f"✅ VectorDB connected: {settings.VECTOR_DB_BACKEND}")
 
 
+async def initialize_reranker(app: FastAPI, settings):
+    """Initialize or reinitialize the optional reranker of the answer pipeline"""
+    app.reranker_client = RerankerFactory(settings).create(settings.RERANKER_BACKEND)
+    if app.reranker_client:
+        logger.info(f"✅ Reranker initialized: {settings.RERANKER_BACKEND}")
+
+
+async def initialize_answer_cache(app: FastAPI, settings):
+    """Initialize or reset the semantic answer cache; cached answers do not survive a client change"""
+    if getattr(app, 'answer_cache', None):
+        await app.answer_cache.close()
+    
+    app.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        index_version_redis_url = settings.INDEX_VERSION_REDIS_URL or settings.CELERY_RESULT_BACKEND
+        app.answer_cache = SemanticAnswerCache(
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            project_ttl_seconds=settings.ANSWER_CACHE_PROJECT_TTL_SECONDS,
+            index_versions=IndexVersionStore(redis_url=index_version_redis_url) if index_version_redis_url else None
+        )
+        logger.info("✅ Answer cache initialized")
+
+
+async def initialize_response_cache(app: FastAPI, settings):
+    """Initialize or reinitialize the Redis backed exact-match response cache"""
+    if getattr(app, 'response_cache', None):
+        await app.response_cache.close()
+    
+    app.response_cache = None
+    if settings.RESPONSE_CACHE_ENABLED:
+        app.response_cache = ResponseCache(
+            redis_url=settings.RESPONSE_CACHE_REDIS_URL or settings.CELERY_RESULT_BACKEND,
+            index_versions=IndexVersionStore(redis_url=settings.INDEX_VERSION_REDIS_URL or settings.CELERY_RESULT_BACKEND),
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+            l1_max_entries=settings.RESPONSE_CACHE_L1_MAX_ENTRIES
+        )
+        logger.info("✅ Response cache initialized")
+
+
+async def initialize_task_progress(app: FastAPI, settings):
+    """Initialize or reinitialize the Redis channel of the task progress published by the workers"""
+    if getattr(app, 'task_progress', None):
+        await app.task_progress.close()
+    
+    app.task_progress = TaskProgressChannel(
+        redis_url=settings.TASK_PROGRESS_REDIS_URL or settings.CELERY_RESULT_BACKEND,
+        ttl_seconds=settings.TASK_PROGRESS_TTL_SECONDS
+    )
+    logger.info("✅ Task progress channel initialized")
+
+
+async def initialize_lease_store(app: FastAPI, settings):
+    """Initialize or reinitialize the Redis leases the task routes check stuck jobs with"""
+    if getattr(app, 'lease_store', None):
+        await app.lease_store.close()
+    
+    app.lease_store = get_lease_store(settings)
+    if app.lease_store:
+        logger.info("✅ Idempotency lease store initialized")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = get_settings()
     
     # Initialize all connections
     await initialize_database_connection(app, settings)
+    await initialize_data_models(app, settings)
     await initialize_llm_clients(app, settings)
     await initialize_vector_db(app, settings)
+    await initialize_reranker(app, settings)
+    await initialize_answer_cache(app, settings)
+    await initialize_response_cache(app, settings)
+    await initialize_task_progress(app, settings)
+    await initialize_lease_store(app, settings)
     
     # template parser
     app.template_parser = TemplateParser(language=settings.PRIMARY_LANGUAGE, 
-                                         default_language=settings.DEFAULT_LANGUAGE)
+                                         default_language=settings.DEFAULT_LANGUAGE, 
+                                         watch=settings.TEMPLATE_WATCH)
     logger.info("✅ Template parser initialized")
     
     yield
@@ -102,11 +197,24 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Database connection closed")
     await app.vectordb_client.disconnect()
     logger.info("🛑 VectorDB connection closed")
+    if app.answer_cache:
+        await app.answer_cache.close()
+        logger.info("🛑 Answer cache connection closed")
+    if app.response_cache:
+        await app.response_cache.close()
+        logger.info("🛑 Response cache connection closed")
+    await app.task_progress.close()
+    logger.info("🛑 Task progress connection closed")
+    if app.lease_store:
+        await app.lease_store.close()
+        logger.info("🛑 Idempotency lease store connection closed")
 
 app = FastAPI(lifespan=lifespan)
 setup_metrics(app)
+setup_tracing(app, get_settings())
 
 app.include_router(base.base_router)
 app.include_router(data.data_router)
 app.include_router(nlp.nlp_router)
 app.include_router(settings.settings_router)
+app.include_router(tasks.tasks_router)
@@ -3,6 +3,7 @@ from .minirag.schemas import (
     Asset,
     DataChunk,
     RetrievedDocument,
+    VectorRecord,
     CeleryTaskExecution
 )
 
@@ -20,6 +21,7 @@ __all__ = [
     "Asset",
     "DataChunk",
     "RetrievedDocument",
+    "VectorRecord",
     "ProjectMongo",
     "AssetMongo",
     "DataChunkMongo",
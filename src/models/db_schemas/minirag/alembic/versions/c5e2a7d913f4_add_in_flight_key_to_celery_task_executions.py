@@ -0,0 +1,28 @@
+"""Add in flight key to celery task executions
+
+Revision ID: c5e2a7d913f4
+Revises: a30a08d84012
+Create Date: 2026-10-19 10:12:41.204318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a7d913f4'
+down_revision: Union[str, None] = 'a30a08d84012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('celery_task_executions', sa.Column('in_flight_key', sa.String(length=64), nullable=True))
+    op.create_index('ixz_task_in_flight_key', 'celery_task_executions', ['in_flight_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ixz_task_in_flight_key', table_name='celery_task_executions')
+    op.drop_column('celery_task_executions', 'in_flight_key')
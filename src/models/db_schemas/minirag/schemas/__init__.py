@@ -2,5 +2,5 @@ from .minirag_base import SQLAlchemyBase
 from .project import Project
 from .asset import Asset
 from .chunk import DataChunk
-from .base import RetrievedDocument
+from .base import RetrievedDocument, VectorRecord
 from .celery_task_execution import CeleryTaskExecution
@@ -1,5 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
 
 class RetrievedDocument(BaseModel):
     text: str
     score: float
+    metadata: Optional[dict] = None
+    record_id: Optional[Union[int, str]] = None
+    # stored vector, only returned on request (e.g. for MMR) and never serialized
+    vector: Optional[List[float]] = Field(default=None, exclude=True)
+
+class VectorRecord(BaseModel):
+    text: str
+    vector: List[float]
+    metadata: Optional[dict] = None
+    record_id: Optional[Union[int, str]] = None
@@ -15,6 +15,8 @@ class CeleryTaskExecution(SQLAlchemyBase):
     
     task_args = Column(JSONB, nullable=True)
     task_args_hash = Column(String(64), nullable=False)
+    # the args hash while a reserved job is in flight, identical requests attach to it
+    in_flight_key = Column(String(64), nullable=True)
     result = Column(JSONB, nullable=True)
     
     started_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -28,4 +30,5 @@ class CeleryTaskExecution(SQLAlchemyBase):
         Index('ixz_task_execution_status', status),
         Index('ixz_task_execution_created_at', created_at),
         Index('ixz_task_id', task_id),
+        Index('ixz_task_in_flight_key', in_flight_key, unique=True),
     )
@@ -13,6 +13,8 @@ class CeleryTaskExecution(BaseModel):
     
     task_args: Optional[Dict[str, Any]] = Field(default=None)
     task_args_hash: str = Field(..., max_length=64)
+    # the args hash while a reserved job is in flight, unset otherwise
+    in_flight_key: Optional[str] = Field(default=None, max_length=64)
     result: Optional[Dict[str, Any]] = Field(default=None)
     
     started_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
@@ -47,4 +49,10 @@ class CeleryTaskExecution(BaseModel):
                 "keys": [("task_id", 1)],
                 "unique": False
             },
+            {
+                "name": "ixz_task_in_flight_key",
+                "keys": [("in_flight_key", 1)],
+                "unique": True,
+                "sparse": True
+            },
         ]
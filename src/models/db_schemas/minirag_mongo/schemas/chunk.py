@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional, Union
 from bson import ObjectId
 
 
@@ -40,3 +40,7 @@ class DataChunk(BaseModel):
 class RetrievedDocument(BaseModel):
     text: str
     score: float
+    metadata: Optional[dict] = None
+    record_id: Optional[Union[int, str]] = None
+    # stored vector, only returned on request (e.g. for MMR) and never serialized
+    vector: Optional[List[float]] = Field(default=None, exclude=True)
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class IdempotencyBackendEnum(Enum):
+    DATABASE = "DATABASE"
+    REDIS = "REDIS"
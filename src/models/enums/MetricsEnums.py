@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class AnswerStageEnums(Enum):
+    PROJECT_LOOKUP = "project_lookup"
+    QUERY_EMBEDDING = "query_embedding"
+    CACHE_LOOKUP = "cache_lookup"
+    RETRIEVAL = "retrieval"
+    RERANK = "rerank"
+    PROMPT_ASSEMBLY = "prompt_assembly"
+    GENERATION = "generation"
+
+
+class IndexingStageEnums(Enum):
+    EMBEDDING = "embedding"
+    UPSERT = "upsert"
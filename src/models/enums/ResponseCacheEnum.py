@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class ResponseCacheResultEnum(Enum):
+    L1_HIT = "l1_hit"
+    REDIS_HIT = "redis_hit"
+    COALESCED = "coalesced"
+    MISS = "miss"
+    BYPASS = "bypass"
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class SnapshotFileEnum(Enum):
+    MANIFEST = "manifest.json"
+    ASSETS = "assets.arrow"
+    CHUNKS = "chunks.arrow"
+    VECTORS = "vectors.arrow"
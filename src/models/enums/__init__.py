@@ -4,6 +4,10 @@ from .StatusEnum import StatusEnum
 from .ResponseEnums import ResponseMessage
 from .AssetTypeEnum import AssetTypeEnum
 from .DatabaseTypeEnum import DatabaseType
+from .SnapshotEnum import SnapshotFileEnum
+from .ResponseCacheEnum import ResponseCacheResultEnum
+from .IdempotencyBackendEnum import IdempotencyBackendEnum
+from .MetricsEnums import AnswerStageEnums, IndexingStageEnums
 
 
 __all__ = [
@@ -12,5 +16,10 @@ __all__ = [
     "StatusEnum",
     "ResponseMessage",
     "AssetTypeEnum",
-    "DatabaseType"
+    "DatabaseType",
+    "SnapshotFileEnum",
+    "ResponseCacheResultEnum",
+    "IdempotencyBackendEnum",
+    "AnswerStageEnums",
+    "IndexingStageEnums"
 ]
@@ -88,7 +88,24 @@ class ChunkModel(BaseDataModel):
                                  page: int=1, 
                                  page_size: int = 50) -> List[DataChunk]:
         
-        cursor = self.collection.find({'chunk_project_id': project_id}).skip((page-1) * page_size).limit(page_size)
+        cursor = self.collection.find({'chunk_project_id': project_id}).sort('_id', 1).skip((page-1) * page_size).limit(page_size)
+        
+        chunks = []
+        async for chunk in cursor:
+            chunks.append(DataChunk(**chunk))
+        
+        return chunks
+    
+    async def get_project_chunks_after(self, 
+                                       project_id: str, 
+                                       after_chunk: DataChunk=None, 
+                                       page_size: int = 50) -> List[DataChunk]:
+        """Keyset page of the chunks following after_chunk in _id order; no skip scan per page."""
+        query = {'chunk_project_id': project_id}
+        if after_chunk is not None:
+            query['_id'] = {'$gt': after_chunk.id}
+        
+        cursor = self.collection.find(query).sort('_id', 1).limit(page_size)
         
         chunks = []
         async for chunk in cursor:
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 from ..BaseDataModel import BaseDataModel
 from ...db_schemas import ProjectMongo as Project
 from ...enums.DataBaseEnum import DataBaseEnum
@@ -34,6 +34,14 @@ class ProjectModel(BaseDataModel):
         return project
 
     
+    async def get_project(self, project_id: str) -> Optional[Project]:
+        project = await self.collection.find_one({
+            "project_id": project_id
+        })
+        
+        return Project(**project) if project else None
+    
+    
     async def get_project_or_create_one(self, project_id: str) -> Project:
         project = await self.collection.find_one({
             "project_id": project_id
@@ -47,7 +47,26 @@ class ChunkModel(BaseDataModel):
     async def get_project_chunks(self, project_id: int, page: int=1, page_size: int = 50) -> List[DataChunk]:
         async with self.db_client() as session:
             async with session.begin():
-                query = select(DataChunk).where(DataChunk.chunk_project_id == project_id).offset((page-1) * page_size).limit(page_size)
+                query = (
+                    select(DataChunk).where(DataChunk.chunk_project_id == project_id)
+                    .order_by(DataChunk.chunk_id).offset((page-1) * page_size).limit(page_size)
+                )
+                result = await session.execute(query)
+                chunks = result.scalars().all()
+                
+        return chunks
+    
+    async def get_project_chunks_after(self, 
+                                       project_id: int, 
+                                       after_chunk: DataChunk=None, 
+                                       page_size: int = 50) -> List[DataChunk]:
+        """Keyset page of the chunks following after_chunk in chunk_id order; no OFFSET scan per page."""
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(DataChunk).where(DataChunk.chunk_project_id == project_id)
+                if after_chunk is not None:
+                    query = query.where(DataChunk.chunk_id > after_chunk.chunk_id)
+                query = query.order_by(DataChunk.chunk_id).limit(page_size)
                 result = await session.execute(query)
                 chunks = result.scalars().all()
                 
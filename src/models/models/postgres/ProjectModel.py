@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Optional, Tuple
 from ..BaseDataModel import BaseDataModel
 from ...db_schemas import Project
 from sqlalchemy.future import select
@@ -24,6 +24,13 @@ class ProjectModel(BaseDataModel):
         return project
 
     
+    async def get_project(self, project_id: int) -> Optional[Project]:
+        async with self.db_client() as session:
+            query = select(Project).where(Project.project_id == project_id)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+    
+    
     async def get_project_or_create_one(self, project_id: int) -> Project:
         async with self.db_client() as session:
             async with session.begin():
@@ -46,7 +53,7 @@ class ProjectModel(BaseDataModel):
             async with session.begin():
                 # count total number of docs
                 total_docs_query = select(func.count(Project.project_id))
-                total_docs = await session.execute(total_docs_query).scalar_one()
+                total_docs = (await session.execute(total_docs_query)).scalar_one()
                 
                 # calculate total number of pages
                 total_pages = total_docs // page_size
@@ -54,6 +61,6 @@ class ProjectModel(BaseDataModel):
                     total_pages += 1
                 
                 query = select(Project).offset((page-1) * page_size).limit(page_size)
-                projects = await session.execute(query).scalars().all()
+                projects = (await session.execute(query)).scalars().all()
         
         return projects, total_pages
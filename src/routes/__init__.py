@@ -1,5 +1,6 @@
 from .data import data_router
 from .nlp import nlp_router
 from .settings import settings_router
+from .tasks import tasks_router
 
-__all__ = ['data_router', 'nlp_router', 'settings_router']
+__all__ = ['data_router', 'nlp_router', 'settings_router', 'tasks_router']
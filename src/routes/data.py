@@ -8,13 +8,14 @@ from controllers import DataController, ProjectController
 from helpers.config import get_settings, Settings
 from helpers.utils import generate_unique_filepath, message_handler
 from models.enums import ResponseMessage, AssetTypeEnum
-from models import ModelFactory, DatabaseType
+from models import DatabaseType
 
 from models.db_schemas import SchemaFactory
 from .schemas import ProcessRequest
 
 from tasks.file_processing import process_data as process_data_task
 from tasks.process_workflow import process_and_push_workflow
+from utils.idempotency_manager import IdempotencyManager
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -39,10 +40,7 @@ async def upload_data(request: Request,
                 status_code=status.HTTP_400_BAD_REQUEST
             )
     
-    project_model = await ModelFactory.create_project_model(
-        db_type=app_settings.DB_TYPE,
-        db_client=request.app.db_client
-    )
+    project_model = request.app.project_model
     
     project = await project_model.get_project_or_create_one(project_id=project_id)
     
@@ -81,10 +79,7 @@ async def upload_data(request: Request,
         return JSONResponse(content={"errors": errors}, status_code=status.HTTP_400_BAD_REQUEST)
     
     # Storing the asset info in DB
-    asset_model = await ModelFactory.create_asset_model(
-        db_type=app_settings.DB_TYPE,
-        db_client=request.app.db_client
-    )
+    asset_model = request.app.asset_model
     
     messages = []
     
@@ -137,14 +132,39 @@ async def process_data(request: Request,
     overlap_size = process_request.overlap_size
     do_reset = process_request.do_reset
     
-    task = process_data_task.delay(
-        project_id=project_id,
-        asset_name=asset_name, 
-        chunk_size=chunk_size, 
-        overlap_size=overlap_size, 
-        do_reset=do_reset
+    # identical requests attach to the job in flight instead of processing the files again
+    idempotency_manager = IdempotencyManager(db_client=request.app.db_client, db_engine=request.app.db_engine, 
+                                             db_type=app_settings.DB_TYPE, lease_store=request.app.lease_store)
+    task_args = {
+        "project_id": project_id,
+        "asset_name": asset_name,
+        "chunk_size": chunk_size,
+        "overlap_size": overlap_size,
+        "do_reset": do_reset
+    }
+    task_record, is_reserved = await idempotency_manager.reserve_task(
+        task_name=process_data_task.name,
+        task_args=task_args,
+        task_time_limit=app_settings.CELERY_TASK_TIME_LIMIT,
+        task_queue_timeout=app_settings.CELERY_TASK_QUEUE_TIMEOUT
     )
     
+    if not is_reserved:
+        return JSONResponse(
+            content={ "message": "Data processing task is already in progress.", "task_id": str(task_record.task_id), "task_status": task_record.status }, 
+            status_code=status.HTTP_202_ACCEPTED 
+        )
+    
+    try:
+        task = process_data_task.apply_async(kwargs=task_args, task_id=str(task_record.task_id))
+    except Exception as e:
+        await idempotency_manager.update_task_status(
+            execution_id=idempotency_manager.get_task_record_id(task_record),
+            status='FAILURE',
+            result={"error": str(e)}
+        )
+        raise e
+    
     return JSONResponse(
         content={ "message": "Data processing task has been initiated.", "task_id": task.id, "task_status": task.status }, 
         status_code=status.HTTP_202_ACCEPTED 
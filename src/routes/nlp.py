@@ -5,13 +5,14 @@ from fastapi.responses import JSONResponse
 
 from helpers.config import Settings, get_settings
 from models.enums.DatabaseTypeEnum import DatabaseType
-from .schemas import PushRequest, SearchRequest, AnswerRequest
-from models import ModelFactory
+from .schemas import PushRequest, SearchRequest, BatchSearchRequest, AnswerRequest
 from controllers import NLPController
-from models.enums import ResponseMessage
+from models.enums import ResponseMessage, AnswerStageEnums
 from helpers.utils import message_handler
 from models.db_schemas import RetrievedDocument 
 from tasks.data_indexing import index_data as index_data_task
+from utils.tracing import observe_stage
+from utils.idempotency_manager import IdempotencyManager
 
 
 logger = logging.getLogger('uvicorn.error')
@@ -35,11 +36,36 @@ async def index_project(request: Request,
                 content={"message": "Project ID must be a number"},
                 status_code=status.HTTP_400_BAD_REQUEST
             )
-    task = index_data_task.delay(
-        project_id=project_id, 
-        do_reset=push_request.do_reset
+    # identical pushes attach to the job in flight instead of re-embedding the project again
+    idempotency_manager = IdempotencyManager(db_client=request.app.db_client, db_engine=request.app.db_engine, 
+                                             db_type=app_settings.DB_TYPE, lease_store=request.app.lease_store)
+    task_args = {
+        "project_id": project_id,
+        "do_reset": push_request.do_reset
+    }
+    task_record, is_reserved = await idempotency_manager.reserve_task(
+        task_name=index_data_task.name,
+        task_args=task_args,
+        task_time_limit=app_settings.CELERY_TASK_TIME_LIMIT,
+        task_queue_timeout=app_settings.CELERY_TASK_QUEUE_TIMEOUT
     )
     
+    if not is_reserved:
+        return JSONResponse(
+            content={"message": "Data indexing task is already in progress", "task_id": str(task_record.task_id), "task_status": task_record.status},
+            status_code=status.HTTP_202_ACCEPTED
+        )
+    
+    try:
+        task = index_data_task.apply_async(kwargs=task_args, task_id=str(task_record.task_id))
+    except Exception as e:
+        await idempotency_manager.update_task_status(
+            execution_id=idempotency_manager.get_task_record_id(task_record),
+            status='FAILURE',
+            result={"error": str(e)}
+        )
+        raise e
+    
     return JSONResponse(
         content={"message": "Data indexing task has been initiated", "task_id": task.id, "task_status": task.status},
         status_code=status.HTTP_202_ACCEPTED
@@ -48,7 +74,10 @@ async def index_project(request: Request,
 
 
 @nlp_router.get("/index/info/{project_id}")
-async def get_index_info(request: Request, project_id: Union[int, str], app_settings: Settings = Depends(get_settings)):
+async def get_index_info(request: Request, 
+                         project_id: Union[int, str], 
+                         exact: bool = False,
+                         app_settings: Settings = Depends(get_settings)):
     
     if app_settings.DB_TYPE == DatabaseType.POSTGRES.value:
         try:
@@ -59,12 +88,7 @@ async def get_index_info(request: Request, project_id: Union[int, str], app_sett
                 status_code=status.HTTP_400_BAD_REQUEST
             )
     
-    project_model = await ModelFactory.create_project_model(
-        db_type=app_settings.DB_TYPE,
-        db_client=request.app.db_client
-    )
-    
-    project = await project_model.get_project_or_create_one(project_id=project_id)
+    project = await request.app.project_cache.get_project(project_id=project_id)
     
     if not project:
         return JSONResponse(
@@ -79,7 +103,7 @@ async def get_index_info(request: Request, project_id: Union[int, str], app_sett
         template_parser=request.app.template_parser
     )
     try:
-        collection_info = await nlp_controller.get_vector_collection_info(project=project)
+        collection_info = await nlp_controller.get_vector_collection_info(project=project, exact=exact)
     except Exception as e:
         logger.error(f"Failed to retrieve collection info for project {project_id}: {str(e)}")
         return JSONResponse(
@@ -88,7 +112,8 @@ async def get_index_info(request: Request, project_id: Union[int, str], app_sett
         )
         
     return JSONResponse(
-        content=message_handler(ResponseMessage.VECTOR_DB_COLLECTION_INFO_RETRIEVED.value.format(project_id=project_id), collection_info=collection_info),
+        content=message_handler(ResponseMessage.VECTOR_DB_COLLECTION_INFO_RETRIEVED.value.format(project_id=project_id), collection_info=collection_info, 
+                                answer_cache=request.app.answer_cache.get_stats(project.project_id) if request.app.answer_cache else None),
         status_code=status.HTTP_200_OK
     )
 
@@ -107,12 +132,7 @@ async def search_index(request: Request,
                 status_code=status.HTTP_400_BAD_REQUEST
             )
     
-    project_model = await ModelFactory.create_project_model(
-        db_type=app_settings.DB_TYPE,
-        db_client=request.app.db_client
-    )
-    
-    project = await project_model.get_project_or_create_one(project_id=project_id)
+    project = await request.app.project_cache.get_project(project_id=project_id)
     
     if not project:
         return JSONResponse(
@@ -127,7 +147,11 @@ async def search_index(request: Request,
         template_parser=request.app.template_parser
     )
     
-    result: List[RetrievedDocument] = await nlp_controller.search_vector_db(project=project, query_text=search_request.query, top_k=search_request.top_k)
+    result: List[RetrievedDocument] = await nlp_controller.search_vector_db(project=project, 
+                                                                           query_text=search_request.query, 
+                                                                           top_k=search_request.top_k,
+                                                                           search_mode=search_request.search_mode,
+                                                                           filters=search_request.filters)
     
     if not result:
         return JSONResponse(
@@ -143,6 +167,59 @@ async def search_index(request: Request,
     )
 
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(request: Request, 
+                             project_id: Union[int, str], 
+                             search_request: BatchSearchRequest,
+                             app_settings: Settings = Depends(get_settings)):
+    
+    if app_settings.DB_TYPE == DatabaseType.POSTGRES.value:
+        try:
+            project_id = int(project_id)
+        except ValueError:
+            return JSONResponse(
+                content={"message": "Project ID must be a number"},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+    
+    project = await request.app.project_cache.get_project(project_id=project_id)
+    
+    if not project:
+        return JSONResponse(
+            content=message_handler(ResponseMessage.PROJECT_NOT_FOUND.value.format(project_id=project_id)),
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+    
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser
+    )
+    
+    results: List[List[RetrievedDocument]] = await nlp_controller.search_vector_db_many(project=project, 
+                                                                                       query_texts=search_request.queries, 
+                                                                                       top_k=search_request.top_k,
+                                                                                       search_mode=search_request.search_mode,
+                                                                                       filters=search_request.filters)
+    
+    if not results:
+        return JSONResponse(
+            content=message_handler(ResponseMessage.VECTOR_DB_SEARCH_FAILED.value.format(project_id=project_id)),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    results = [
+        {"query": query, "results": [r.model_dump() for r in query_results]}
+        for query, query_results in zip(search_request.queries, results)
+    ]
+    
+    return JSONResponse(
+        content=message_handler(ResponseMessage.VECTOR_DB_SEARCH_COMPLETED.value.format(project_id=project_id), search_results=results),
+        status_code=status.HTTP_200_OK
+    )
+
+
 @nlp_router.post("/index/answer/{project_id}")
 @nlp_router.post("/index/answer")
 async def answer_query(request: Request, 
@@ -154,7 +231,9 @@ async def answer_query(request: Request,
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        reranker_client=request.app.reranker_client,
+        answer_cache=request.app.answer_cache
     )
     
     # If no project_id provided, use simple chatbot mode (no RAG)
@@ -199,12 +278,8 @@ async def answer_query(request: Request,
                 status_code=status.HTTP_400_BAD_REQUEST
             )
     
-    project_model = await ModelFactory.create_project_model(
-        db_type=app_settings.DB_TYPE,
-        db_client=request.app.db_client
-    )
-    
-    project = await project_model.get_project_or_create_one(project_id=project_id)
+    with observe_stage(AnswerStageEnums.PROJECT_LOOKUP.value, backend=app_settings.DB_TYPE):
+        project = await request.app.project_cache.get_project(project_id=project_id)
     
     if not project:
         return JSONResponse(
@@ -212,12 +287,41 @@ async def answer_query(request: Request,
             status_code=status.HTTP_404_NOT_FOUND
         )
     
-    try:
-        answer, full_prompt, chat_history = await nlp_controller.answer_query(project=project, 
+    async def generate_answer():
+        answer, full_prompt, chat_history, answer_stats = await nlp_controller.answer_query(project=project, 
                                                                         query_text=answer_request.query, 
                                                                         top_k=answer_request.top_k, 
                                                                         max_output_tokens=answer_request.max_tokens, 
-                                                                        temperature=answer_request.temperature)
+                                                                        temperature=answer_request.temperature,
+                                                                        search_mode=answer_request.search_mode,
+                                                                        filters=answer_request.filters)
+        if answer is None:
+            return None
+        return dict(answer=answer, full_prompt=full_prompt, chat_history=chat_history, **answer_stats)
+    
+    try:
+        if request.app.response_cache and answer_request.temperature <= app_settings.RESPONSE_CACHE_MAX_TEMPERATURE:
+            answer_params = {
+                "query": answer_request.query,
+                "top_k": answer_request.top_k,
+                "max_tokens": answer_request.max_tokens,
+                "temperature": answer_request.temperature,
+                "search_mode": answer_request.search_mode,
+                "filters": answer_request.filters,
+                # the same request is answered differently by another model or prompt language
+                "generation_backend": app_settings.GENERATION_BACKEND,
+                "generation_model_id": app_settings.GENERATION_MODEL_ID,
+                "language": app_settings.PRIMARY_LANGUAGE
+            }
+            answer_response, response_cache = await request.app.response_cache.get_or_compute(
+                collection_name=nlp_controller.generate_collection_name(project_id=project.project_id),
+                params=answer_params,
+                compute=generate_answer
+            )
+            if answer_response is not None:
+                answer_response = dict(answer_response, response_cache=response_cache)
+        else:
+            answer_response = await generate_answer()
     except Exception as e:
         logger.error(f"Answer generation failed for project {project_id}: {str(e)}")
         return JSONResponse(
@@ -225,14 +329,14 @@ async def answer_query(request: Request,
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
         
-    if answer is None:
+    if answer_response is None:
         return JSONResponse(
             content=message_handler(ResponseMessage.ANSWER_GENERATION_FAILED.value.format(project_id=project_id)),
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     
     return JSONResponse(
-        content=message_handler(ResponseMessage.ANSWER_GENERATION_SUCCESS.value.format(project_id=project_id), answer=answer, full_prompt=full_prompt, chat_history=chat_history),
+        content=message_handler(ResponseMessage.ANSWER_GENERATION_SUCCESS.value.format(project_id=project_id), **answer_response),
         status_code=status.HTTP_200_OK
     )
 
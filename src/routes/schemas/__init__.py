@@ -1,2 +1,2 @@
 from .data import ProcessRequest
-from .nlp import PushRequest, SearchRequest, AnswerRequest
+from .nlp import PushRequest, SearchRequest, BatchSearchRequest, AnswerRequest
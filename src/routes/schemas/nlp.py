@@ -1,15 +1,37 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List
+
+from stores.vectordb.VectorDBEnums import SearchModeEnums
+
+# every query of a batch is embedded in one provider call
+MAX_BATCH_QUERIES = 64
 
 class PushRequest(BaseModel):
     do_reset: Optional[int]=0
 
 class SearchRequest(BaseModel):
+    # unknown search modes are rejected, the controllers receive the plain value
+    model_config = ConfigDict(use_enum_values=True)
+    
     query: str
     top_k: Optional[int]=5
+    search_mode: Optional[SearchModeEnums]=None
+    filters: Optional[dict]=None
+
+class BatchSearchRequest(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
+    queries: List[str] = Field(min_length=1, max_length=MAX_BATCH_QUERIES)
+    top_k: Optional[int]=5
+    search_mode: Optional[SearchModeEnums]=None
+    filters: Optional[dict]=None
 
 class AnswerRequest(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     query: str
     top_k: Optional[int]=5
     temperature: Optional[float]=0.2
     max_tokens: Optional[int]=512
+    search_mode: Optional[SearchModeEnums]=None
+    filters: Optional[dict]=None
@@ -146,9 +146,12 @@ async def update_app_settings(request: Request, settings_request: SettingsUpdate
         
         # Reload settings to apply changes
         new_settings = reload_settings()
+        request.app.project_cache.clear()
         
         # Import here to avoid circular dependency
-        from main import initialize_database_connection, initialize_llm_clients, initialize_vector_db
+        from main import (initialize_database_connection, initialize_data_models, initialize_llm_clients, initialize_vector_db, 
+                          initialize_reranker, initialize_answer_cache, initialize_response_cache, initialize_task_progress, 
+                          initialize_lease_store)
         
         # Get the app instance
         app = request.app
@@ -157,7 +160,12 @@ async def update_app_settings(request: Request, settings_request: SettingsUpdate
         critical_keys = ['DB_TYPE', 'GENERATION_BACKEND', 'EMBEDDING_BACKEND', 
                         'VECTOR_DB_BACKEND', 'MONGO_URI', 'POSTGRES_HOST', 
                         'POSTGRES_PORT', 'POSTGRES_MAIN_DB', 'GENERATION_MODEL_ID',
-                        'EMBEDDING_MODEL_ID', 'EMBEDDING_MODEL_SIZE']
+                        'EMBEDDING_MODEL_ID', 'EMBEDDING_MODEL_SIZE', 'VECTOR_DB_PGVEC_TABLE_LAYOUT',
+                        'RERANKER_BACKEND', 'RERANKER_MODEL_PATH', 'ANSWER_CACHE_ENABLED', 
+                        'ANSWER_CACHE_SIMILARITY_THRESHOLD', 'ANSWER_CACHE_TTL_SECONDS', 'ANSWER_CACHE_MAX_ENTRIES', 
+                        'RESPONSE_CACHE_ENABLED', 'RESPONSE_CACHE_REDIS_URL', 'RESPONSE_CACHE_TTL_SECONDS', 
+                        'RESPONSE_CACHE_L1_MAX_ENTRIES', 'TASK_PROGRESS_REDIS_URL', 'TASK_PROGRESS_TTL_SECONDS', 
+                        'IDEMPOTENCY_BACKEND', 'IDEMPOTENCY_REDIS_URL', 'IDEMPOTENCY_LEASE_MS', 'IDEMPOTENCY_STATE_TTL_SECONDS']
         
         needs_reconnect = any(key in updates for key in critical_keys)
         
@@ -166,12 +174,28 @@ async def update_app_settings(request: Request, settings_request: SettingsUpdate
             
             if any(key in updates for key in ['DB_TYPE', 'MONGO_URI', 'POSTGRES_HOST', 'POSTGRES_PORT', 'POSTGRES_MAIN_DB', 'POSTGRES_USERNAME', 'POSTGRES_PASSWORD']):
                 await initialize_database_connection(app, new_settings)
+                await initialize_data_models(app, new_settings)
             
             if any(key in updates for key in ['GENERATION_BACKEND', 'EMBEDDING_BACKEND', 'GENERATION_MODEL_ID', 'EMBEDDING_MODEL_ID', 'EMBEDDING_MODEL_SIZE']):
                 await initialize_llm_clients(app, new_settings)
             
-            if any(key in updates for key in ['VECTOR_DB_BACKEND', 'VECTOR_DB_PATH', 'VECTOR_DB_PATH_NAME']):
+            if any(key in updates for key in ['VECTOR_DB_BACKEND', 'VECTOR_DB_PATH', 'VECTOR_DB_PATH_NAME', 'VECTOR_DB_PGVEC_TABLE_LAYOUT']):
                 await initialize_vector_db(app, new_settings)
+            
+            if any(key in updates for key in ['RERANKER_BACKEND', 'RERANKER_MODEL_PATH']):
+                await initialize_reranker(app, new_settings)
+            
+            # answers of the previous clients or cache settings are not reused
+            await initialize_answer_cache(app, new_settings)
+            
+            if any(key in updates for key in ['RESPONSE_CACHE_ENABLED', 'RESPONSE_CACHE_REDIS_URL', 'RESPONSE_CACHE_TTL_SECONDS', 'RESPONSE_CACHE_L1_MAX_ENTRIES']):
+                await initialize_response_cache(app, new_settings)
+            
+            if any(key in updates for key in ['TASK_PROGRESS_REDIS_URL', 'TASK_PROGRESS_TTL_SECONDS']):
+                await initialize_task_progress(app, new_settings)
+            
+            if any(key in updates for key in ['IDEMPOTENCY_BACKEND', 'IDEMPOTENCY_REDIS_URL', 'IDEMPOTENCY_LEASE_MS', 'IDEMPOTENCY_STATE_TTL_SECONDS']):
+                await initialize_lease_store(app, new_settings)
         
         return JSONResponse(
             content={
@@ -205,20 +229,29 @@ async def reload_app_settings(request: Request):
         new_settings = reload_settings()
         
         # Import here to avoid circular dependency
-        from main import initialize_database_connection, initialize_llm_clients, initialize_vector_db
+        from main import (initialize_database_connection, initialize_data_models, initialize_llm_clients, initialize_vector_db, 
+                          initialize_reranker, initialize_answer_cache, initialize_response_cache, initialize_task_progress, 
+                          initialize_lease_store)
         
         # Get the app instance
         app = request.app
         # Reinitialize all connections with new settings
         await initialize_database_connection(app, new_settings)
+        await initialize_data_models(app, new_settings)
         await initialize_llm_clients(app, new_settings)
         await initialize_vector_db(app, new_settings)
+        await initialize_reranker(app, new_settings)
+        await initialize_answer_cache(app, new_settings)
+        await initialize_response_cache(app, new_settings)
+        await initialize_task_progress(app, new_settings)
+        await initialize_lease_store(app, new_settings)
         
         # Update template parser
         from stores.llm.templates.template_parser import TemplateParser
         app.template_parser = TemplateParser(
             language=new_settings.PRIMARY_LANGUAGE, 
-            default_language=new_settings.DEFAULT_LANGUAGE
+            default_language=new_settings.DEFAULT_LANGUAGE, 
+            watch=new_settings.TEMPLATE_WATCH
         )
         
         logger.info("✅ All settings and connections reloaded successfully")
@@ -0,0 +1,99 @@
+import json
+import asyncio
+import logging
+from celery import states
+from celery.result import AsyncResult
+from fastapi import APIRouter, Depends, status, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from celery_app import celery_app
+from helpers.config import Settings, get_settings
+
+logger = logging.getLogger('uvicorn.error')
+
+tasks_router = APIRouter(
+    prefix="/api/v1/tasks",
+    tags=["api_v1", "tasks"],
+)
+
+
+def get_task_status(task_id: str) -> dict:
+    """Reads the task from the result backend; unknown task ids are PENDING."""
+    result = AsyncResult(task_id, app=celery_app)
+    task_status = {"task_id": task_id, "task_status": result.status}
+    
+    if result.successful():
+        task_status["result"] = result.result
+    elif result.failed():
+        task_status["error"] = str(result.result)
+    elif isinstance(result.info, dict):
+        # meta of update_state, e.g. the vector index build progress
+        task_status["info"] = result.info
+    
+    return task_status
+
+
+def format_event(data: dict, event: str) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@tasks_router.get("/{task_id}")
+async def get_task(request: Request, task_id: str):
+    task_status = await asyncio.to_thread(get_task_status, task_id)
+    
+    try:
+        progress = await request.app.task_progress.get_latest(task_id)
+    except Exception as e:
+        logger.warning(f"Failed to read the progress of task {task_id}: {str(e)}")
+        progress = None
+    
+    return JSONResponse(
+        content=jsonable_encoder({**task_status, "progress": progress}),
+        status_code=status.HTTP_200_OK
+    )
+
+
+@tasks_router.get("/{task_id}/stream")
+async def stream_task(request: Request, 
+                      task_id: str, 
+                      app_settings: Settings = Depends(get_settings)):
+    """
+    Server-sent events: a progress event per batch published by the worker, then
+    a status event with the task result once it is ready.
+    """
+    task_progress = request.app.task_progress
+    heartbeat_seconds = app_settings.TASK_PROGRESS_HEARTBEAT_SECONDS
+    
+    async def event_stream():
+        task_status = await asyncio.to_thread(get_task_status, task_id)
+        if task_status["task_status"] in states.READY_STATES:
+            yield format_event(task_status, event="status")
+            return
+        
+        progress_updates = task_progress.subscribe(task_id, heartbeat_seconds=heartbeat_seconds)
+        try:
+            async for progress in progress_updates:
+                if await request.is_disconnected():
+                    return
+                
+                if progress is not None:
+                    yield format_event(progress, event="progress")
+                    continue
+                
+                # tasks that publish no progress end with their result
+                task_status = await asyncio.to_thread(get_task_status, task_id)
+                if task_status["task_status"] in states.READY_STATES:
+                    break
+                yield ": keep-alive\n\n"
+        finally:
+            await progress_updates.aclose()
+        
+        task_status = await asyncio.to_thread(get_task_status, task_id)
+        yield format_event(task_status, event="status")
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,7 +1,9 @@
 from .llm.LLMFactory import LLMFactory
 from .vectordb.VectorDBFactory import VectorDBFactory
+from .reranker.RerankerFactory import RerankerFactory
 
 __all__ = [
     "LLMFactory",
-    "VectorDBFactory"
+    "VectorDBFactory",
+    "RerankerFactory"
 ]
@@ -3,6 +3,7 @@ from ..LLMEnums import GroqRolesEnums
 from groq import Groq as GroqClient
 import logging
 from ..utils import ModelUtils
+from ..token_utils import count_tiktoken_tokens
 from typing import List, Union
 
 class Groq(LLMInterface, ModelUtils):
@@ -87,3 +88,7 @@ class Groq(LLMInterface, ModelUtils):
             self.logger.warning("Input text exceeds the maximum allowed characters. It will be truncated.")
             
         return text[:self.default_input_max_characters]
+    
+    
+    def count_tokens(self, text: str) -> int:
+        return count_tiktoken_tokens(text, model_id=self.generation_model_id)
@@ -78,9 +78,12 @@ class Ollama(LLMInterface, ModelUtils):
             self.logger.error("Embedding model ID is not set for Ollama.")
             return None
         
+        if isinstance(text, str):
+            text = [text]
+        
         payload = {
             "model": self.embedding_model_id,
-            "input": [text]
+            "input": list(text)
         }
 
         try:
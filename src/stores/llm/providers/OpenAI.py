@@ -1,6 +1,7 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OPENAIRolesEnums
 from ..utils import ModelUtils
+from ..token_utils import count_tiktoken_tokens
 from openai import OpenAI as OpenAIClient
 import logging
 from typing import List, Union
@@ -108,4 +109,7 @@ class OpenAI(LLMInterface, ModelUtils):
             self.logger.warning("Input text exceeds the maximum allowed characters. It will be truncated.")
             
         return text[:self.default_input_max_characters]
-
+    
+    
+    def count_tokens(self, text: str) -> int:
+        return count_tiktoken_tokens(text, model_id=self.generation_model_id)
@@ -0,0 +1,82 @@
+from typing import List, Tuple
+
+from .template_parser import TemplateParser
+from ..LLMInterface import LLMInterface
+from utils.context_packer import ContextPacker
+
+
+class PromptBuilder:
+    """
+    Assembles the RAG prompt within a token budget, counted with the
+    generation client's tokenizer.
+    
+    The system and footer prompts are counted first. The retrieved documents
+    then fill the rest of the budget as rendered document prompts, best first.
+    Chat message framing is not counted, so leave a few tokens of headroom.
+    """
+    def __init__(self, 
+                 generation_client, 
+                 template_parser, 
+                 token_budget: int, 
+                 dedup_threshold: float=1.0, 
+                 merge_adjacent: bool=False):
+        
+        self.generation_client: LLMInterface = generation_client
+        self.template_parser: TemplateParser = template_parser
+        self.token_budget = token_budget
+        self.dedup_threshold = dedup_threshold
+        self.merge_adjacent = merge_adjacent
+    
+    def render_document(self, doc_num: int, chunk_text: str) -> str:
+        return self.template_parser.get_text(
+            group="rag", 
+            key="document_prompt", 
+            vars={"doc_num": doc_num, "chunk_text": chunk_text}
+        )
+    
+    def build(self, query_text: str, documents: List) -> Tuple[str, list, dict]:
+        """
+        Returns:
+            Tuple of (full_prompt, chat_history, token_counts)
+        """
+        count_tokens = self.generation_client.count_tokens
+        
+        system_prompt = self.template_parser.get_text(group="rag", key="system_prompt")
+        footer_prompt = self.template_parser.get_text(group="rag", key="footer_prompt", vars={"query": query_text})
+        system_tokens = count_tokens(system_prompt)
+        footer_tokens = count_tokens(footer_prompt)
+        
+        # the document template costs about the same for every chunk (+1 for the joining newline)
+        document_overhead = count_tokens(self.render_document(doc_num=len(documents), chunk_text="")) + 1
+        context_packer = ContextPacker(
+            dedup_threshold=self.dedup_threshold,
+            merge_adjacent=self.merge_adjacent,
+            token_counter=lambda text: count_tokens(text) + document_overhead
+        )
+        packed_documents = context_packer.pack(
+            documents=[document.model_copy(update={"text": document.text.strip()}) for document in documents],
+            token_budget=self.token_budget - system_tokens - footer_tokens
+        )
+        
+        documents_prompts = '\n'.join(
+            self.render_document(doc_num=idx + 1, chunk_text=document.text)
+            for idx, document in enumerate(packed_documents)
+        )
+        full_prompt = '\n\n'.join([documents_prompts, footer_prompt])
+        
+        chat_history = [
+            self.generation_client.construct_prompt(prompt=system_prompt, role=self.generation_client.enums.SYSTEM.value),
+        ]
+        
+        documents_tokens = count_tokens(documents_prompts)
+        token_counts = {
+            "budget": self.token_budget,
+            "system": system_tokens,
+            "documents": documents_tokens,
+            "footer": footer_tokens,
+            "total": system_tokens + count_tokens(full_prompt),
+            "retrieved_documents": len(documents),
+            "packed_documents": len(packed_documents)
+        }
+        
+        return full_prompt, chat_history, token_counts
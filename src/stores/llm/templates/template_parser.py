@@ -1,31 +1,100 @@
 import os
+import time
+import importlib
 from string import Template
 
 
 class TemplateParser:
     current_path = os.path.dirname(os.path.abspath(__file__))
+    locales_path = os.path.join(current_path, 'locales')
     
     def __init__(self, 
                  language: str, 
-                 default_language: str="en"):
-        
+                 default_language: str="en", 
+                 watch: bool=False, 
+                 watch_interval: float=2.0):
+        """
+        Every locale's templates are loaded once, here. With watch, changed
+        locale files are reloaded, checked at most every watch_interval seconds.
+        """
         self.default_language = default_language
         self.language = None
+        self.watch = watch
+        self.watch_interval = watch_interval
+        
+        # language -> group -> key -> Template
+        self.templates = {}
+        self._locales_mtime = None
+        self._next_watch_check = 0.0
+        self.load_templates()
+        
         self.set_language(language)
+    
+    def _get_locales_mtime(self) -> float:
+        mtimes = [
+            entry.stat().st_mtime
+            for language_dir in os.scandir(TemplateParser.locales_path) if language_dir.is_dir()
+            for entry in os.scandir(language_dir.path) if entry.name.endswith('.py')
+        ]
+        return max(mtimes, default=0.0)
+    
+    def load_templates(self, do_reload: bool=False):
+        templates = {}
+        for language_dir in os.scandir(TemplateParser.locales_path):
+            if not language_dir.is_dir() or language_dir.name.startswith('__'):
+                continue
+            
+            language = language_dir.name
+            for entry in os.scandir(language_dir.path):
+                group, extension = os.path.splitext(entry.name)
+                if extension != '.py' or group.startswith('__'):
+                    continue
+                
+                grp_module = importlib.import_module(f"stores.llm.templates.locales.{language}.{group}")
+                if do_reload:
+                    grp_module = importlib.reload(grp_module)
+                
+                templates.setdefault(language, {})[group] = {
+                    key: value for key, value in vars(grp_module).items()
+                    if isinstance(value, Template)
+                }
         
+        self.templates = templates
+        if self.watch:
+            self._locales_mtime = self._get_locales_mtime()
+    
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now < self._next_watch_check:
+            return
+        
+        self._next_watch_check = now + self.watch_interval
+        if self._get_locales_mtime() != self._locales_mtime:
+            self.load_templates(do_reload=True)
+            self.set_language(self.language)
+    
     def set_language(self, language: str):
         if not language:
             self.language = self.default_language
             return
         
-        language_path = os.path.join(TemplateParser.current_path, 'locales', language)
-        if os.path.exists(language_path):
+        if language in self.templates:
             self.language = language
             return
-
+        
         self.language = self.default_language
     
     
+    def get_template(self, group: str, key: str) -> Template:
+        if self.watch:
+            self._reload_if_changed()
+        
+        template = self.templates.get(self.language, {}).get(group, {}).get(key)
+        if template is None:
+            template = self.templates.get(self.default_language, {}).get(group, {}).get(key)
+        
+        return template
+    
     def get_text(self, 
                  group: str, 
                  key: str, 
@@ -34,26 +103,8 @@ class TemplateParser:
         if not (group and key):
             return None
         
-        # Sanitize group to prevent path traversal
-        if not group.replace('_', '').isalnum():
-            return None
-        
-        vars = vars or {}
-        
-        language = self.language
-        
-        group_path = os.path.join(TemplateParser.current_path, 'locales', self.language, f"{group}.py")
-        if not os.path.exists(group_path):
-            group_path = os.path.join(TemplateParser.current_path, 'locales', self.default_language, f"{group}.py")
-            language = self.default_language
-            
-        if not os.path.exists(group_path):
-            return None
-        
-        grp_module = __import__(f"stores.llm.templates.locales.{language}.{group}", fromlist=[group])
-        
-        k_attr: Template = getattr(grp_module, key, None)
+        k_attr = self.get_template(group=group, key=key)
         if not k_attr:
             return None
         
-        return k_attr.substitute(vars)
+        return k_attr.substitute(vars or {})
@@ -0,0 +1,44 @@
+import functools
+import logging
+import math
+
+import tiktoken
+
+logger = logging.getLogger('uvicorn')
+
+# used for models tiktoken has no mapping for (e.g. the open models served by groq)
+DEFAULT_TIKTOKEN_ENCODING = "o200k_base"
+
+
+def approximate_token_count(text: str) -> int:
+    """About four characters per token, for providers without a local tokenizer."""
+    return math.ceil(len(text) / 4)
+
+
+@functools.lru_cache(maxsize=16)
+def get_tiktoken_encoding(model_id: str):
+    """
+    Encodings are cached per model id, so the BPE ranks are loaded once per process.
+    
+    Returns:
+        The tiktoken encoding, or None when it cannot be loaded
+    """
+    try:
+        # provider prefixes such as "openai/gpt-oss-120b" are not part of tiktoken's model names
+        return tiktoken.encoding_for_model(model_id.split("/")[-1])
+    except KeyError:
+        pass
+    
+    try:
+        return tiktoken.get_encoding(DEFAULT_TIKTOKEN_ENCODING)
+    except Exception as e:
+        logger.warning(f"Could not load a tiktoken encoding for model: {model_id}; token counts are approximated. {str(e)}")
+        return None
+
+
+def count_tiktoken_tokens(text: str, model_id: str) -> int:
+    encoding = get_tiktoken_encoding(model_id or "")
+    if encoding is None:
+        return approximate_token_count(text)
+    
+    return len(encoding.encode(text, disallowed_special=()))
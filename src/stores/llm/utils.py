@@ -1,5 +1,6 @@
 from helpers.config import Settings
 from .LLMInterface import LLMInterface
+from .token_utils import approximate_token_count
 from typing import Type
 
 
@@ -14,6 +15,10 @@ class ModelUtils:
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
     
+    def count_tokens(self, text: str) -> int:
+        """Providers with a local tokenizer override this; others fall back to an estimate."""
+        return approximate_token_count(text)
+    
     @staticmethod
     def get_api_key(settings: Settings, Provider: Type[LLMInterface]) -> str:
         return {
@@ -0,0 +1,5 @@
+from enum import Enum
+
+class RerankerEnums(Enum):
+    MMR = "MMR"
+    CROSS_ENCODER = "CROSS_ENCODER"
@@ -0,0 +1,28 @@
+import os
+from helpers.config import Settings
+from . import RERANKER_REGISTRY
+from .RerankerInterface import RerankerInterface
+from controllers.BaseController import BaseController
+from typing import Type
+
+
+class RerankerFactory:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+    
+    def create(self, provider_cls: str):
+        Provider: Type[RerankerInterface] = RERANKER_REGISTRY.get(provider_cls)
+        
+        if not Provider:
+            return None
+        
+        # model files are resolved like the other assets, relative to src/
+        model_dir = os.path.join(BaseController.BASE_DIR, self.settings.RERANKER_MODEL_PATH or "")
+        
+        return Provider(
+            mmr_lambda=self.settings.RERANKER_MMR_LAMBDA,
+            model_path=os.path.join(model_dir, "model.onnx"),
+            tokenizer_path=os.path.join(model_dir, "tokenizer.json"),
+            max_length=self.settings.RERANKER_MAX_LENGTH,
+            batch_size=self.settings.RERANKER_BATCH_SIZE
+        )
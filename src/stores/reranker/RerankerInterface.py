@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import List
+from models.db_schemas import RetrievedDocument
+
+
+class RerankerInterface(ABC):
+    
+    # whether rerank needs the query and document embeddings
+    requires_vectors: bool = False
+    
+    @abstractmethod
+    def rerank(self, 
+               query_text: str, 
+               documents: List[RetrievedDocument], 
+               top_k: int, 
+               query_vector: list=None, 
+               document_vectors: List[list]=None) -> List[RetrievedDocument]:
+        """
+        Args:
+            query_text: The user query
+            documents: Candidates from the vector search, best first
+            top_k: Number of documents to keep
+            query_vector: Query embedding, only passed when requires_vectors is set
+            document_vectors: Candidate embeddings, aligned with documents
+        
+        Returns:
+            At most top_k documents, best first
+        """
+        pass
@@ -0,0 +1,9 @@
+from .RerankerEnums import RerankerEnums
+from .RerankerInterface import RerankerInterface
+from .providers import MMR, CrossEncoder
+from typing import Dict, Type
+
+RERANKER_REGISTRY: Dict[str, Type[RerankerInterface]] = {
+    RerankerEnums.MMR.value: MMR,
+    RerankerEnums.CROSS_ENCODER.value: CrossEncoder,
+}
@@ -0,0 +1,93 @@
+import logging
+import os
+from typing import List
+
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+from ..RerankerInterface import RerankerInterface
+from models.db_schemas import RetrievedDocument
+
+
+class CrossEncoder(RerankerInterface):
+    """
+    Scores every (query, chunk) pair with a local cross-encoder exported to
+    ONNX (e.g. cross-encoder/ms-marco-MiniLM-L-6-v2), on CPU.
+    
+    The model directory holds model.onnx and the tokenizer.json of the same
+    checkpoint. The session is created on first use.
+    """
+    def __init__(self, 
+                 model_path: str, 
+                 tokenizer_path: str, 
+                 max_length: int=512, 
+                 batch_size: int=32, 
+                 *args, **kwargs):
+        
+        self.model_path = model_path
+        self.tokenizer_path = tokenizer_path
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.logger = logging.getLogger('uvicorn')
+        
+        self.session = None
+        self.tokenizer = None
+    
+    def _load(self):
+        if self.session is not None:
+            return
+        
+        for path in (self.model_path, self.tokenizer_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Cross-encoder file not found: {path}")
+        
+        self.tokenizer = Tokenizer.from_file(self.tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        self.tokenizer.enable_padding()
+        
+        self.session = ort.InferenceSession(self.model_path, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.logger.info(f"Cross-encoder loaded: {self.model_path}")
+    
+    def _score(self, query_text: str, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch([(query_text, text) for text in texts])
+        
+        inputs = {
+            "input_ids": np.asarray([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.asarray([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+            "token_type_ids": np.asarray([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        logits = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+        
+        # single-logit models score relevance directly, two-class models in the last column
+        return logits.reshape(len(texts), -1)[:, -1]
+    
+    def rerank(self, 
+               query_text: str, 
+               documents: List[RetrievedDocument], 
+               top_k: int, 
+               query_vector: list=None, 
+               document_vectors: List[list]=None) -> List[RetrievedDocument]:
+        
+        if not documents:
+            return documents
+        
+        self._load()
+        
+        scores = np.concatenate([
+            self._score(query_text, [document.text for document in documents[start: start + self.batch_size]])
+            for start in range(0, len(documents), self.batch_size)
+        ])
+        
+        k = min(top_k, len(documents))
+        positions = np.argsort(-scores, kind="stable")[:k]
+        
+        return [
+            RetrievedDocument(
+                text=documents[position].text,
+                score=float(scores[position]),
+                metadata=documents[position].metadata,
+                record_id=documents[position].record_id
+            ) for position in positions
+        ]
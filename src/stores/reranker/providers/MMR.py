@@ -0,0 +1,68 @@
+import logging
+from typing import List
+
+import numpy as np
+
+from ..RerankerInterface import RerankerInterface
+from models.db_schemas import RetrievedDocument
+
+
+class MMR(RerankerInterface):
+    """
+    Maximal marginal relevance: greedily keeps the candidate most similar to
+    the query and least similar to the ones already kept, which drops the
+    near-duplicate chunks a high top_k tends to bring in.
+    
+    Every similarity comes from one matrix product over the normalized
+    embeddings; selecting k documents is then O(k * n).
+    """
+    requires_vectors = True
+    
+    def __init__(self, 
+                 mmr_lambda: float=0.7, 
+                 *args, **kwargs):
+        
+        # 1.0 ranks by relevance only, 0.0 by diversity only
+        self.mmr_lambda = mmr_lambda
+        self.logger = logging.getLogger('uvicorn')
+    
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+    
+    def rerank(self, 
+               query_text: str, 
+               documents: List[RetrievedDocument], 
+               top_k: int, 
+               query_vector: list=None, 
+               document_vectors: List[list]=None) -> List[RetrievedDocument]:
+        
+        if query_vector is None or document_vectors is None or len(document_vectors) != len(documents):
+            self.logger.warning("MMR reranking needs the query and document embeddings; keeping the search order.")
+            return documents[:top_k]
+        
+        if len(documents) <= 1:
+            return documents[:top_k]
+        
+        vectors = self._normalize(np.asarray(document_vectors, dtype=np.float32))
+        query = self._normalize(np.asarray(query_vector, dtype=np.float32))
+        
+        relevance = vectors @ query
+        similarity = vectors @ vectors.T
+        
+        selected = [int(np.argmax(relevance))]
+        # highest similarity of every candidate to the selected documents
+        max_similarity = similarity[selected[0]].copy()
+        is_selected = np.zeros(len(documents), dtype=bool)
+        is_selected[selected[0]] = True
+        
+        while len(selected) < min(top_k, len(documents)):
+            mmr_scores = self.mmr_lambda * relevance - (1 - self.mmr_lambda) * max_similarity
+            mmr_scores[is_selected] = -np.inf
+            
+            position = int(np.argmax(mmr_scores))
+            selected.append(position)
+            is_selected[position] = True
+            np.maximum(max_similarity, similarity[position], out=max_similarity)
+        
+        return [documents[position] for position in selected]
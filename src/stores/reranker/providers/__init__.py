@@ -0,0 +1,7 @@
+from .MMR import MMR
+from .CrossEncoder import CrossEncoder
+
+__all__ = [
+    "MMR",
+    "CrossEncoder",
+]
@@ -0,0 +1,194 @@
+import json
+import sqlite3
+from typing import Dict, List, Tuple
+
+from .utils import tokenize_text
+
+# sqlite caps the number of bound parameters per statement
+SQLITE_MAX_PARAMS = 500
+
+class RecordStore:
+    """
+    SQLite side table of an in-process vector collection.
+    
+    Maps the integer ids kept in the vector index to texts, metadata and chunk
+    ids, and keeps an FTS5 table of stemmed tokens for hybrid search.
+    """
+    def __init__(self, db_path: str, language: str=None):
+        self.db_path = db_path
+        self.language = language
+        self.has_text_search = True
+        
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+    
+    def _create_tables(self):
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "text TEXT, "
+                    "metadata TEXT, "
+                    "chunk_id INTEGER"
+                ")"
+            )
+            try:
+                self.connection.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS records_text "
+                    "USING fts5(tokens, tokenize='unicode61 remove_diacritics 0')"
+                )
+            except sqlite3.OperationalError:
+                # sqlite built without FTS5: hybrid search falls back to dense
+                self.has_text_search = False
+    
+    def close(self):
+        self.connection.close()
+    
+    def insert_many(self, 
+                    texts: List[str], 
+                    metadatas: List[dict]=None, 
+                    record_ids: List[int]=None) -> List[int]:
+        """
+        Returns:
+            The ids assigned to the records, to be stored in the vector index
+        """
+        if not metadatas:
+            metadatas = [None] * len(texts)
+        if not record_ids:
+            record_ids = [None] * len(texts)
+        
+        ids = []
+        with self.connection:
+            for text, metadata, chunk_id in zip(texts, metadatas, record_ids):
+                cursor = self.connection.execute(
+                    "INSERT INTO records (text, metadata, chunk_id) VALUES (?, ?, ?)",
+                    (text, json.dumps(metadata, ensure_ascii=False) if metadata else None, chunk_id)
+                )
+                ids.append(cursor.lastrowid)
+            
+            if self.has_text_search:
+                self.connection.executemany(
+                    "INSERT INTO records_text (rowid, tokens) VALUES (?, ?)",
+                    [
+                        (record_id, " ".join(tokenize_text(text, language=self.language)))
+                        for record_id, text in zip(ids, texts)
+                    ]
+                )
+        
+        return ids
+    
+    def get_many(self, ids: List[int]) -> Dict[int, dict]:
+        records = {}
+        ids = [int(record_id) for record_id in ids]
+        
+        for i in range(0, len(ids), SQLITE_MAX_PARAMS):
+            batch_ids = ids[i:i+SQLITE_MAX_PARAMS]
+            placeholders = ", ".join("?" * len(batch_ids))
+            rows = self.connection.execute(
+                f"SELECT id, text, metadata, chunk_id FROM records WHERE id IN ({placeholders})",
+                batch_ids
+            ).fetchall()
+            
+            for record_id, text, metadata, chunk_id in rows:
+                records[record_id] = {
+                    "text": text,
+                    "metadata": json.loads(metadata) if metadata else None,
+                    "chunk_id": chunk_id
+                }
+        
+        return records
+    
+    def delete_by_chunk_ids(self, chunk_ids: List[int]) -> List[int]:
+        """
+        Returns:
+            The ids of the deleted records
+        """
+        deleted_ids = []
+        chunk_ids = [int(chunk_id) for chunk_id in chunk_ids]
+        
+        with self.connection:
+            for i in range(0, len(chunk_ids), SQLITE_MAX_PARAMS):
+                batch_chunk_ids = chunk_ids[i:i+SQLITE_MAX_PARAMS]
+                placeholders = ", ".join("?" * len(batch_chunk_ids))
+                rows = self.connection.execute(
+                    f"SELECT id FROM records WHERE chunk_id IN ({placeholders})",
+                    batch_chunk_ids
+                ).fetchall()
+                deleted_ids.extend(row[0] for row in rows)
+            
+            for i in range(0, len(deleted_ids), SQLITE_MAX_PARAMS):
+                batch_ids = deleted_ids[i:i+SQLITE_MAX_PARAMS]
+                placeholders = ", ".join("?" * len(batch_ids))
+                self.connection.execute(f"DELETE FROM records WHERE id IN ({placeholders})", batch_ids)
+                if self.has_text_search:
+                    self.connection.execute(f"DELETE FROM records_text WHERE rowid IN ({placeholders})", batch_ids)
+        
+        return deleted_ids
+    
+    def scroll(self, after_id: int, limit: int) -> List[tuple]:
+        """
+        Returns:
+            (id, record) pairs with ids greater than after_id, in id order
+        """
+        rows = self.connection.execute(
+            "SELECT id, text, metadata, chunk_id FROM records WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit)
+        ).fetchall()
+        
+        return [
+            (record_id, {
+                "text": text,
+                "metadata": json.loads(metadata) if metadata else None,
+                "chunk_id": chunk_id
+            }) for record_id, text, metadata, chunk_id in rows
+        ]
+    
+    def _filter_clause(self, filters: dict) -> Tuple[str, list]:
+        """SQL condition on the metadata column matching every filter key and value."""
+        conditions, params = [], []
+        for key, value in filters.items():
+            path = '$."' + str(key).replace('"', '""') + '"'
+            if value is None:
+                conditions.append("json_type(metadata, ?) = 'null'")
+                params.append(path)
+            elif isinstance(value, (dict, list)):
+                conditions.append("json_extract(metadata, ?) = json(?)")
+                params.extend([path, json.dumps(value, ensure_ascii=False)])
+            else:
+                conditions.append("json_extract(metadata, ?) = ?")
+                params.extend([path, value])
+        
+        return " AND ".join(conditions), params
+    
+    def filter_ids(self, filters: dict) -> List[int]:
+        """Ids of the records whose metadata matches the filters."""
+        condition, params = self._filter_clause(filters)
+        rows = self.connection.execute(f"SELECT id FROM records WHERE {condition}", params).fetchall()
+        return [row[0] for row in rows]
+    
+    def search_text(self, query_text: str, limit: int, filters: dict=None) -> List[int]:
+        """BM25-ranked ids of the records matching any of the query terms."""
+        tokens = set(tokenize_text(query_text, language=self.language))
+        if not tokens or not self.has_text_search:
+            return []
+        
+        # tokens are plain word characters, so quoting them is enough
+        match_query = " OR ".join(f'"{token}"' for token in tokens)
+        params = [match_query]
+        filter_sql = ""
+        if filters:
+            condition, filter_params = self._filter_clause(filters)
+            filter_sql = f"AND rowid IN (SELECT id FROM records WHERE {condition}) "
+            params.extend(filter_params)
+        
+        rows = self.connection.execute(
+            "SELECT rowid FROM records_text WHERE records_text MATCH ? "
+            f"{filter_sql}"
+            "ORDER BY bm25(records_text) LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        
+        return [row[0] for row in rows]
+    
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
@@ -3,11 +3,19 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    FAISS = "FAISS"
+    NUMPY = "NUMPY"
+    LANCEDB = "LANCEDB"
+    # routes each collection to NUMPY-style memory or a durable backend by size
+    TIERED = "TIERED"
     
     # Upcoming
-    # FAISS = "FAISS"
     # CHROMA = "CHROMA"
 
+class VectorDBTierEnums(Enum):
+    MEMORY = "memory"
+    DURABLE = "durable"
+
 class DistanceMetricEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
@@ -26,14 +34,74 @@ class PgVectorDistanceMetricEnums(Enum):
     EUCLIDEAN = "vector_l2_ops"
     MANHATTAN = "vector_l1_ops"
 
+class FaissDistanceMetricEnums(Enum):
+    # cosine is served as inner product over L2-normalized vectors
+    COSINE = "cosine"
+    DOT = "inner_product"
+    EUCLIDEAN = "l2"
+
+class FaissIndexTypeEnums(Enum):
+    FLAT = "flat"
+    HNSW = "hnsw"
+    # collections stay flat until they hold enough vectors to train the quantizers
+    IVF_PQ = "ivf_pq"
+
+class LanceDBDistanceMetricEnums(Enum):
+    COSINE = "cosine"
+    DOT = "dot"
+    EUCLIDEAN = "l2"
+
+class LanceDBTableSchemaEnums(Enum):
+    CHUNK_ID = "chunk_id"
+    TEXT = "text"
+    METADATA = "metadata"
+    # delimited top-level metadata pairs that metadata filters match against
+    METADATA_PAIRS = "metadata_pairs"
+    VECTOR = "vector"
+    # distance column added to vector search results
+    DISTANCE = "_distance"
+    # bm25 score column added to full text search results
+    SCORE = "_score"
+    # row address column added by with_row_id
+    ROW_ID = "_rowid"
+
 class PgVectorTableSchemaEnums(Enum):
     ID = "id"
     TEXT = "text"
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    TEXT_SEARCH = "text_search"
+    PROJECT_ID = "project_id"
     _PREFIX = "pgvector"
 
+class PgVectorStatsTableEnums(Enum):
+    # row counts kept up to date on insert/delete, so info requests skip COUNT(*)
+    TABLE_NAME = "vector_collection_stats"
+    COLLECTION_NAME = "collection_name"
+    VECTOR_TABLE = "table_name"
+    RECORD_COUNT = "record_count"
+    LAST_INDEXED_AT = "last_indexed_at"
+
+class PgVectorTableLayoutEnums(Enum):
+    # one table (and one vector index) per project
+    PER_PROJECT = "per_project"
+    # one hash-partitioned table per embedding size, shared by all projects
+    PARTITIONED = "partitioned"
+
 class PgVectorIndexTypeEnums(Enum):
     IVFFLAT = "ivfflat"
     HNSW = "hnsw"
+
+class SearchModeEnums(Enum):
+    DENSE = "dense"
+    HYBRID = "hybrid"
+
+class TextSearchLanguageEnums(Enum):
+    # locale -> postgres text search config / snowball stemmer name
+    EN = "english"
+    AR = "arabic"
+    _DEFAULT = "simple"
+
+class QdrantSparseVectorEnums(Enum):
+    TEXT = "text"
@@ -1,9 +1,11 @@
 from helpers.config import Settings
 from . import VECTOR_DB_REGISTRY
+from .VectorDBEnums import VectorDBEnums
 from controllers.BaseController import BaseController
 from typing import Type
 from .VectorDBInterface import VectorDBInterface
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from utils.index_version import IndexVersionStore
 
 class VectorDBFactory:
     def __init__(self, settings: Settings, db_client: async_sessionmaker=None):
@@ -17,8 +19,12 @@ class VectorDBFactory:
         if not Provider:
             return None
         
+        if provider_cls == VectorDBEnums.TIERED.value:
+            return self.create_tiered(Provider)
+        
         db_path = self.base_controller.get_database_path(db_name=self.settings.VECTOR_DB_PATH_NAME)
-        db_url = self.settings.QDRANT_URL if self.settings.VECTOR_DB_BACKEND == "QDRANT" else None
+        # keyed on the created provider, which differs from VECTOR_DB_BACKEND for tiered routing
+        db_url = self.settings.QDRANT_URL if provider_cls == VectorDBEnums.QDRANT.value else None
         
         return Provider(
             db_path=db_path,
@@ -26,5 +32,49 @@ class VectorDBFactory:
             db_client=self.db_client,
             distance_metric=self.settings.VECTOR_DB_DISTANCE_METRIC,
             index_threshold=self.settings.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
-            default_vector_size=self.settings.EMBEDDING_MODEL_SIZE
+            default_vector_size=self.settings.EMBEDDING_MODEL_SIZE,
+            language=self.settings.PRIMARY_LANGUAGE,
+            hybrid_prefetch=self.settings.VECTOR_DB_HYBRID_PREFETCH,
+            rrf_k=self.settings.VECTOR_DB_HYBRID_RRF_K,
+            table_layout=self.settings.VECTOR_DB_PGVEC_TABLE_LAYOUT,
+            partitions_count=self.settings.VECTOR_DB_PGVEC_PARTITIONS,
+            maintenance_work_mem=self.settings.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+            max_parallel_maintenance_workers=self.settings.VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS,
+            index_type=self.settings.VECTOR_DB_FAISS_INDEX_TYPE,
+            hnsw_m=self.settings.VECTOR_DB_FAISS_HNSW_M,
+            hnsw_ef_search=self.settings.VECTOR_DB_FAISS_HNSW_EF_SEARCH,
+            ivf_nlist=self.settings.VECTOR_DB_FAISS_IVF_NLIST,
+            ivf_nprobe=self.settings.VECTOR_DB_FAISS_IVF_NPROBE,
+            pq_m=self.settings.VECTOR_DB_FAISS_PQ_M,
+            cache_size=self.settings.VECTOR_DB_FAISS_CACHE_SIZE,
+            ivf_pq_threshold=self.settings.VECTOR_DB_LANCEDB_IVF_PQ_THRESHOLD,
+            ivf_partitions=self.settings.VECTOR_DB_LANCEDB_IVF_PARTITIONS,
+            pq_sub_vectors=self.settings.VECTOR_DB_LANCEDB_PQ_SUB_VECTORS,
+            nprobes=self.settings.VECTOR_DB_LANCEDB_NPROBES,
+            refine_factor=self.settings.VECTOR_DB_LANCEDB_REFINE_FACTOR
         )
+    
+    def create_tiered(self, Provider: Type[VectorDBInterface]):
+        durable_backend_cls = self.settings.VECTOR_DB_TIERED_DURABLE_BACKEND
+        if durable_backend_cls == VectorDBEnums.TIERED.value:
+            raise ValueError("The durable backend of tiered routing cannot be TIERED itself.")
+        
+        durable_backend = self.create(durable_backend_cls)
+        if not durable_backend:
+            raise ValueError(f"Invalid durable backend for tiered routing: {durable_backend_cls}")
+        
+        return Provider(
+            durable_backend=durable_backend,
+            distance_metric=self.settings.VECTOR_DB_DISTANCE_METRIC,
+            tier_threshold=self.settings.VECTOR_DB_TIERED_THRESHOLD,
+            revalidate_seconds=self.settings.VECTOR_DB_TIERED_REVALIDATE_SECONDS,
+            cache_size=self.settings.VECTOR_DB_TIERED_CACHE_SIZE,
+            max_memory_bytes=self.settings.VECTOR_DB_TIERED_MAX_MEMORY_MB * 1024 * 1024,
+            index_versions=self.create_index_versions()
+        )
+    
+    def create_index_versions(self):
+        redis_url = self.settings.INDEX_VERSION_REDIS_URL or self.settings.CELERY_RESULT_BACKEND
+        if not redis_url:
+            return None
+        return IndexVersionStore(redis_url=redis_url)
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
-from models.db_schemas import RetrievedDocument
+from typing import List, Optional, Tuple, Union
+from models.db_schemas import RetrievedDocument, VectorRecord
 
 
 class VectorDBInterface(ABC):
@@ -29,7 +29,11 @@ class VectorDBInterface(ABC):
         pass
     
     @abstractmethod
-    def get_collection_info(self, collection_name: str) -> dict:
+    def get_collection_info(self, collection_name: str, exact: bool=False) -> dict:
+        pass
+    
+    @abstractmethod
+    def count_records(self, collection_name: str, exact: bool=False) -> int:
         pass
     
     @abstractmethod
@@ -59,5 +63,53 @@ class VectorDBInterface(ABC):
     def search_by_vector(self, 
                          collection_name: str, 
                          query_vector: List[float], 
-                         top_k: int=5) -> List[RetrievedDocument]:
+                         top_k: int=5, 
+                         filters: dict=None, 
+                         with_vectors: bool=False) -> List[RetrievedDocument]:
+        """
+        Args:
+            filters: metadata key -> value pairs that every result must match
+            with_vectors: return every result with its stored vector
+        """
+        pass
+    
+    @abstractmethod
+    def search_hybrid(self, 
+                      collection_name: str, 
+                      query_vector: List[float], 
+                      query_text: str, 
+                      top_k: int=5, 
+                      filters: dict=None, 
+                      with_vectors: bool=False) -> List[RetrievedDocument]:
+        pass
+    
+    @abstractmethod
+    def search_many(self, 
+                    collection_name: str, 
+                    query_vectors: List[List[float]], 
+                    top_k: int=5, 
+                    filters: dict=None) -> List[List[RetrievedDocument]]:
+        """
+        Args:
+            filters: metadata key -> value pairs that every result of every query must match
+        """
+        pass
+    
+    @abstractmethod
+    def scroll(self, 
+               collection_name: str, 
+               batch_size: int=1000, 
+               offset: Optional[Union[int, str]]=None) -> Tuple[List[VectorRecord], Optional[Union[int, str]]]:
+        """
+        Returns:
+            (records, next_offset); next_offset is None once the collection is exhausted
+        """
+        pass
+    
+    @abstractmethod
+    def start_bulk_load(self, collection_name: str):
+        pass
+    
+    @abstractmethod
+    def finish_bulk_load(self, collection_name: str, progress_callback=None):
         pass
@@ -1,9 +1,13 @@
 from .VectorDBEnums import VectorDBEnums
 from .VectorDBInterface import VectorDBInterface
-from .providers import Qdrant, PgVector
+from .providers import Qdrant, PgVector, Faiss, NumPy, Tiered, LanceDB
 from typing import Dict, Type
 
 VECTOR_DB_REGISTRY: Dict[str, Type[VectorDBInterface]] = {
     VectorDBEnums.QDRANT.value: Qdrant,
     VectorDBEnums.PGVECTOR.value: PgVector,
+    VectorDBEnums.FAISS.value: Faiss,
+    VectorDBEnums.NUMPY.value: NumPy,
+    VectorDBEnums.TIERED.value: Tiered,
+    VectorDBEnums.LANCEDB.value: LanceDB,
 }
@@ -0,0 +1,538 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import (
+    DistanceMetricEnums,
+    VectorDBEnums,
+    FaissDistanceMetricEnums,
+    FaissIndexTypeEnums
+)
+from ..RecordStore import RecordStore
+from ..utils import get_distance_metrics, reciprocal_rank_fusion
+from models.db_schemas import RetrievedDocument, VectorRecord
+
+# faiss recommends ~39 training points per IVF list
+IVF_TRAINING_POINTS_PER_LIST = 39
+# each 8-bit PQ codebook has 256 centroids to train
+PQ_MIN_TRAINING_POINTS = 256 * IVF_TRAINING_POINTS_PER_LIST
+# IO_FLAG_MMAP maps the inverted lists of IVF indexes; faiss versions with
+# IO_FLAG_MMAP_IFC can also map the flat codes behind flat and HNSW indexes.
+# The two flags cannot be combined on IVF indexes.
+IVF_READ_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+FLAT_READ_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+class Faiss(VectorDBInterface):
+    def __init__(self, 
+                 db_path: str, 
+                 distance_metric: str=None, 
+                 default_vector_size: int=786, 
+                 language: str=None, 
+                 hybrid_prefetch: int=50, 
+                 rrf_k: int=60, 
+                 index_type: str=FaissIndexTypeEnums.HNSW.value, 
+                 hnsw_m: int=32, 
+                 hnsw_ef_search: int=64, 
+                 ivf_nlist: int=256, 
+                 ivf_nprobe: int=16, 
+                 pq_m: int=16, 
+                 cache_size: int=32, 
+                 *args, **kwargs):
+        
+        # keep the files apart from the local qdrant storage sharing the same path
+        self.db_path = os.path.join(db_path, "faiss")
+        self.default_vector_size = default_vector_size
+        self.language = language
+        self.hybrid_prefetch = hybrid_prefetch
+        self.rrf_k = rrf_k
+        
+        if index_type not in [index.value for index in FaissIndexTypeEnums]:
+            raise ValueError(f"Invalid index type for Faiss: {index_type}")
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.pq_m = pq_m
+        self.ivf_training_size = max(ivf_nlist * IVF_TRAINING_POINTS_PER_LIST, PQ_MIN_TRAINING_POINTS)
+        
+        metrics_map = get_distance_metrics(vectordb_type=VectorDBEnums.FAISS.value)
+        
+        if distance_metric and distance_metric in metrics_map:
+            self.distance_metric = metrics_map[distance_metric]
+        elif distance_metric:
+            raise ValueError(f"Invalid distance metric for Faiss: {distance_metric}")
+        else:
+            self.distance_metric = metrics_map[DistanceMetricEnums.COSINE.value]
+        
+        self.metric_type = (
+            faiss.METRIC_L2 if self.distance_metric == FaissDistanceMetricEnums.EUCLIDEAN.value
+            else faiss.METRIC_INNER_PRODUCT
+        )
+        self.normalize_vectors = self.distance_metric == FaissDistanceMetricEnums.COSINE.value
+        
+        # collection_name -> (memory-mapped index, file mtime), least recently used first
+        self.cache_size = cache_size
+        self._readers = OrderedDict()
+        # collection_name -> writable index held in memory; inserts reach the index
+        # file once, in finish_bulk_load or disconnect, instead of once per batch
+        self._writable_indexes = {}
+        self._bulk_loads = set()
+        self._record_stores = {}
+        
+        self.logger = logging.getLogger('uvicorn')
+    
+    async def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+    
+    async def disconnect(self):
+        for collection_name in list(self._writable_indexes):
+            await self._persist_index(collection_name)
+        self._bulk_loads = set()
+        
+        for record_store in self._record_stores.values():
+            record_store.close()
+        
+        self._record_stores = {}
+        self._readers = OrderedDict()
+    
+    def _collection_dir(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+    
+    def _index_path(self, collection_name: str) -> str:
+        return os.path.join(self._collection_dir(collection_name), "index.faiss")
+    
+    def _config_path(self, collection_name: str) -> str:
+        return os.path.join(self._collection_dir(collection_name), "collection.json")
+    
+    def _read_config(self, collection_name: str) -> dict:
+        with open(self._config_path(collection_name), "r") as f:
+            return json.load(f)
+    
+    def get_record_store(self, collection_name: str) -> RecordStore:
+        if collection_name not in self._record_stores:
+            self._record_stores[collection_name] = RecordStore(
+                db_path=os.path.join(self._collection_dir(collection_name), "records.sqlite"),
+                language=self.language
+            )
+        return self._record_stores[collection_name]
+    
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(self._config_path(collection_name))
+    
+    async def list_collections(self) -> List:
+        if not os.path.isdir(self.db_path):
+            return []
+        
+        return sorted(
+            collection_name for collection_name in os.listdir(self.db_path)
+            if os.path.exists(self._config_path(collection_name))
+        )
+    
+    async def get_collection_info(self, collection_name: str, exact: bool=False) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return None
+        
+        config = self._read_config(collection_name)
+        # ntotal is always exact for faiss
+        index = await self._get_index(collection_name)
+        return {
+            **config,
+            "record_count": index.ntotal,
+            "is_trained": config["index_type"] != FaissIndexTypeEnums.IVF_PQ.value or self._is_ivf(index),
+            "index_size_bytes": os.path.getsize(self._index_path(collection_name)),
+            "is_bulk_loading": collection_name in self._bulk_loads
+        }
+    
+    async def count_records(self, collection_name: str, exact: bool=False) -> int:
+        index = await self._get_index(collection_name)
+        return index.ntotal
+    
+    async def delete_collection(self, collection_name: str):
+        self.logger.info(f"Deleting collection: {collection_name}")
+        self._readers.pop(collection_name, None)
+        self._writable_indexes.pop(collection_name, None)
+        self._bulk_loads.discard(collection_name)
+        
+        record_store = self._record_stores.pop(collection_name, None)
+        if record_store:
+            record_store.close()
+        
+        shutil.rmtree(self._collection_dir(collection_name), ignore_errors=True)
+        return True
+    
+    async def create_collection(self, 
+                          collection_name: str, 
+                          embedding_size: int, 
+                          do_reset: bool=False):
+        if do_reset:
+            await self.delete_collection(collection_name=collection_name)
+        
+        if await self.is_collection_existed(collection_name):
+            return False
+        
+        if self.index_type == FaissIndexTypeEnums.IVF_PQ.value and embedding_size % self.pq_m != 0:
+            raise ValueError(f"Embedding size {embedding_size} is not divisible by the PQ sub-quantizers: {self.pq_m}")
+        
+        self.logger.info(f"Creating Faiss Collection: {collection_name}.")
+        os.makedirs(self._collection_dir(collection_name), exist_ok=True)
+        
+        index = self._build_empty_index(embedding_size=embedding_size)
+        self._write_index(index, self._index_path(collection_name))
+        self.get_record_store(collection_name)
+        
+        # the config file marks the collection as complete, so it is written last
+        with open(self._config_path(collection_name), "w") as f:
+            json.dump({
+                "embedding_size": embedding_size,
+                "index_type": self.index_type,
+                "distance_metric": self.distance_metric
+            }, f)
+        
+        return True
+    
+    def _build_empty_index(self, embedding_size: int):
+        if self.index_type == FaissIndexTypeEnums.HNSW.value:
+            return faiss.index_factory(embedding_size, f"IDMap2,HNSW{self.hnsw_m}", self.metric_type)
+        
+        # IVF-PQ collections start flat and are trained once they are large enough
+        return faiss.index_factory(embedding_size, "IDMap2,Flat", self.metric_type)
+    
+    def _is_ivf(self, index) -> bool:
+        return faiss.try_extract_index_ivf(index) is not None
+    
+    def _train_ivf_pq(self, index, embedding_size: int):
+        id_map = faiss.downcast_index(index)
+        ids = faiss.vector_to_array(id_map.id_map).astype("int64")
+        vectors = faiss.downcast_index(id_map.index).reconstruct_n(0, id_map.ntotal)
+        
+        ivf_index = faiss.index_factory(embedding_size, f"IVF{self.ivf_nlist},PQ{self.pq_m}", self.metric_type)
+        ivf_index.train(vectors)
+        ivf_index.add_with_ids(vectors, ids)
+        return ivf_index
+    
+    def _configure_search(self, index):
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None:
+            ivf_index.nprobe = self.ivf_nprobe
+            return
+        
+        if isinstance(index, faiss.IndexIDMap):
+            inner_index = faiss.downcast_index(index.index)
+            if isinstance(inner_index, faiss.IndexHNSW):
+                inner_index.hnsw.efSearch = self.hnsw_ef_search
+    
+    def _search_params(self, index, allowed_ids: List[int]):
+        """Search parameters restricting the scan to the given ids, keeping the configured search breadth."""
+        allowed_ids = np.asarray(allowed_ids, dtype="int64")
+        selector = faiss.IDSelectorBatch(len(allowed_ids), faiss.swig_ptr(allowed_ids))
+        
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None:
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=self.ivf_nprobe)
+        elif isinstance(index, faiss.IndexIDMap) and isinstance(faiss.downcast_index(index.index), faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.hnsw_ef_search)
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        
+        # the selector only references the id array
+        params.allowed_ids = allowed_ids
+        return params
+    
+    async def _search_index(self, collection_name: str, index, queries: np.ndarray, top_k: int, filters: dict=None):
+        if not filters:
+            return await asyncio.to_thread(index.search, queries, top_k)
+        
+        allowed_ids = self.get_record_store(collection_name).filter_ids(filters)
+        if not allowed_ids:
+            return (
+                np.zeros((len(queries), 0), dtype="float32"),
+                np.zeros((len(queries), 0), dtype="int64")
+            )
+        
+        params = self._search_params(index, allowed_ids)
+        return await asyncio.to_thread(index.search, queries, min(top_k, len(allowed_ids)), params=params)
+    
+    def _write_index(self, index, index_path: str):
+        # readers keep mapping the old file until they reload it
+        tmp_path = f"{index_path}.tmp"
+        faiss.write_index(index, tmp_path)
+        os.replace(tmp_path, index_path)
+    
+    async def _get_index(self, collection_name: str):
+        """Collections with unwritten inserts are served from memory, all others are memory-mapped."""
+        if collection_name in self._writable_indexes:
+            return self._writable_indexes[collection_name]
+        
+        index_path = self._index_path(collection_name)
+        mtime = os.stat(index_path).st_mtime_ns
+        
+        cached = self._readers.get(collection_name)
+        if cached and cached[1] == mtime:
+            self._readers.move_to_end(collection_name)
+            return cached[0]
+        
+        read_flags = (
+            IVF_READ_FLAGS if self._read_config(collection_name)["index_type"] == FaissIndexTypeEnums.IVF_PQ.value
+            else FLAT_READ_FLAGS
+        )
+        index = await asyncio.to_thread(faiss.read_index, index_path, read_flags)
+        self._configure_search(index)
+        
+        self._readers[collection_name] = (index, mtime)
+        self._readers.move_to_end(collection_name)
+        while len(self._readers) > self.cache_size:
+            self._readers.popitem(last=False)
+        
+        return index
+    
+    async def _get_writable_index(self, collection_name: str):
+        if collection_name not in self._writable_indexes:
+            self._writable_indexes[collection_name] = await asyncio.to_thread(
+                faiss.read_index, self._index_path(collection_name))
+        return self._writable_indexes[collection_name]
+    
+    async def _persist_index(self, collection_name: str) -> bool:
+        index = self._writable_indexes.pop(collection_name, None)
+        if index is None:
+            return False
+        
+        await asyncio.to_thread(self._write_index, index, self._index_path(collection_name))
+        self._readers.pop(collection_name, None)
+        return True
+    
+    def _prepare_vectors(self, vectors: List[List[float]]) -> np.ndarray:
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        if self.normalize_vectors:
+            faiss.normalize_L2(vectors)
+        return vectors
+    
+    async def insert_one(self, 
+                   collection_name: str, 
+                   text: str, 
+                   vector: list, 
+                   metadata: dict=None, 
+                   record_id: str=None):
+        
+        return await self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadatas=[metadata],
+            record_ids=[record_id] if record_id else None
+        )
+    
+    async def insert_many(self, 
+                    collection_name: str, 
+                    texts: list, 
+                    vectors: list, 
+                    metadatas: list=None, 
+                    record_ids: list=None, 
+                    batch_size: int=50):
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot insert into Collection: {collection_name} does not exist.")
+            return False
+        
+        if len(texts) != len(vectors) or (record_ids and len(record_ids) != len(vectors)):
+            self.logger.error(f"Invalid data items for collection: {collection_name}.")
+            return False
+        
+        if not vectors:
+            return True
+        
+        config = self._read_config(collection_name)
+        vectors = self._prepare_vectors(vectors)
+        if vectors.shape[1] != config["embedding_size"]:
+            self.logger.error(f"Vector size {vectors.shape[1]} does not match collection: {collection_name}.")
+            return False
+        
+        index = await self._get_writable_index(collection_name)
+        ids = self.get_record_store(collection_name).insert_many(
+            texts=texts,
+            metadatas=metadatas,
+            record_ids=record_ids
+        )
+        await asyncio.to_thread(index.add_with_ids, vectors, np.asarray(ids, dtype="int64"))
+        
+        if (config["index_type"] == FaissIndexTypeEnums.IVF_PQ.value
+            and not self._is_ivf(index)
+            and index.ntotal >= self.ivf_training_size):
+            self.logger.info(f"Training IVF-PQ index for collection: {collection_name} on {index.ntotal} vectors")
+            index = await asyncio.to_thread(self._train_ivf_pq, index, config["embedding_size"])
+        
+        # written to the index file by finish_bulk_load or disconnect
+        self._writable_indexes[collection_name] = index
+        
+        return True
+    
+    def _enable_reconstruct(self, index):
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None and ivf_index.direct_map.type == faiss.DirectMap.NoMap:
+            # ids are side table ids, not 0..n-1, so a hashtable direct map is needed
+            ivf_index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index
+    
+    def _to_documents(self, collection_name: str, scores, ids, index=None) -> List[RetrievedDocument]:
+        """Documents of the hits; with an index, each one carries its vector reconstructed from it."""
+        hits = [(int(record_id), float(score)) for record_id, score in zip(ids, scores) if record_id != -1]
+        records = self.get_record_store(collection_name).get_many([record_id for record_id, _ in hits])
+        
+        return [
+            RetrievedDocument(
+                text=records[record_id]["text"],
+                score=score,
+                metadata=records[record_id]["metadata"],
+                record_id=records[record_id]["chunk_id"],
+                vector=index.reconstruct(record_id).tolist() if index is not None else None
+            ) for record_id, score in hits if record_id in records
+        ]
+    
+    async def search_by_vector(self, 
+                         collection_name: str, 
+                         query_vector: list, 
+                         top_k: int=5, 
+                         filters: dict=None, 
+                         with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        index = await self._get_index(collection_name)
+        if index.ntotal == 0:
+            return None
+        
+        scores, ids = await self._search_index(
+            collection_name, index, self._prepare_vectors([query_vector]), top_k, filters=filters)
+        results = self._to_documents(
+            collection_name, scores[0], ids[0], index=self._enable_reconstruct(index) if with_vectors else None)
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return results
+    
+    async def search_many(self, 
+                          collection_name: str, 
+                          query_vectors: List[list], 
+                          top_k: int=5, 
+                          filters: dict=None) -> List[List[RetrievedDocument]]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        if not query_vectors:
+            return []
+        
+        index = await self._get_index(collection_name)
+        if index.ntotal == 0:
+            return [[] for _ in query_vectors]
+        
+        scores, ids = await self._search_index(
+            collection_name, index, self._prepare_vectors(query_vectors), top_k, filters=filters)
+        return [
+            self._to_documents(collection_name, query_scores, query_ids)
+            for query_scores, query_ids in zip(scores, ids)
+        ]
+    
+    async def search_hybrid(self, 
+                            collection_name: str, 
+                            query_vector: list, 
+                            query_text: str, 
+                            top_k: int=5, 
+                            filters: dict=None, 
+                            with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        record_store = self.get_record_store(collection_name)
+        if not record_store.has_text_search:
+            self.logger.warning(f"Collection: {collection_name} has no text search; falling back to dense search.")
+            return await self.search_by_vector(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                top_k=top_k,
+                filters=filters,
+                with_vectors=with_vectors
+            )
+        
+        index = await self._get_index(collection_name)
+        if index.ntotal == 0:
+            return None
+        
+        prefetch = max(self.hybrid_prefetch, top_k)
+        _, ids = await self._search_index(
+            collection_name, index, self._prepare_vectors([query_vector]), prefetch, filters=filters)
+        dense_ids = [int(record_id) for record_id in ids[0] if record_id != -1]
+        lexical_ids = record_store.search_text(query_text, limit=prefetch, filters=filters)
+        
+        fused = reciprocal_rank_fusion([dense_ids, lexical_ids], rrf_k=self.rrf_k, top_k=top_k)
+        records = record_store.get_many([record_id for record_id, _ in fused])
+        if with_vectors:
+            self._enable_reconstruct(index)
+        
+        results = [
+            RetrievedDocument(
+                text=records[record_id]["text"],
+                score=score,
+                metadata=records[record_id]["metadata"],
+                record_id=records[record_id]["chunk_id"],
+                vector=index.reconstruct(record_id).tolist() if with_vectors else None
+            ) for record_id, score in fused if record_id in records
+        ]
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return results
+    
+    async def scroll(self, 
+                     collection_name: str, 
+                     batch_size: int=1000, 
+                     offset: Optional[int]=None) -> Tuple[List[VectorRecord], Optional[int]]:
+        """
+        Page through the side table in id order; the offset is the last id returned.
+        Vectors are reconstructed from the index, so IVF-PQ ones are approximate.
+        """
+        if not await self.is_collection_existed(collection_name):
+            return [], None
+        
+        index = self._enable_reconstruct(await self._get_index(collection_name))
+        
+        rows = self.get_record_store(collection_name).scroll(after_id=offset or 0, limit=batch_size)
+        records = [
+            VectorRecord(
+                text=record["text"],
+                vector=index.reconstruct(record_id).tolist(),
+                metadata=record["metadata"],
+                record_id=record["chunk_id"]
+            ) for record_id, record in rows
+        ]
+        
+        next_offset = rows[-1][0] if len(rows) == batch_size else None
+        return records, next_offset
+    
+    async def start_bulk_load(self, collection_name: str):
+        """Keep a writable index in memory and write it to disk once in finish_bulk_load."""
+        if not await self.is_collection_existed(collection_name):
+            return False
+        
+        await self._get_writable_index(collection_name)
+        self._bulk_loads.add(collection_name)
+        return True
+    
+    async def finish_bulk_load(self, collection_name: str, progress_callback=None):
+        self._bulk_loads.discard(collection_name)
+        return await self._persist_index(collection_name)
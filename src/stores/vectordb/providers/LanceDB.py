@@ -0,0 +1,596 @@
+import json
+import logging
+import os
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+from lancedb.index import FTS, IvfPq
+
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import (
+    DistanceMetricEnums,
+    VectorDBEnums,
+    LanceDBDistanceMetricEnums,
+    LanceDBTableSchemaEnums,
+    TextSearchLanguageEnums
+)
+from ..utils import get_distance_metrics, get_text_search_language, reciprocal_rank_fusion
+from models.db_schemas import RetrievedDocument, VectorRecord
+
+# tables are re-checked for writes of other processes (the celery worker) on every read
+READ_CONSISTENCY_INTERVAL = timedelta(seconds=0)
+# fold appended rows into the indexes (and compact small fragments) past this many unindexed rows
+OPTIMIZE_UNINDEXED_ROWS = 10000
+# delimits the top-level "key": value pairs of the metadata; json escapes it inside strings
+METADATA_PAIR_SEPARATOR = "\x1f"
+
+class LanceDB(VectorDBInterface):
+    """
+    Embedded LanceDB tables, one per collection, stored as Lance columnar files.
+    
+    Collections larger than RAM are searched from disk: vectors get an IVF-PQ
+    index once they reach ivf_pq_threshold rows (exact scans below that), texts
+    get a full text index for hybrid search, and results are read as Arrow.
+    """
+    def __init__(self, 
+                 db_path: str, 
+                 distance_metric: str=None, 
+                 default_vector_size: int=786, 
+                 language: str=None, 
+                 hybrid_prefetch: int=50, 
+                 rrf_k: int=60, 
+                 ivf_pq_threshold: int=100000, 
+                 ivf_partitions: int=256, 
+                 pq_sub_vectors: int=16, 
+                 nprobes: int=20, 
+                 refine_factor: int=10, 
+                 *args, **kwargs):
+        
+        self.db_path = os.path.join(db_path, "lancedb")
+        self.default_vector_size = default_vector_size
+        self.hybrid_prefetch = hybrid_prefetch
+        self.rrf_k = rrf_k
+        
+        self.ivf_pq_threshold = ivf_pq_threshold
+        self.ivf_partitions = ivf_partitions
+        self.pq_sub_vectors = pq_sub_vectors
+        self.nprobes = nprobes
+        self.refine_factor = refine_factor
+        
+        metrics_map = get_distance_metrics(vectordb_type=VectorDBEnums.LANCEDB.value)
+        
+        if distance_metric and distance_metric in metrics_map:
+            self.distance_metric = metrics_map[distance_metric]
+        elif distance_metric:
+            raise ValueError(f"Invalid distance metric for LanceDB: {distance_metric}")
+        else:
+            self.distance_metric = metrics_map[DistanceMetricEnums.COSINE.value]
+        
+        text_search_language = get_text_search_language(language)
+        self.stem_text = text_search_language != TextSearchLanguageEnums._DEFAULT.value
+        self.text_search_language = (
+            text_search_language.capitalize() if self.stem_text else TextSearchLanguageEnums.EN.value.capitalize()
+        )
+        
+        self.client = None
+        self._tables = {}
+        self._bulk_load_collections = set()
+        
+        self.logger = logging.getLogger('uvicorn')
+    
+    async def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+        self.client = await lancedb.connect_async(self.db_path, read_consistency_interval=READ_CONSISTENCY_INTERVAL)
+    
+    async def disconnect(self):
+        for collection_name in list(self._bulk_load_collections):
+            await self.finish_bulk_load(collection_name=collection_name)
+        
+        for table in self._tables.values():
+            table.close()
+        
+        self._tables = {}
+        self.client = None
+    
+    async def get_table(self, collection_name: str):
+        if collection_name not in self._tables:
+            self._tables[collection_name] = await self.client.open_table(collection_name)
+        return self._tables[collection_name]
+    
+    def _schema(self, embedding_size: int) -> pa.Schema:
+        return pa.schema([
+            (LanceDBTableSchemaEnums.CHUNK_ID.value, pa.int64()),
+            (LanceDBTableSchemaEnums.TEXT.value, pa.string()),
+            (LanceDBTableSchemaEnums.METADATA.value, pa.string()),
+            (LanceDBTableSchemaEnums.METADATA_PAIRS.value, pa.string()),
+            (LanceDBTableSchemaEnums.VECTOR.value, pa.list_(pa.float32(), embedding_size)),
+        ])
+    
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return collection_name in await self.list_collections()
+    
+    async def list_collections(self) -> List:
+        return list(await self.client.table_names())
+    
+    async def _list_index_columns(self, table) -> dict:
+        """indexed column -> index name"""
+        return {
+            index.columns[0]: index.name
+            for index in await table.list_indices()
+        }
+    
+    async def get_collection_info(self, collection_name: str, exact: bool=False) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return None
+        
+        table = await self.get_table(collection_name)
+        schema = await table.schema()
+        indexes = await self._list_index_columns(table)
+        
+        vector_index = indexes.get(LanceDBTableSchemaEnums.VECTOR.value)
+        index_stats = await table.index_stats(vector_index) if vector_index else None
+        
+        # count_rows reads the row counts kept in the table manifest
+        return {
+            "embedding_size": schema.field(LanceDBTableSchemaEnums.VECTOR.value).type.list_size,
+            "distance_metric": self.distance_metric,
+            "record_count": await table.count_rows(),
+            "version": await table.version(),
+            "indexes": sorted(indexes.values()),
+            "unindexed_vectors": index_stats.num_unindexed_rows if index_stats else None,
+            "is_bulk_loading": collection_name in self._bulk_load_collections
+        }
+    
+    async def count_records(self, collection_name: str, exact: bool=False) -> int:
+        table = await self.get_table(collection_name)
+        return await table.count_rows()
+    
+    async def delete_collection(self, collection_name: str):
+        self.logger.info(f"Deleting collection: {collection_name}")
+        self._bulk_load_collections.discard(collection_name)
+        
+        table = self._tables.pop(collection_name, None)
+        if table:
+            table.close()
+        
+        if await self.is_collection_existed(collection_name):
+            await self.client.drop_table(collection_name)
+        return True
+    
+    async def create_collection(self, 
+                          collection_name: str, 
+                          embedding_size: int, 
+                          do_reset: bool=False):
+        if do_reset:
+            await self.delete_collection(collection_name=collection_name)
+        
+        if await self.is_collection_existed(collection_name):
+            return False
+        
+        if embedding_size % self.pq_sub_vectors != 0:
+            raise ValueError(f"Embedding size {embedding_size} is not divisible by the PQ sub-vectors: {self.pq_sub_vectors}")
+        
+        self.logger.info(f"Creating LanceDB Collection: {collection_name}.")
+        self._tables[collection_name] = await self.client.create_table(
+            collection_name,
+            schema=self._schema(embedding_size)
+        )
+        
+        return True
+    
+    async def insert_one(self, 
+                   collection_name: str, 
+                   text: str, 
+                   vector: list, 
+                   metadata: dict=None, 
+                   record_id: str=None):
+        
+        return await self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadatas=[metadata],
+            record_ids=[record_id] if record_id else None
+        )
+    
+    async def insert_many(self, 
+                    collection_name: str, 
+                    texts: list, 
+                    vectors: list, 
+                    metadatas: list=None, 
+                    record_ids: list=None, 
+                    batch_size: int=50):
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot insert into Collection: {collection_name} does not exist.")
+            return False
+        
+        if len(texts) != len(vectors) or (record_ids and len(record_ids) != len(vectors)):
+            self.logger.error(f"Invalid data items for collection: {collection_name}.")
+            return False
+        
+        if not vectors:
+            return True
+        
+        if not metadatas:
+            metadatas = [None] * len(texts)
+        if not record_ids:
+            record_ids = [None] * len(texts)
+        
+        table = await self.get_table(collection_name)
+        schema = await table.schema()
+        embedding_size = schema.field(LanceDBTableSchemaEnums.VECTOR.value).type.list_size
+        
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape[1] != embedding_size:
+            self.logger.error(f"Vector size {vectors.shape[1]} does not match collection: {collection_name}.")
+            return False
+        
+        # every add writes a new fragment, so the whole list is appended at once
+        await table.add(pa.table({
+            LanceDBTableSchemaEnums.CHUNK_ID.value: pa.array(record_ids, type=pa.int64()),
+            LanceDBTableSchemaEnums.TEXT.value: pa.array(texts, type=pa.string()),
+            LanceDBTableSchemaEnums.METADATA.value: pa.array(
+                [json.dumps(metadata, ensure_ascii=False) if metadata else None for metadata in metadatas],
+                type=pa.string()
+            ),
+            LanceDBTableSchemaEnums.METADATA_PAIRS.value: pa.array(
+                [self._metadata_pairs(metadata) for metadata in metadatas],
+                type=pa.string()
+            ),
+            LanceDBTableSchemaEnums.VECTOR.value: pa.FixedSizeListArray.from_arrays(
+                pa.array(vectors.ravel(), type=pa.float32()), embedding_size
+            ),
+        }, schema=schema))
+        
+        if collection_name not in self._bulk_load_collections:
+            await self.update_indexes(collection_name=collection_name)
+        
+        return True
+    
+    async def delete_records(self, collection_name: str, record_ids: List[int]) -> int:
+        """
+        Returns:
+            Number of deleted records
+        """
+        if not await self.is_collection_existed(collection_name) or not record_ids:
+            return 0
+        
+        table = await self.get_table(collection_name)
+        chunk_ids = ", ".join(str(int(record_id)) for record_id in record_ids)
+        where = f"{LanceDBTableSchemaEnums.CHUNK_ID.value} IN ({chunk_ids})"
+        
+        deleted_count = await table.count_rows(where)
+        if deleted_count:
+            await table.delete(where)
+        return deleted_count
+    
+    async def update_indexes(self, collection_name: str, progress_callback=None, optimize: bool=False):
+        """
+        Create the text index and, past ivf_pq_threshold rows, the vector index;
+        once they exist, fold new rows into them when enough have piled up.
+        """
+        table = await self.get_table(collection_name)
+        indexes = await self._list_index_columns(table)
+        
+        def report(phase: str):
+            self.logger.info(f"LanceDB Collection: {collection_name}: {phase}")
+            if progress_callback:
+                progress_callback([{"table_name": collection_name, "phase": phase}])
+        
+        if LanceDBTableSchemaEnums.TEXT.value not in indexes:
+            report("building text index")
+            await table.create_index(
+                LanceDBTableSchemaEnums.TEXT.value,
+                config=FTS(language=self.text_search_language, stem=self.stem_text)
+            )
+        
+        vector_index = indexes.get(LanceDBTableSchemaEnums.VECTOR.value)
+        if vector_index is None:
+            record_count = await table.count_rows()
+            if record_count < self.ivf_pq_threshold:
+                return False
+            
+            report(f"building IVF-PQ vector index over {record_count} vectors")
+            await table.create_index(
+                LanceDBTableSchemaEnums.VECTOR.value,
+                config=IvfPq(
+                    distance_type=self.distance_metric,
+                    num_partitions=self.ivf_partitions,
+                    num_sub_vectors=self.pq_sub_vectors
+                )
+            )
+            return True
+        
+        if not optimize:
+            index_stats = await table.index_stats(vector_index)
+            optimize = index_stats is not None and index_stats.num_unindexed_rows >= OPTIMIZE_UNINDEXED_ROWS
+        
+        if optimize:
+            report("optimizing indexes")
+            await table.optimize()
+        
+        return True
+    
+    def _metadata_pair(self, key: str, value) -> str:
+        return json.dumps({key: value}, ensure_ascii=False, sort_keys=True)[1:-1]
+    
+    def _metadata_pairs(self, metadata: dict) -> Optional[str]:
+        if not metadata:
+            return None
+        
+        pairs = METADATA_PAIR_SEPARATOR.join(self._metadata_pair(key, value) for key, value in metadata.items())
+        return f"{METADATA_PAIR_SEPARATOR}{pairs}{METADATA_PAIR_SEPARATOR}"
+    
+    def _metadata_filter(self, filters: dict) -> Optional[str]:
+        """Prefilter matching every filter pair against the delimited top-level metadata pairs."""
+        if not filters:
+            return None
+        
+        conditions = []
+        for key, value in filters.items():
+            pair = self._metadata_pair(key, value)
+            pair = pair.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("'", "''")
+            conditions.append(
+                f"{LanceDBTableSchemaEnums.METADATA_PAIRS.value} "
+                f"LIKE '%{METADATA_PAIR_SEPARATOR}{pair}{METADATA_PAIR_SEPARATOR}%' ESCAPE '\\'"
+            )
+        
+        return " AND ".join(conditions)
+    
+    def _to_score(self, distance: float) -> float:
+        # lance reports cosine and dot as distances (1 - similarity) and l2 squared
+        if self.distance_metric == LanceDBDistanceMetricEnums.EUCLIDEAN.value:
+            return float(np.sqrt(max(0.0, distance)))
+        return 1.0 - distance
+    
+    def _vector_query(self, table, query_vector: list, top_k: int, filters: dict=None):
+        query = (
+            table.query()
+            .nearest_to(query_vector)
+            .distance_type(self.distance_metric)
+            .nprobes(self.nprobes)
+            .refine_factor(self.refine_factor)
+            .limit(top_k)
+        )
+        
+        metadata_filter = self._metadata_filter(filters)
+        if metadata_filter:
+            query = query.where(metadata_filter)
+        
+        return query
+    
+    def _to_documents(self, results: pa.Table) -> List[RetrievedDocument]:
+        texts = results.column(LanceDBTableSchemaEnums.TEXT.value).to_pylist()
+        metadatas = results.column(LanceDBTableSchemaEnums.METADATA.value).to_pylist()
+        chunk_ids = results.column(LanceDBTableSchemaEnums.CHUNK_ID.value).to_pylist()
+        distances = results.column(LanceDBTableSchemaEnums.DISTANCE.value).to_numpy()
+        # the vector column is only selected when the caller asked for vectors
+        vectors = (
+            results.column(LanceDBTableSchemaEnums.VECTOR.value).to_pylist()
+            if LanceDBTableSchemaEnums.VECTOR.value in results.column_names else [None] * results.num_rows
+        )
+        
+        return [
+            RetrievedDocument(
+                text=text,
+                score=self._to_score(float(distance)),
+                metadata=json.loads(metadata) if metadata else None,
+                record_id=chunk_id,
+                vector=vector
+            ) for text, metadata, chunk_id, distance, vector in zip(texts, metadatas, chunk_ids, distances, vectors)
+        ]
+    
+    async def search_by_vector(self, 
+                         collection_name: str, 
+                         query_vector: list, 
+                         top_k: int=5, 
+                         filters: dict=None, 
+                         with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        table = await self.get_table(collection_name)
+        results = await (
+            self._vector_query(table, query_vector, top_k, filters=filters)
+            .select([
+                LanceDBTableSchemaEnums.TEXT.value,
+                LanceDBTableSchemaEnums.METADATA.value,
+                LanceDBTableSchemaEnums.CHUNK_ID.value,
+                # score columns are selected explicitly, lance stops adding them on its own
+                LanceDBTableSchemaEnums.DISTANCE.value,
+            ] + ([LanceDBTableSchemaEnums.VECTOR.value] if with_vectors else []))
+            .to_arrow()
+        )
+        results = self._to_documents(results)
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return results
+    
+    async def search_many(self, 
+                          collection_name: str, 
+                          query_vectors: List[list], 
+                          top_k: int=5, 
+                          filters: dict=None) -> List[List[RetrievedDocument]]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        if not query_vectors:
+            return []
+        
+        table = await self.get_table(collection_name)
+        # several query vectors share one scan, rows are tagged with the index of their query
+        results = await (
+            self._vector_query(table, query_vectors, top_k, filters=filters)
+            .select([
+                LanceDBTableSchemaEnums.TEXT.value,
+                LanceDBTableSchemaEnums.METADATA.value,
+                LanceDBTableSchemaEnums.CHUNK_ID.value,
+                LanceDBTableSchemaEnums.DISTANCE.value,
+            ])
+            .to_arrow()
+        )
+        
+        grouped_results = [[] for _ in query_vectors]
+        query_indexes = results.column("query_index").to_pylist() if len(query_vectors) > 1 else [0] * results.num_rows
+        for query_index, document in zip(
+            query_indexes, self._to_documents(results)
+        ):
+            grouped_results[query_index].append(document)
+        
+        return grouped_results
+    
+    async def search_hybrid(self, 
+                            collection_name: str, 
+                            query_vector: list, 
+                            query_text: str, 
+                            top_k: int=5, 
+                            filters: dict=None, 
+                            with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        table = await self.get_table(collection_name)
+        if LanceDBTableSchemaEnums.TEXT.value not in await self._list_index_columns(table):
+            self.logger.warning(f"Collection: {collection_name} has no text index; falling back to dense search.")
+            return await self.search_by_vector(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                top_k=top_k,
+                filters=filters,
+                with_vectors=with_vectors
+            )
+        
+        # each candidate list selects its own score column, then both are fused with RRF
+        prefetch = max(self.hybrid_prefetch, top_k)
+        columns = [
+            LanceDBTableSchemaEnums.TEXT.value,
+            LanceDBTableSchemaEnums.METADATA.value,
+            LanceDBTableSchemaEnums.CHUNK_ID.value,
+        ] + ([LanceDBTableSchemaEnums.VECTOR.value] if with_vectors else [])
+        dense_results = await (
+            self._vector_query(table, query_vector, prefetch, filters=filters)
+            .select(columns + [LanceDBTableSchemaEnums.DISTANCE.value])
+            .with_row_id()
+            .to_arrow()
+        )
+        lexical_query = (
+            table.query()
+            .nearest_to_text(query_text, columns=[LanceDBTableSchemaEnums.TEXT.value])
+            .limit(prefetch)
+        )
+        metadata_filter = self._metadata_filter(filters)
+        if metadata_filter:
+            lexical_query = lexical_query.where(metadata_filter)
+        lexical_results = await (
+            lexical_query
+            .select(columns + [LanceDBTableSchemaEnums.SCORE.value])
+            .with_row_id()
+            .to_arrow()
+        )
+        
+        rows = {}
+        ranked_lists = []
+        for candidates in (dense_results, lexical_results):
+            row_ids = candidates.column(LanceDBTableSchemaEnums.ROW_ID.value).to_pylist()
+            rows.update(zip(row_ids, candidates.select(columns).to_pylist()))
+            ranked_lists.append(row_ids)
+        
+        fused = reciprocal_rank_fusion(ranked_lists, rrf_k=self.rrf_k, top_k=top_k)
+        results = [
+            RetrievedDocument(
+                text=rows[row_id][LanceDBTableSchemaEnums.TEXT.value],
+                score=score,
+                metadata=(
+                    json.loads(rows[row_id][LanceDBTableSchemaEnums.METADATA.value])
+                    if rows[row_id][LanceDBTableSchemaEnums.METADATA.value] else None
+                ),
+                record_id=rows[row_id][LanceDBTableSchemaEnums.CHUNK_ID.value],
+                vector=rows[row_id].get(LanceDBTableSchemaEnums.VECTOR.value)
+            ) for row_id, score in fused
+        ]
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return results
+    
+    async def scroll(self, 
+                     collection_name: str, 
+                     batch_size: int=1000, 
+                     offset: Optional[int]=None) -> Tuple[List[VectorRecord], Optional[int]]:
+        """Page through the table in storage order; the offset is a row position."""
+        if not await self.is_collection_existed(collection_name):
+            return [], None
+        
+        table = await self.get_table(collection_name)
+        # one row past the page tells whether another page follows
+        results = await (
+            table.query()
+            .select([
+                LanceDBTableSchemaEnums.TEXT.value,
+                LanceDBTableSchemaEnums.METADATA.value,
+                LanceDBTableSchemaEnums.CHUNK_ID.value,
+                LanceDBTableSchemaEnums.VECTOR.value,
+            ])
+            .offset(offset or 0)
+            .limit(batch_size + 1)
+            .to_arrow()
+        )
+        if results.num_rows == 0:
+            return [], None
+        
+        has_next_page = results.num_rows > batch_size
+        results = results.slice(0, batch_size)
+        
+        # the fixed size list column is a view over one contiguous float32 buffer
+        vectors = results.column(LanceDBTableSchemaEnums.VECTOR.value).combine_chunks()
+        vectors = vectors.flatten().to_numpy().reshape(len(vectors), -1)
+        
+        records = [
+            VectorRecord(
+                text=text,
+                vector=vector.tolist(),
+                metadata=json.loads(metadata) if metadata else None,
+                record_id=chunk_id
+            ) for text, vector, metadata, chunk_id in zip(
+                results.column(LanceDBTableSchemaEnums.TEXT.value).to_pylist(),
+                vectors,
+                results.column(LanceDBTableSchemaEnums.METADATA.value).to_pylist(),
+                results.column(LanceDBTableSchemaEnums.CHUNK_ID.value).to_pylist()
+            )
+        ]
+        
+        next_offset = (offset or 0) + len(records) if has_next_page else None
+        return records, next_offset
+    
+    async def start_bulk_load(self, collection_name: str):
+        """Skip index maintenance on every insert until finish_bulk_load."""
+        if not await self.is_collection_existed(collection_name):
+            return False
+        
+        self._bulk_load_collections.add(collection_name)
+        return True
+    
+    async def finish_bulk_load(self, collection_name: str, progress_callback=None):
+        if collection_name not in self._bulk_load_collections:
+            return False
+        
+        self._bulk_load_collections.discard(collection_name)
+        # one optimize also compacts the small fragments written by the load
+        return await self.update_indexes(
+            collection_name=collection_name,
+            progress_callback=progress_callback,
+            optimize=True
+        )
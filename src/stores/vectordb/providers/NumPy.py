@@ -0,0 +1,493 @@
+import json
+import logging
+import os
+import shutil
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMetricEnums, VectorDBEnums
+from ..RecordStore import RecordStore
+from ..utils import get_distance_metrics, reciprocal_rank_fusion, prepare_vectors, exact_top_k
+from models.db_schemas import RetrievedDocument, VectorRecord
+
+INITIAL_CAPACITY = 1024
+# rewrite the matrix once this share of its rows are deleted
+COMPACTION_RATIO = 0.2
+# marks deleted (and not yet used) rows of the ids array
+EMPTY_ID = -1
+
+class NumPy(VectorDBInterface):
+    """
+    Exact brute-force search over one contiguous float32 matrix per collection.
+    
+    Vectors live in a memory-mapped .npy file whose capacity doubles as it fills;
+    texts and metadata live in a RecordStore side table.
+    """
+    def __init__(self, 
+                 db_path: str, 
+                 distance_metric: str=None, 
+                 default_vector_size: int=786, 
+                 language: str=None, 
+                 hybrid_prefetch: int=50, 
+                 rrf_k: int=60, 
+                 *args, **kwargs):
+        
+        self.db_path = os.path.join(db_path, "numpy")
+        self.default_vector_size = default_vector_size
+        self.language = language
+        self.hybrid_prefetch = hybrid_prefetch
+        self.rrf_k = rrf_k
+        
+        metrics_map = get_distance_metrics(vectordb_type=VectorDBEnums.NUMPY.value)
+        
+        if distance_metric and distance_metric in metrics_map:
+            self.distance_metric = metrics_map[distance_metric]
+        elif distance_metric:
+            raise ValueError(f"Invalid distance metric for NumPy: {distance_metric}")
+        else:
+            self.distance_metric = metrics_map[DistanceMetricEnums.COSINE.value]
+        
+        # collection_name -> {"mtime", "config", "vectors", "ids"}
+        self._collections = {}
+        self._record_stores = {}
+        
+        self.logger = logging.getLogger('uvicorn')
+    
+    async def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+    
+    async def disconnect(self):
+        for record_store in self._record_stores.values():
+            record_store.close()
+        
+        self._record_stores = {}
+        self._collections = {}
+    
+    def _collection_dir(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+    
+    def _file_path(self, collection_name: str, file_name: str) -> str:
+        return os.path.join(self._collection_dir(collection_name), file_name)
+    
+    def get_record_store(self, collection_name: str) -> RecordStore:
+        if collection_name not in self._record_stores:
+            self._record_stores[collection_name] = RecordStore(
+                db_path=self._file_path(collection_name, "records.sqlite"),
+                language=self.language
+            )
+        return self._record_stores[collection_name]
+    
+    def _write_config(self, collection_name: str, config: dict) -> int:
+        # the config holds the number of used rows, so it is replaced atomically after the arrays
+        config_path = self._file_path(collection_name, "collection.json")
+        tmp_path = f"{config_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(config, f)
+        os.replace(tmp_path, config_path)
+        return os.stat(config_path).st_mtime_ns
+    
+    def _load(self, collection_name: str) -> dict:
+        """Memory-map the collection arrays, reloading them when another process changed the collection."""
+        config_path = self._file_path(collection_name, "collection.json")
+        mtime = os.stat(config_path).st_mtime_ns
+        
+        state = self._collections.get(collection_name)
+        if state and state["mtime"] == mtime:
+            return state
+        
+        with open(config_path, "r") as f:
+            config = json.load(f)
+        
+        state = {
+            "mtime": mtime,
+            "config": config,
+            "vectors": np.load(self._file_path(collection_name, "vectors.npy"), mmap_mode="r+"),
+            "ids": np.load(self._file_path(collection_name, "ids.npy"), mmap_mode="r+")
+        }
+        self._collections[collection_name] = state
+        return state
+    
+    def _write_arrays(self, collection_name: str, vectors: np.ndarray, ids: np.ndarray, capacity: int):
+        """Write the used rows into fresh files of the given capacity and swap them in."""
+        vectors_path = self._file_path(collection_name, "vectors.npy")
+        ids_path = self._file_path(collection_name, "ids.npy")
+        
+        new_vectors = np.lib.format.open_memmap(
+            f"{vectors_path}.tmp", mode="w+", dtype=np.float32, shape=(capacity, vectors.shape[1]))
+        new_vectors[:len(vectors)] = vectors
+        new_vectors.flush()
+        
+        new_ids = np.lib.format.open_memmap(f"{ids_path}.tmp", mode="w+", dtype=np.int64, shape=(capacity,))
+        new_ids[:] = EMPTY_ID
+        new_ids[:len(ids)] = ids
+        new_ids.flush()
+        
+        del new_vectors, new_ids
+        os.replace(f"{vectors_path}.tmp", vectors_path)
+        os.replace(f"{ids_path}.tmp", ids_path)
+    
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(self._file_path(collection_name, "collection.json"))
+    
+    async def list_collections(self) -> List:
+        if not os.path.isdir(self.db_path):
+            return []
+        
+        return sorted(
+            collection_name for collection_name in os.listdir(self.db_path)
+            if os.path.exists(self._file_path(collection_name, "collection.json"))
+        )
+    
+    async def get_collection_info(self, collection_name: str, exact: bool=False) -> dict:
+        if not await self.is_collection_existed(collection_name):
+            return None
+        
+        config = self._load(collection_name)["config"]
+        return {
+            **config,
+            "record_count": config["size"] - config["deleted"],
+            "vectors_size_bytes": os.path.getsize(self._file_path(collection_name, "vectors.npy"))
+        }
+    
+    async def count_records(self, collection_name: str, exact: bool=False) -> int:
+        config = self._load(collection_name)["config"]
+        return config["size"] - config["deleted"]
+    
+    async def delete_collection(self, collection_name: str):
+        self.logger.info(f"Deleting collection: {collection_name}")
+        self._collections.pop(collection_name, None)
+        
+        record_store = self._record_stores.pop(collection_name, None)
+        if record_store:
+            record_store.close()
+        
+        shutil.rmtree(self._collection_dir(collection_name), ignore_errors=True)
+        return True
+    
+    async def create_collection(self, 
+                          collection_name: str, 
+                          embedding_size: int, 
+                          do_reset: bool=False):
+        if do_reset:
+            await self.delete_collection(collection_name=collection_name)
+        
+        if await self.is_collection_existed(collection_name):
+            return False
+        
+        self.logger.info(f"Creating NumPy Collection: {collection_name}.")
+        os.makedirs(self._collection_dir(collection_name), exist_ok=True)
+        
+        self._write_arrays(
+            collection_name,
+            vectors=np.empty((0, embedding_size), dtype=np.float32),
+            ids=np.empty((0,), dtype=np.int64),
+            capacity=INITIAL_CAPACITY
+        )
+        self.get_record_store(collection_name)
+        self._write_config(collection_name, {
+            "embedding_size": embedding_size,
+            "distance_metric": self.distance_metric,
+            "capacity": INITIAL_CAPACITY,
+            "size": 0,
+            "deleted": 0
+        })
+        
+        return True
+    
+    async def insert_one(self, 
+                   collection_name: str, 
+                   text: str, 
+                   vector: list, 
+                   metadata: dict=None, 
+                   record_id: str=None):
+        
+        return await self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadatas=[metadata],
+            record_ids=[record_id] if record_id else None
+        )
+    
+    async def insert_many(self, 
+                    collection_name: str, 
+                    texts: list, 
+                    vectors: list, 
+                    metadatas: list=None, 
+                    record_ids: list=None, 
+                    batch_size: int=50):
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot insert into Collection: {collection_name} does not exist.")
+            return False
+        
+        if len(texts) != len(vectors) or (record_ids and len(record_ids) != len(vectors)):
+            self.logger.error(f"Invalid data items for collection: {collection_name}.")
+            return False
+        
+        if not vectors:
+            return True
+        
+        state = self._load(collection_name)
+        config = state["config"]
+        
+        vectors = prepare_vectors(vectors, self.distance_metric)
+        if vectors.shape[1] != config["embedding_size"]:
+            self.logger.error(f"Vector size {vectors.shape[1]} does not match collection: {collection_name}.")
+            return False
+        
+        ids = self.get_record_store(collection_name).insert_many(
+            texts=texts,
+            metadatas=metadatas,
+            record_ids=record_ids
+        )
+        
+        size = config["size"]
+        new_size = size + len(ids)
+        
+        if new_size > config["capacity"]:
+            # doubling keeps appends amortized O(1)
+            config["capacity"] = max(config["capacity"] * 2, new_size)
+            self._write_arrays(collection_name, state["vectors"][:size], state["ids"][:size], config["capacity"])
+            state["vectors"] = np.load(self._file_path(collection_name, "vectors.npy"), mmap_mode="r+")
+            state["ids"] = np.load(self._file_path(collection_name, "ids.npy"), mmap_mode="r+")
+        
+        state["vectors"][size:new_size] = vectors
+        state["ids"][size:new_size] = ids
+        state["vectors"].flush()
+        state["ids"].flush()
+        
+        config["size"] = new_size
+        state["mtime"] = self._write_config(collection_name, config)
+        
+        return True
+    
+    async def delete_records(self, collection_name: str, record_ids: List[int]) -> int:
+        """
+        Tombstone the records of the given chunk ids; the matrix is compacted
+        once more than COMPACTION_RATIO of its rows are deleted.
+        
+        Returns:
+            Number of deleted records
+        """
+        if not await self.is_collection_existed(collection_name):
+            return 0
+        
+        deleted_ids = self.get_record_store(collection_name).delete_by_chunk_ids(record_ids)
+        if not deleted_ids:
+            return 0
+        
+        state = self._load(collection_name)
+        config = state["config"]
+        size = config["size"]
+        
+        used_ids = state["ids"][:size]
+        deleted_mask = np.isin(used_ids, deleted_ids)
+        used_ids[deleted_mask] = EMPTY_ID
+        state["ids"].flush()
+        config["deleted"] += int(deleted_mask.sum())
+        
+        if config["deleted"] > COMPACTION_RATIO * size:
+            self.logger.info(f"Compacting collection: {collection_name}")
+            live_mask = state["ids"][:size] != EMPTY_ID
+            self._write_arrays(
+                collection_name,
+                vectors=state["vectors"][:size][live_mask],
+                ids=state["ids"][:size][live_mask],
+                capacity=config["capacity"]
+            )
+            config["size"] = int(live_mask.sum())
+            config["deleted"] = 0
+            self._collections.pop(collection_name, None)
+        
+        self._write_config(collection_name, config)
+        return int(deleted_mask.sum())
+    
+    def _top_k(self, collection_name: str, state: dict, queries: np.ndarray, top_k: int, filters: dict=None):
+        size = state["config"]["size"]
+        used_ids = state["ids"][:size]
+        
+        excluded = used_ids == EMPTY_ID
+        if filters:
+            # filtered rows are excluded before ranking, so the top-k stays exact
+            allowed_ids = self.get_record_store(collection_name).filter_ids(filters)
+            excluded |= ~np.isin(used_ids, allowed_ids)
+        
+        return exact_top_k(
+            vectors=state["vectors"][:size],
+            queries=queries,
+            top_k=top_k,
+            distance_metric=self.distance_metric,
+            excluded=excluded
+        )
+    
+    def _to_documents(self, 
+                      collection_name: str, 
+                      state: dict, 
+                      positions, 
+                      scores, 
+                      with_vectors: bool=False) -> List[RetrievedDocument]:
+        hits = [
+            (int(state["ids"][position]), int(position), float(score))
+            for position, score in zip(positions, scores) if np.isfinite(score)
+        ]
+        records = self.get_record_store(collection_name).get_many([record_id for record_id, _, _ in hits])
+        
+        return [
+            RetrievedDocument(
+                text=records[record_id]["text"],
+                score=score,
+                metadata=records[record_id]["metadata"],
+                record_id=records[record_id]["chunk_id"],
+                vector=state["vectors"][position].tolist() if with_vectors else None
+            ) for record_id, position, score in hits if record_id in records
+        ]
+    
+    def _vectors_by_id(self, state: dict, record_ids: List[int]) -> dict:
+        used_ids = state["ids"][:state["config"]["size"]]
+        positions = np.flatnonzero(np.isin(used_ids, record_ids))
+        return {int(used_ids[position]): state["vectors"][position].tolist() for position in positions}
+    
+    async def search_by_vector(self, 
+                         collection_name: str, 
+                         query_vector: list, 
+                         top_k: int=5, 
+                         filters: dict=None, 
+                         with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        results = await self._search_many(
+            collection_name, [query_vector], top_k, filters=filters, with_vectors=with_vectors)
+        
+        if not results or len(results[0]) == 0:
+            return None
+        
+        return results[0]
+    
+    async def search_many(self, 
+                          collection_name: str, 
+                          query_vectors: List[list], 
+                          top_k: int=5, 
+                          filters: dict=None) -> List[List[RetrievedDocument]]:
+        return await self._search_many(collection_name, query_vectors, top_k, filters=filters)
+    
+    async def _search_many(self, 
+                           collection_name: str, 
+                           query_vectors: List[list], 
+                           top_k: int, 
+                           filters: dict=None, 
+                           with_vectors: bool=False) -> List[List[RetrievedDocument]]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        if not query_vectors:
+            return []
+        
+        state = self._load(collection_name)
+        if state["config"]["size"] == 0:
+            return [[] for _ in query_vectors]
+        
+        positions, scores = self._top_k(
+            collection_name, state, prepare_vectors(query_vectors, self.distance_metric), top_k, filters=filters)
+        return [
+            self._to_documents(collection_name, state, query_positions, query_scores, with_vectors=with_vectors)
+            for query_positions, query_scores in zip(positions, scores)
+        ]
+    
+    async def search_hybrid(self, 
+                            collection_name: str, 
+                            query_vector: list, 
+                            query_text: str, 
+                            top_k: int=5, 
+                            filters: dict=None, 
+                            with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        record_store = self.get_record_store(collection_name)
+        if not record_store.has_text_search:
+            self.logger.warning(f"Collection: {collection_name} has no text search; falling back to dense search.")
+            return await self.search_by_vector(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                top_k=top_k,
+                filters=filters,
+                with_vectors=with_vectors
+            )
+        
+        state = self._load(collection_name)
+        if state["config"]["size"] == 0:
+            return None
+        
+        prefetch = max(self.hybrid_prefetch, top_k)
+        positions, scores = self._top_k(
+            collection_name, state, prepare_vectors([query_vector], self.distance_metric), prefetch, filters=filters)
+        dense_ids = [
+            int(state["ids"][position])
+            for position, score in zip(positions[0], scores[0]) if np.isfinite(score)
+        ]
+        lexical_ids = record_store.search_text(query_text, limit=prefetch, filters=filters)
+        
+        fused = reciprocal_rank_fusion([dense_ids, lexical_ids], rrf_k=self.rrf_k, top_k=top_k)
+        records = record_store.get_many([record_id for record_id, _ in fused])
+        vectors = self._vectors_by_id(state, [record_id for record_id, _ in fused]) if with_vectors else {}
+        
+        results = [
+            RetrievedDocument(
+                text=records[record_id]["text"],
+                score=score,
+                metadata=records[record_id]["metadata"],
+                record_id=records[record_id]["chunk_id"],
+                vector=vectors.get(record_id)
+            ) for record_id, score in fused if record_id in records
+        ]
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return results
+    
+    async def scroll(self, 
+                     collection_name: str, 
+                     batch_size: int=1000, 
+                     offset: Optional[int]=None) -> Tuple[List[VectorRecord], Optional[int]]:
+        """
+        Page through the stored records in matrix order; the offset is a row position.
+        Vectors come back as stored, i.e. L2-normalized for the cosine metric.
+        """
+        if not await self.is_collection_existed(collection_name):
+            return [], None
+        
+        state = self._load(collection_name)
+        size = state["config"]["size"]
+        start = offset or 0
+        end = min(start + batch_size, size)
+        
+        positions = [position for position in range(start, end) if state["ids"][position] != EMPTY_ID]
+        records = self.get_record_store(collection_name).get_many([state["ids"][position] for position in positions])
+        
+        vector_records = []
+        for position in positions:
+            record = records.get(int(state["ids"][position]))
+            if record is None:
+                continue
+            vector_records.append(VectorRecord(
+                text=record["text"],
+                vector=state["vectors"][position].tolist(),
+                metadata=record["metadata"],
+                record_id=record["chunk_id"]
+            ))
+        
+        return vector_records, (end if end < size else None)
+    
+    async def start_bulk_load(self, collection_name: str):
+        # appends already go straight into the memory-mapped matrix, there is no index to defer
+        return False
+    
+    async def finish_bulk_load(self, collection_name: str, progress_callback=None):
+        return False
@@ -1,5 +1,7 @@
+import asyncio
 import logging
-from typing import List
+import re
+from typing import List, Optional, Tuple
 import json
 from sqlalchemy.sql import text as sql_text
 
@@ -8,10 +10,18 @@ from ..VectorDBEnums import (
     DistanceMetricEnums,
     VectorDBEnums,
     PgVectorTableSchemaEnums,
-    PgVectorIndexTypeEnums
+    PgVectorIndexTypeEnums,
+    PgVectorTableLayoutEnums,
+    PgVectorStatsTableEnums
 )
-from ..utils import get_distance_metrics
-from models.db_schemas import RetrievedDocument
+from ..utils import get_distance_metrics, get_text_search_language
+from models.db_schemas import RetrievedDocument, VectorRecord
+
+# collection names are generated as collection_{embedding_size}_{project_id}
+COLLECTION_NAME_PATTERN = re.compile(r"^collection_(\d+)_(\w+)$")
+MEMORY_SETTING_PATTERN = re.compile(r"^\d+\s*(kB|MB|GB|TB)?$")
+# seconds between pg_stat_progress_create_index polls while an index is built
+INDEX_PROGRESS_INTERVAL = 5
 
 class PgVector(VectorDBInterface):
     def __init__(self, 
@@ -19,12 +29,40 @@ class PgVector(VectorDBInterface):
                  default_vector_size: int=786,
                  distance_metric: str=None, 
                  index_threshold: int=100,
+                 language: str=None,
+                 hybrid_prefetch: int=50,
+                 rrf_k: int=60,
+                 table_layout: str=PgVectorTableLayoutEnums.PER_PROJECT.value,
+                 partitions_count: int=16,
+                 maintenance_work_mem: str="512MB",
+                 max_parallel_maintenance_workers: int=2,
                  *args, **kwargs):
         
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         self.distance_metric = None
         self.index_threshold = index_threshold
+        self.text_search_config = get_text_search_language(language)
+        self.hybrid_prefetch = hybrid_prefetch
+        self.rrf_k = rrf_k
+        
+        if table_layout not in [layout.value for layout in PgVectorTableLayoutEnums]:
+            raise ValueError(f"Invalid table layout for PgVector: {table_layout}")
+        self.table_layout = table_layout
+        self.partitions_count = partitions_count
+        
+        if not MEMORY_SETTING_PATTERN.match(str(maintenance_work_mem).strip()):
+            raise ValueError(f"Invalid maintenance_work_mem for PgVector: {maintenance_work_mem}")
+        self.maintenance_work_mem = str(maintenance_work_mem).strip()
+        self.max_parallel_maintenance_workers = int(max_parallel_maintenance_workers)
+        
+        # collections being bulk loaded skip index maintenance until finish_bulk_load
+        self._bulk_load_collections = set()
+        # tables already known to carry a valid vector index
+        self._indexed_tables = set()
+        # collections already known to have a row in the stats table
+        self._stats_collections = set()
+        self.stats_table_name = PgVectorStatsTableEnums.TABLE_NAME.value
         
         # Get distance metrics mapping for PgVector
         metrics_map = get_distance_metrics(vectordb_type=VectorDBEnums.PGVECTOR.value)
@@ -40,26 +78,90 @@ class PgVector(VectorDBInterface):
         self.pgvector_table_prefix = PgVectorTableSchemaEnums._PREFIX.value
         self.logger = logging.getLogger('uvicorn')
         self.default_index_name = lambda collection_name: f"{collection_name}_vector_idx"
+        self.default_text_search_index_name = lambda collection_name: f"{collection_name}_text_search_idx"
+        self.default_shared_table_name = lambda embedding_size: f"{self.pgvector_table_prefix}_shared_{embedding_size}"
+    
+    @property
+    def is_partitioned(self) -> bool:
+        return self.table_layout == PgVectorTableLayoutEnums.PARTITIONED.value
+    
+    def resolve_collection(self, collection_name: str) -> Tuple[str, Optional[str]]:
+        """
+        Map a collection name to the physical table and the project it is scoped to.
+        
+        Returns:
+            (table_name, project_id); project_id is None in the per-project layout
+        """
+        if not self.is_partitioned:
+            return collection_name, None
+        
+        match = COLLECTION_NAME_PATTERN.match(collection_name)
+        if not match:
+            raise ValueError(f"Cannot resolve collection name for partitioned layout: {collection_name}")
+        
+        embedding_size, project_id = match.groups()
+        return self.default_shared_table_name(embedding_size=embedding_size), project_id
+    
+    def _project_filter(self, project_id: Optional[str], operator: str="WHERE") -> str:
+        if project_id is None:
+            return ""
+        return f"{operator} {PgVectorTableSchemaEnums.PROJECT_ID.value} = :project_id "
+    
+    def _metadata_filter(self, filters: Optional[dict], operator: str="WHERE") -> str:
+        if not filters:
+            return ""
+        # jsonb containment: every filter key must be present with an equal value
+        return f"{operator} {PgVectorTableSchemaEnums.METADATA.value} @> CAST(:filters AS jsonb) "
+    
+    def _vector_column(self, with_vectors: bool) -> str:
+        # pgvector text output is a JSON array, parsed back into the document vector
+        if not with_vectors:
+            return ""
+        return f"{PgVectorTableSchemaEnums.VECTOR.value}::text AS vector, "
+    
+    def _scoped_params(self, params: dict, project_id: Optional[str], filters: Optional[dict]=None) -> dict:
+        if project_id is not None:
+            params["project_id"] = project_id
+        if filters:
+            params["filters"] = json.dumps(filters, ensure_ascii=False)
+        return params
+    
+    async def _prepare_scoped_search(self, session, project_id: Optional[str], filters: Optional[dict]=None):
+        # keep scanning the HNSW graph until enough rows pass the project and metadata filters
+        if project_id is not None or filters:
+            await session.execute(sql_text("SET LOCAL hnsw.iterative_scan = strict_order;"))
     
     async def connect(self):
         async with self.db_client() as session:
             async with session.begin():
                 await session.execute(sql_text("CREATE EXTENSION IF NOT EXISTS vector;"))
+                await session.execute(sql_text(
+                    f"CREATE TABLE IF NOT EXISTS {self.stats_table_name} ("
+                        f"{PgVectorStatsTableEnums.COLLECTION_NAME.value} text PRIMARY KEY, "
+                        f"{PgVectorStatsTableEnums.VECTOR_TABLE.value} text NOT NULL, "
+                        f"{PgVectorStatsTableEnums.RECORD_COUNT.value} bigint NOT NULL DEFAULT 0, "
+                        f"{PgVectorStatsTableEnums.LAST_INDEXED_AT.value} timestamptz"
+                    ");"
+                ))
     
     async def disconnect(self):
         pass
     
-    async def is_collection_existed(self, collection_name: str) -> bool:
+    async def is_table_existed(self, table_name: str) -> bool:
         table_exists = None
         
         async with self.db_client() as session:
             async with session.begin():
                 list_table = sql_text(f"SELECT * FROM pg_tables WHERE tablename = :collection_name;")
-                results = await session.execute(list_table, {"collection_name": collection_name})
+                results = await session.execute(list_table, {"collection_name": table_name})
                 table_exists = results.scalar_one_or_none()
-                
+        
         return table_exists
     
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        table_name, _ = self.resolve_collection(collection_name)
+        return await self.is_table_existed(table_name=table_name)
+    
     async def list_collections(self) -> list:
         records = []
         
@@ -69,12 +171,13 @@ class PgVector(VectorDBInterface):
                     f"SELECT tablename FROM pg_tables WHERE tablename LIKE '{self.pgvector_table_prefix}%';")
                 results = await session.execute(list_tables)
                 records = results.scalars().all()
-                
+        
         return records
     
-    async def get_collection_info(self, collection_name: str) -> dict:
+    async def get_collection_info(self, collection_name: str, exact: bool=False) -> dict:
         table_data = None
-        count_info = None
+        details = None
+        table_name, _ = self.resolve_collection(collection_name)
         
         async with self.db_client() as session:
             async with session.begin():
@@ -83,15 +186,37 @@ class PgVector(VectorDBInterface):
                         FROM pg_tables
                         WHERE tablename = :collection_name;
                     ''')
-                count_sql = sql_text(f"SELECT COUNT(*) FROM {collection_name};")
-                
-                table_info = await session.execute(table_info_sql, {"collection_name": collection_name})
-                count_info = await session.execute(count_sql)
                 
+                table_info = await session.execute(table_info_sql, {"collection_name": table_name})
                 table_data = table_info.fetchone()
+                
+                if table_data:
+                    # the vector type modifier holds its dimensions; a partitioned index
+                    # stores its data in the partition indexes
+                    details_sql = sql_text(
+                        "SELECT "
+                        "(SELECT atttypmod FROM pg_attribute "
+                        "WHERE attrelid = to_regclass(:table_name) AND attname = :vector_column) AS vector_dims, "
+                        "(SELECT COALESCE(SUM(pg_relation_size(c.oid)), 0) FROM pg_class c "
+                        "WHERE c.relname = :index_name "
+                        "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:index_name))"
+                        ") AS index_size, "
+                        f"(SELECT {PgVectorStatsTableEnums.LAST_INDEXED_AT.value} FROM {self.stats_table_name} "
+                        f"WHERE {PgVectorStatsTableEnums.COLLECTION_NAME.value} = :collection_name) AS last_indexed_at;"
+                    )
+                    details = await session.execute(details_sql, {
+                        "table_name": table_name,
+                        "vector_column": PgVectorTableSchemaEnums.VECTOR.value,
+                        "index_name": self.default_index_name(collection_name=table_name),
+                        "collection_name": collection_name
+                    })
+                    details = details.fetchone()
         
         if not table_data:
             return None
+        
+        record_count, record_count_source = await self._count_records(collection_name=collection_name, exact=exact)
+        
         return {
             "table_info": {
                 "schemaname": table_data.schemaname,
@@ -100,15 +225,145 @@ class PgVector(VectorDBInterface):
                 "tablespace": table_data.tablespace,
                 "hasindexes": table_data.hasindexes
             },
-            "record_count": count_info.scalar_one()
+            "table_layout": self.table_layout,
+            "record_count": record_count,
+            "record_count_source": record_count_source,
+            "vector_dims": details.vector_dims,
+            "index_size_bytes": details.index_size,
+            "last_indexed_at": details.last_indexed_at.isoformat() if details.last_indexed_at else None
         }
     
+    def _refresh_stats_sql(self, table_name: str, project_id: Optional[str]):
+        return sql_text(
+            f"INSERT INTO {self.stats_table_name} ("
+                f"{PgVectorStatsTableEnums.COLLECTION_NAME.value}, "
+                f"{PgVectorStatsTableEnums.VECTOR_TABLE.value}, "
+                f"{PgVectorStatsTableEnums.RECORD_COUNT.value}) "
+            f"SELECT :collection_name, :table_name, COUNT(*) FROM {table_name} {self._project_filter(project_id)}"
+            f"ON CONFLICT ({PgVectorStatsTableEnums.COLLECTION_NAME.value}) DO UPDATE SET "
+            f"{PgVectorStatsTableEnums.VECTOR_TABLE.value} = EXCLUDED.{PgVectorStatsTableEnums.VECTOR_TABLE.value}, "
+            f"{PgVectorStatsTableEnums.RECORD_COUNT.value} = EXCLUDED.{PgVectorStatsTableEnums.RECORD_COUNT.value} "
+            f"RETURNING {PgVectorStatsTableEnums.RECORD_COUNT.value};"
+        )
+    
+    async def _refresh_stats(self, session, collection_name: str) -> int:
+        """Recount a collection with COUNT(*) and store the result in the stats table."""
+        table_name, project_id = self.resolve_collection(collection_name)
+        result = await session.execute(
+            self._refresh_stats_sql(table_name, project_id),
+            self._scoped_params({"collection_name": collection_name, "table_name": table_name}, project_id)
+        )
+        self._stats_collections.add(collection_name)
+        return result.scalar_one()
+    
+    async def _record_inserts(self, session, collection_name: str, inserted_count: int):
+        table_name, _ = self.resolve_collection(collection_name)
+        await session.execute(sql_text(
+            f"INSERT INTO {self.stats_table_name} AS stats ("
+                f"{PgVectorStatsTableEnums.COLLECTION_NAME.value}, "
+                f"{PgVectorStatsTableEnums.VECTOR_TABLE.value}, "
+                f"{PgVectorStatsTableEnums.RECORD_COUNT.value}, "
+                f"{PgVectorStatsTableEnums.LAST_INDEXED_AT.value}) "
+            "VALUES (:collection_name, :table_name, :inserted_count, now()) "
+            f"ON CONFLICT ({PgVectorStatsTableEnums.COLLECTION_NAME.value}) DO UPDATE SET "
+            f"{PgVectorStatsTableEnums.RECORD_COUNT.value} = "
+            f"stats.{PgVectorStatsTableEnums.RECORD_COUNT.value} + EXCLUDED.{PgVectorStatsTableEnums.RECORD_COUNT.value}, "
+            f"{PgVectorStatsTableEnums.LAST_INDEXED_AT.value} = EXCLUDED.{PgVectorStatsTableEnums.LAST_INDEXED_AT.value};"
+        ), {"collection_name": collection_name, "table_name": table_name, "inserted_count": inserted_count})
+    
+    async def ensure_collection_stats(self, collection_name: str):
+        """Seed the stats row of collections that were filled before the stats table existed."""
+        if collection_name in self._stats_collections:
+            return
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                ck_sql = sql_text(
+                    f"SELECT 1 FROM {self.stats_table_name} "
+                    f"WHERE {PgVectorStatsTableEnums.COLLECTION_NAME.value} = :collection_name;"
+                )
+                result = await session.execute(ck_sql, {"collection_name": collection_name})
+                if result.scalar_one_or_none() is None:
+                    await self._refresh_stats(session, collection_name=collection_name)
+        
+        self._stats_collections.add(collection_name)
+    
+    async def _count_records(self, collection_name: str, exact: bool=False) -> Tuple[int, str]:
+        """
+        Returns:
+            (record_count, source) where source is "exact", "stats" or "estimate"
+        """
+        table_name, project_id = self.resolve_collection(collection_name)
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                if exact:
+                    return await self._refresh_stats(session, collection_name=collection_name), "exact"
+                
+                stats_sql = sql_text(
+                    f"SELECT {PgVectorStatsTableEnums.RECORD_COUNT.value} FROM {self.stats_table_name} "
+                    f"WHERE {PgVectorStatsTableEnums.COLLECTION_NAME.value} = :collection_name;"
+                )
+                result = await session.execute(stats_sql, {"collection_name": collection_name})
+                record_count = result.scalar_one_or_none()
+                if record_count is not None:
+                    return record_count, "stats"
+                
+                # planner estimate of a per-project table; -1 until the table is first analyzed
+                if project_id is None:
+                    estimate_sql = sql_text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name);")
+                    result = await session.execute(estimate_sql, {"table_name": table_name})
+                    estimate = result.scalar_one_or_none()
+                    if estimate is not None and estimate >= 0:
+                        return int(estimate), "estimate"
+                
+                return await self._refresh_stats(session, collection_name=collection_name), "exact"
+    
+    async def count_records(self, collection_name: str, exact: bool=False) -> int:
+        record_count, _ = await self._count_records(collection_name=collection_name, exact=exact)
+        return record_count
+    
+    async def _count_table_records(self, table_name: str) -> int:
+        """Records of a whole table; the shared table of the partitioned layout spans many collections."""
+        async with self.db_client() as session:
+            async with session.begin():
+                stats_sql = sql_text(
+                    f"SELECT SUM({PgVectorStatsTableEnums.RECORD_COUNT.value}) FROM {self.stats_table_name} "
+                    f"WHERE {PgVectorStatsTableEnums.VECTOR_TABLE.value} = :table_name;"
+                )
+                result = await session.execute(stats_sql, {"table_name": table_name})
+                record_count = result.scalar_one_or_none()
+                if record_count is not None:
+                    return int(record_count)
+                
+                estimate_sql = sql_text(
+                    "SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0) FROM pg_class c "
+                    "WHERE c.oid = to_regclass(:table_name) "
+                    "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table_name));"
+                )
+                result = await session.execute(estimate_sql, {"table_name": table_name})
+                return int(result.scalar_one())
+    
     async def delete_collection(self, collection_name: str):
+        table_name, project_id = self.resolve_collection(collection_name)
+        
         async with self.db_client() as session:
             async with session.begin():
                 self.logger.info(f"Deleting collection: {collection_name}")
-                delete_sql = sql_text(f"DROP TABLE IF EXISTS {collection_name};")
-                await session.execute(delete_sql)
+                if project_id is None:
+                    delete_sql = sql_text(f"DROP TABLE IF EXISTS {table_name};")
+                    await session.execute(delete_sql)
+                    self._indexed_tables.discard(table_name)
+                elif await self.is_table_existed(table_name=table_name):
+                    delete_sql = sql_text(f"DELETE FROM {table_name} {self._project_filter(project_id)};")
+                    await session.execute(delete_sql, self._scoped_params({}, project_id))
+                
+                delete_stats_sql = sql_text(
+                    f"DELETE FROM {self.stats_table_name} "
+                    f"WHERE {PgVectorStatsTableEnums.COLLECTION_NAME.value} = :collection_name;"
+                )
+                await session.execute(delete_stats_sql, {"collection_name": collection_name})
+                self._stats_collections.discard(collection_name)
         return True
     
     async def create_collection(self, 
@@ -119,78 +374,307 @@ class PgVector(VectorDBInterface):
         if do_reset:
             await self.delete_collection(collection_name)
         
-        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        table_name, _ = self.resolve_collection(collection_name)
+        
+        is_collection_existed = await self.is_table_existed(table_name=table_name)
         if not is_collection_existed:
             self.logger.info(f"Creating collection: {collection_name}")
             async with self.db_client() as session:
                 async with session.begin():
-                    create_sql = sql_text(
-                        f"CREATE TABLE {collection_name} ("
-                            f"{PgVectorTableSchemaEnums.ID.value} bigserial PRIMARY KEY, "
-                            f"{PgVectorTableSchemaEnums.TEXT.value} text, "
-                            f"{PgVectorTableSchemaEnums.VECTOR.value} vector({embedding_size}), "
-                            f"{PgVectorTableSchemaEnums.METADATA.value} jsonb DEFAULT '{{}}'::jsonb, "
-                            f"{PgVectorTableSchemaEnums.CHUNK_ID.value} integer, "
-                            f"FOREIGN KEY ({PgVectorTableSchemaEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)"
-                        ")"
-                    )
-                    await session.execute(create_sql)
-                    
+                    for create_sql in self._create_table_sql(table_name, embedding_size):
+                        await session.execute(create_sql)
+                    await session.execute(self._text_search_index_sql(table_name))
+            
+            await self.ensure_collection_stats(collection_name=collection_name)
             return True
         self.logger.info(f"Collection already exists: {collection_name}; skipping creation.")
+        await self.create_text_search_index(collection_name=collection_name)
+        await self.ensure_collection_stats(collection_name=collection_name)
         return False
     
-    async def is_index_existed(self, collection_name: str) -> bool:
-        results = False
-        index_name = self.default_index_name(collection_name=collection_name)
+    def _create_table_sql(self, table_name: str, embedding_size: int) -> list:
+        columns = (
+            f"{PgVectorTableSchemaEnums.TEXT.value} text, "
+            f"{PgVectorTableSchemaEnums.VECTOR.value} vector({embedding_size}), "
+            f"{PgVectorTableSchemaEnums.METADATA.value} jsonb DEFAULT '{{}}'::jsonb, "
+            f"{PgVectorTableSchemaEnums.CHUNK_ID.value} integer, "
+            f"{self._text_search_column_sql()}, "
+            f"FOREIGN KEY ({PgVectorTableSchemaEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)"
+        )
+        
+        if not self.is_partitioned:
+            return [sql_text(
+                f"CREATE TABLE {table_name} ("
+                    f"{PgVectorTableSchemaEnums.ID.value} bigserial PRIMARY KEY, "
+                    f"{columns}"
+                ")"
+            )]
+        
+        # the partition key has to be part of the primary key
+        statements = [sql_text(
+            f"CREATE TABLE {table_name} ("
+                f"{PgVectorTableSchemaEnums.ID.value} bigserial, "
+                f"{PgVectorTableSchemaEnums.PROJECT_ID.value} text NOT NULL, "
+                f"{columns}, "
+                f"PRIMARY KEY ({PgVectorTableSchemaEnums.ID.value}, {PgVectorTableSchemaEnums.PROJECT_ID.value})"
+            f") PARTITION BY HASH ({PgVectorTableSchemaEnums.PROJECT_ID.value})"
+        )]
+        
+        for remainder in range(self.partitions_count):
+            statements.append(sql_text(
+                f"CREATE TABLE {table_name}_p{remainder} PARTITION OF {table_name} "
+                f"FOR VALUES WITH (MODULUS {self.partitions_count}, REMAINDER {remainder})"
+            ))
+        
+        return statements
+    
+    def _text_search_column_sql(self) -> str:
+        return (
+            f"{PgVectorTableSchemaEnums.TEXT_SEARCH.value} tsvector GENERATED ALWAYS AS "
+            f"(to_tsvector('{self.text_search_config}'::regconfig, "
+            f"coalesce({PgVectorTableSchemaEnums.TEXT.value}, ''))) STORED"
+        )
+    
+    def _text_search_index_sql(self, table_name: str):
+        index_name = self.default_text_search_index_name(collection_name=table_name)
+        return sql_text(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} "
+            f"USING gin ({PgVectorTableSchemaEnums.TEXT_SEARCH.value});"
+        )
+    
+    async def is_text_search_existed(self, collection_name: str) -> bool:
+        table_name, _ = self.resolve_collection(collection_name)
         async with self.db_client() as session:
             async with session.begin():
                 ck_sql = sql_text(
-                    f"SELECT 1 FROM pg_indexes WHERE tablename = :collection_name "
-                    f"AND indexname = :index_name"
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = :collection_name AND column_name = :column_name"
                 )
-                results = await session.execute(ck_sql, {"index_name": index_name, "collection_name": collection_name})
-                results = results.scalar_one_or_none() is not None
-        return results
-    
+                results = await session.execute(ck_sql, {
+                    "collection_name": table_name,
+                    "column_name": PgVectorTableSchemaEnums.TEXT_SEARCH.value
+                })
+                return results.scalar_one_or_none() is not None
     
-    async def create_vector_index(self, collection_name: str, index_type: str=PgVectorIndexTypeEnums.HNSW.value):
-        is_index_existed = await self.is_index_existed(collection_name=collection_name)
-        if is_index_existed:
+    async def create_text_search_index(self, collection_name: str) -> bool:
+        """Add the tsvector column and its GIN index to collections created before hybrid search."""
+        if await self.is_text_search_existed(collection_name=collection_name):
             return False
         
+        table_name, _ = self.resolve_collection(collection_name)
+        self.logger.info(f"Adding text search column to collection: {collection_name}")
         async with self.db_client() as session:
             async with session.begin():
-                count_sql = sql_text(f"SELECT COUNT(*) FROM {collection_name};")
-                result = await session.execute(count_sql)
-                record_count = result.scalar_one()
-                
-                if record_count < self.index_threshold:
-                    return False
-                
-                self.logger.info(f"Creating index for collection: {collection_name}")
-                index_name = self.default_index_name(collection_name=collection_name)
-                
-                create_idx_sql = sql_text(
-                    f"CREATE INDEX {index_name} ON {collection_name} "
-                    f"USING {index_type} ({PgVectorTableSchemaEnums.VECTOR.value} {self.distance_metric});")
-                
-                await session.execute(create_idx_sql)
-                
-                self.logger.info(f"Created index: {index_name} for collection: {collection_name}")
+                await session.execute(sql_text(
+                    f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {self._text_search_column_sql()};"
+                ))
+                await session.execute(self._text_search_index_sql(table_name))
+        
+        return True
     
+    async def get_index_state(self, index_name: str) -> Optional[bool]:
+        """
+        Returns:
+            None when the index is missing, otherwise whether postgres marked it valid;
+            an interrupted concurrent build leaves an invalid index behind
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                ck_sql = sql_text(
+                    "SELECT i.indisvalid FROM pg_class c "
+                    "JOIN pg_index i ON i.indexrelid = c.oid "
+                    "WHERE c.relname = :index_name"
+                )
+                results = await session.execute(ck_sql, {"index_name": index_name})
+                return results.scalar_one_or_none()
+    
+    async def is_index_existed(self, collection_name: str) -> bool:
+        table_name, _ = self.resolve_collection(collection_name)
+        index_name = self.default_index_name(collection_name=table_name)
+        return await self.get_index_state(index_name=index_name) is True
+    
+    def is_bulk_loading(self, table_name: str) -> bool:
+        return any(
+            self.resolve_collection(collection_name)[0] == table_name
+            for collection_name in self._bulk_load_collections
+        )
+    
+    async def create_vector_index(self, 
+                                  collection_name: str, 
+                                  index_type: str=PgVectorIndexTypeEnums.HNSW.value,
+                                  concurrently: bool=False,
+                                  progress_callback=None):
+        table_name, _ = self.resolve_collection(collection_name)
+        
+        if table_name in self._indexed_tables or self.is_bulk_loading(table_name):
+            return False
+        
+        index_name = self.default_index_name(collection_name=table_name)
+        index_state = await self.get_index_state(index_name=index_name)
+        if index_state:
+            self._indexed_tables.add(table_name)
+            return False
+        
+        record_count = await self._count_table_records(table_name=table_name)
+        if record_count < self.index_threshold:
+            return False
+        
+        self.logger.info(f"Creating index for collection: {table_name}")
+        
+        statements = []
+        if index_state is False:
+            self.logger.warning(f"Dropping invalid index left by an interrupted build: {index_name}")
+            statements.extend(self._drop_index_sql(table_name))
+        statements.extend(await self._create_index_sql(table_name, index_type, concurrently))
+        
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        async with self.db_client.kw["bind"].connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(sql_text(f"SET maintenance_work_mem = '{self.maintenance_work_mem}';"))
+            await connection.execute(sql_text(
+                f"SET max_parallel_maintenance_workers = {self.max_parallel_maintenance_workers};"))
+            
+            monitor = asyncio.create_task(
+                self._monitor_index_build(collection_name=collection_name, progress_callback=progress_callback)
+            )
+            try:
+                for statement in statements:
+                    await connection.execute(statement)
+            finally:
+                monitor.cancel()
+                await asyncio.gather(monitor, return_exceptions=True)
+                await connection.execute(sql_text("RESET maintenance_work_mem;"))
+                await connection.execute(sql_text("RESET max_parallel_maintenance_workers;"))
+        
+        self._indexed_tables.add(table_name)
+        self.logger.info(f"Created index: {index_name} for collection: {table_name}")
+        
         return True
     
+    async def list_partitions(self, table_name: str) -> List[str]:
+        async with self.db_client() as session:
+            async with session.begin():
+                list_sql = sql_text(
+                    "SELECT c.relname FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "JOIN pg_class p ON p.oid = i.inhparent "
+                    "WHERE p.relname = :table_name ORDER BY c.relname;"
+                )
+                results = await session.execute(list_sql, {"table_name": table_name})
+                return list(results.scalars().all())
+    
+    async def _create_index_sql(self, table_name: str, index_type: str, concurrently: bool) -> list:
+        index_name = self.default_index_name(collection_name=table_name)
+        index_method = f"USING {index_type} ({PgVectorTableSchemaEnums.VECTOR.value} {self.distance_metric})"
+        
+        if not concurrently:
+            # on the partitioned layout postgres builds one index per partition
+            return [sql_text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} {index_method};")]
+        
+        if not self.is_partitioned:
+            return [sql_text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} {index_method};")]
+        
+        # partitioned tables do not support CONCURRENTLY: declare the parent index on its own,
+        # build every partition index concurrently and attach it; the parent turns valid
+        # once all partitions are attached
+        statements = [sql_text(f"CREATE INDEX IF NOT EXISTS {index_name} ON ONLY {table_name} {index_method};")]
+        for partition_name in await self.list_partitions(table_name=table_name):
+            partition_index_name = self.default_index_name(collection_name=partition_name)
+            statements.append(sql_text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index_name} ON {partition_name} {index_method};"))
+            statements.append(sql_text(f"ALTER INDEX {index_name} ATTACH PARTITION {partition_index_name};"))
+        
+        return statements
+    
+    def _drop_index_sql(self, table_name: str) -> list:
+        index_name = self.default_index_name(collection_name=table_name)
+        statements = [sql_text(f"DROP INDEX IF EXISTS {index_name};")]
+        
+        if self.is_partitioned:
+            # partition indexes of a failed build may not be attached to the parent yet
+            statements.extend(
+                sql_text(f"DROP INDEX IF EXISTS {self.default_index_name(collection_name=f'{table_name}_p{remainder}')};")
+                for remainder in range(self.partitions_count)
+            )
+        
+        return statements
+    
+    async def get_index_build_progress(self, collection_name: str) -> List[dict]:
+        table_name, _ = self.resolve_collection(collection_name)
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                progress_sql = sql_text(
+                    "SELECT c.relname AS table_name, p.phase, p.blocks_done, p.blocks_total, "
+                    "p.tuples_done, p.tuples_total "
+                    "FROM pg_stat_progress_create_index p "
+                    "JOIN pg_class c ON c.oid = p.relid "
+                    "WHERE c.relname = :table_name OR c.relname LIKE :partition_pattern;"
+                )
+                results = await session.execute(progress_sql, {
+                    "table_name": table_name,
+                    "partition_pattern": f"{table_name}_p%"
+                })
+                return [dict(row._mapping) for row in results.fetchall()]
+    
+    async def _monitor_index_build(self, collection_name: str, progress_callback=None):
+        while True:
+            await asyncio.sleep(INDEX_PROGRESS_INTERVAL)
+            try:
+                progress = await self.get_index_build_progress(collection_name=collection_name)
+            except Exception as e:
+                self.logger.warning(f"Cannot read index build progress for {collection_name}: {e}")
+                continue
+            
+            for row in progress:
+                self.logger.info(
+                    f"Index build on {row['table_name']}: {row['phase']} | "
+                    f"blocks {row['blocks_done']}/{row['blocks_total']} | "
+                    f"tuples {row['tuples_done']}/{row['tuples_total']}"
+                )
+            
+            if progress and progress_callback:
+                progress_callback(progress)
+    
     async def reset_vector_index(self, collection_name: str, index_type: str=PgVectorIndexTypeEnums.HNSW.value):
-        index_name = self.default_index_name(collection_name=collection_name)
+        table_name, _ = self.resolve_collection(collection_name)
         async with self.db_client() as session:
             async with session.begin():
-                drop_idx_sql = sql_text(f"DROP INDEX IF EXISTS {index_name};")
-                await session.execute(drop_idx_sql)
+                for drop_idx_sql in self._drop_index_sql(table_name):
+                    await session.execute(drop_idx_sql)
         
+        self._indexed_tables.discard(table_name)
         return await self.create_vector_index(collection_name=collection_name, index_type=index_type)
+    
+    async def start_bulk_load(self, collection_name: str):
+        """Stop maintaining the vector index of the collection until finish_bulk_load."""
+        self._bulk_load_collections.add(collection_name)
+        return True
+    
+    async def finish_bulk_load(self, collection_name: str, progress_callback=None):
+        """Build the vector index once, concurrently, over everything loaded so far."""
+        self._bulk_load_collections.discard(collection_name)
+        return await self.create_vector_index(
+            collection_name=collection_name,
+            concurrently=True,
+            progress_callback=progress_callback
+        )
+    
+    def _insert_sql(self, table_name: str, project_id: Optional[str]):
+        project_column, project_value = "", ""
+        if project_id is not None:
+            project_column = f", {PgVectorTableSchemaEnums.PROJECT_ID.value}"
+            project_value = ", :project_id"
         
-            
+        return sql_text(
+            f"INSERT INTO {table_name} "
+            f"({PgVectorTableSchemaEnums.TEXT.value}, "
+            f"{PgVectorTableSchemaEnums.VECTOR.value}, "
+            f"{PgVectorTableSchemaEnums.METADATA.value}, "
+            f"{PgVectorTableSchemaEnums.CHUNK_ID.value}{project_column}) "
+            f"VALUES (:text, :vector, :metadata, :chunk_id{project_value})"
+        )
+    
     async def insert_one(self, 
                    collection_name: str, 
                    text: str,
@@ -208,27 +692,23 @@ class PgVector(VectorDBInterface):
             self.logger.error(f"Cannot insert document without chunk_id: collection: {collection_name}.")
             return False
         
+        table_name, project_id = self.resolve_collection(collection_name)
+        
         async with self.db_client() as session:
             async with session.begin():
-                insert_sql = sql_text(
-                    f"INSERT INTO {collection_name} "
-                    f"({PgVectorTableSchemaEnums.TEXT.value}, "
-                    f"{PgVectorTableSchemaEnums.VECTOR.value}, "
-                    f"{PgVectorTableSchemaEnums.METADATA.value}, "
-                    f"{PgVectorTableSchemaEnums.CHUNK_ID.value}) "
-                    "VALUES (:text, :vector, :metadata, :chunk_id);"
-                )
-                await session.execute(insert_sql, {
+                insert_sql = self._insert_sql(table_name, project_id)
+                await session.execute(insert_sql, self._scoped_params({
                     "text": text,
                     "vector": "[" + ",".join(map(str, vector)) + "]",
                     "metadata": json.dumps(metadata, ensure_ascii=False) if metadata else "{}",
                     "chunk_id": record_id
-                })
-                
+                }, project_id))
+                await self._record_inserts(session, collection_name=collection_name, inserted_count=1)
+        
         await self.create_vector_index(collection_name=collection_name)
-                
+        
         return True
-
+    
     async def insert_many(self, 
                     collection_name: str, 
                     texts: List[str],
@@ -249,16 +729,11 @@ class PgVector(VectorDBInterface):
         if not metadatas or len(metadatas) == 0:
             metadatas = [None]*len(vectors)
         
+        table_name, project_id = self.resolve_collection(collection_name)
+        
         async with self.db_client() as session:
             async with session.begin():
-                insert_sql = sql_text(
-                        f"INSERT INTO {collection_name} "
-                        f"({PgVectorTableSchemaEnums.TEXT.value}, "
-                        f"{PgVectorTableSchemaEnums.VECTOR.value}, "
-                        f"{PgVectorTableSchemaEnums.METADATA.value}, "
-                        f"{PgVectorTableSchemaEnums.CHUNK_ID.value}) "
-                        "VALUES (:text, :vector, :metadata, :chunk_id)"
-                    )
+                insert_sql = self._insert_sql(table_name, project_id)
                 
                 for i in range(0, len(vectors), batch_size):
                     batch_texts = texts[i:i+batch_size]
@@ -267,17 +742,19 @@ class PgVector(VectorDBInterface):
                     batch_record_ids = record_ids[i:i+batch_size]
                     
                     values = [
-                        {
+                        self._scoped_params({
                             "text": t,
                             "vector": "[" + ",".join(map(str, v)) + "]",
                             "metadata": json.dumps(m, ensure_ascii=False) if m else "{}",
                             "chunk_id": r
-                        }
+                        }, project_id)
                         for t, v, m, r in zip(batch_texts, batch_vectors, batch_metadatas, batch_record_ids)
                     ]
                     
                     await session.execute(insert_sql, values)
-                    
+                
+                await self._record_inserts(session, collection_name=collection_name, inserted_count=len(vectors))
+        
         await self.create_vector_index(collection_name=collection_name)
         
         return True
@@ -285,37 +762,278 @@ class PgVector(VectorDBInterface):
     async def search_by_vector(self, 
                          collection_name: str, 
                          query_vector: List[float], 
-                         top_k: int=5) -> List[RetrievedDocument]:
+                         top_k: int=5, 
+                         filters: dict=None, 
+                         with_vectors: bool=False) -> List[RetrievedDocument]:
         
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
             self.logger.error(f"Collection does not exist: {collection_name}; cannot insert documents.")
             return False
         
+        table_name, project_id = self.resolve_collection(collection_name)
         query_vector = "[" + ",".join(map(str, query_vector)) + "]"
         
         async with self.db_client() as session:
             results = None
             
             async with session.begin():
+                await self._prepare_scoped_search(session, project_id, filters)
+                
+                # order by the raw distance so the vector index can serve the scan
                 search_sql = sql_text(
                     f'SELECT {PgVectorTableSchemaEnums.TEXT.value} as text, '
+                    f'{PgVectorTableSchemaEnums.METADATA.value} as metadata, '
+                    f'{PgVectorTableSchemaEnums.CHUNK_ID.value} as chunk_id, '
+                    f'{self._vector_column(with_vectors)}'
                     f'1 - ({PgVectorTableSchemaEnums.VECTOR.value} <=> :vector) as score ' 
-                    f'FROM {collection_name} '
-                    'ORDER BY score DESC '
+                    f'FROM {table_name} '
+                    f'{self._project_filter(project_id)}'
+                    f'{self._metadata_filter(filters, operator="WHERE" if project_id is None else "AND")}'
+                    f'ORDER BY {PgVectorTableSchemaEnums.VECTOR.value} <=> :vector '
                     f'LIMIT {top_k}'
                 )
                 
-                results = await session.execute(search_sql, {"vector": query_vector})
+                results = await session.execute(search_sql, self._scoped_params({"vector": query_vector}, project_id, filters))
                 
                 results = results.fetchall()
             
             if not results or len(results) == 0:
                 return None
-             
+            
             return [
                 RetrievedDocument(
                     text=res.text, 
-                    score=res.score
+                    score=res.score,
+                    metadata=json.loads(res.metadata) if isinstance(res.metadata, str) else res.metadata,
+                    record_id=res.chunk_id,
+                    vector=json.loads(res.vector) if with_vectors else None
                 ) for res in results
             ]
+    
+    
+    async def search_many(self, 
+                          collection_name: str, 
+                          query_vectors: List[List[float]], 
+                          top_k: int=5, 
+                          filters: dict=None) -> List[List[RetrievedDocument]]:
+        
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Collection does not exist: {collection_name}; cannot search documents.")
+            return False
+        
+        if not query_vectors:
+            return []
+        
+        table_name, project_id = self.resolve_collection(collection_name)
+        
+        params = self._scoped_params({"top_k": top_k}, project_id, filters)
+        values = []
+        for idx, query_vector in enumerate(query_vectors):
+            params[f"vector_{idx}"] = "[" + ",".join(map(str, query_vector)) + "]"
+            values.append(f"({idx}, CAST(:vector_{idx} AS vector))")
+        
+        # one LATERAL top-k scan per query vector, all in a single round trip
+        search_sql = sql_text(
+            "SELECT queries.idx AS idx, matches.text AS text, matches.metadata AS metadata, "
+            "matches.chunk_id AS chunk_id, matches.score AS score "
+            f"FROM (VALUES {', '.join(values)}) AS queries(idx, query_vector) "
+            "CROSS JOIN LATERAL ("
+                f"SELECT {PgVectorTableSchemaEnums.TEXT.value} AS text, "
+                f"{PgVectorTableSchemaEnums.METADATA.value} AS metadata, "
+                f"{PgVectorTableSchemaEnums.CHUNK_ID.value} AS chunk_id, "
+                f"1 - ({PgVectorTableSchemaEnums.VECTOR.value} <=> queries.query_vector) AS score "
+                f"FROM {table_name} "
+                f"{self._project_filter(project_id)}"
+                f"{self._metadata_filter(filters, operator='WHERE' if project_id is None else 'AND')}"
+                f"ORDER BY {PgVectorTableSchemaEnums.VECTOR.value} <=> queries.query_vector "
+                "LIMIT :top_k"
+            ") AS matches "
+            "ORDER BY queries.idx, matches.score DESC"
+        )
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                await self._prepare_scoped_search(session, project_id, filters)
+                results = await session.execute(search_sql, params)
+                results = results.fetchall()
+        
+        grouped_results = [[] for _ in query_vectors]
+        for res in results:
+            grouped_results[res.idx].append(
+                RetrievedDocument(
+                    text=res.text, 
+                    score=res.score,
+                    metadata=json.loads(res.metadata) if isinstance(res.metadata, str) else res.metadata,
+                    record_id=res.chunk_id
+                )
+            )
+        
+        return grouped_results
+    
+    async def search_hybrid(self, 
+                            collection_name: str, 
+                            query_vector: List[float], 
+                            query_text: str, 
+                            top_k: int=5, 
+                            filters: dict=None, 
+                            with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Collection does not exist: {collection_name}; cannot search documents.")
+            return False
+        
+        table_name, project_id = self.resolve_collection(collection_name)
+        query_vector = "[" + ",".join(map(str, query_vector)) + "]"
+        prefetch = max(self.hybrid_prefetch, top_k)
+        
+        # dense and lexical candidates are fused with RRF in a single round trip
+        search_sql = sql_text(
+            "WITH dense AS ("
+                f"SELECT {PgVectorTableSchemaEnums.ID.value} AS id, {PgVectorTableSchemaEnums.TEXT.value} AS text, "
+                f"{PgVectorTableSchemaEnums.METADATA.value} AS metadata, {PgVectorTableSchemaEnums.CHUNK_ID.value} AS chunk_id, "
+                f"{self._vector_column(with_vectors)}"
+                f"ROW_NUMBER() OVER (ORDER BY {PgVectorTableSchemaEnums.VECTOR.value} <=> :vector) AS rank "
+                f"FROM {table_name} "
+                f"{self._project_filter(project_id)}"
+                f"{self._metadata_filter(filters, operator='WHERE' if project_id is None else 'AND')}"
+                f"ORDER BY {PgVectorTableSchemaEnums.VECTOR.value} <=> :vector "
+                "LIMIT :prefetch"
+            "), lexical AS ("
+                f"SELECT {PgVectorTableSchemaEnums.ID.value} AS id, {PgVectorTableSchemaEnums.TEXT.value} AS text, "
+                f"{PgVectorTableSchemaEnums.METADATA.value} AS metadata, {PgVectorTableSchemaEnums.CHUNK_ID.value} AS chunk_id, "
+                f"{self._vector_column(with_vectors)}"
+                f"ROW_NUMBER() OVER (ORDER BY ts_rank_cd({PgVectorTableSchemaEnums.TEXT_SEARCH.value}, query) DESC) AS rank "
+                f"FROM {table_name}, websearch_to_tsquery('{self.text_search_config}'::regconfig, :query_text) query "
+                f"WHERE {PgVectorTableSchemaEnums.TEXT_SEARCH.value} @@ query "
+                f"{self._project_filter(project_id, operator='AND')}"
+                f"{self._metadata_filter(filters, operator='AND')}"
+                f"ORDER BY ts_rank_cd({PgVectorTableSchemaEnums.TEXT_SEARCH.value}, query) DESC "
+                "LIMIT :prefetch"
+            ") "
+            "SELECT COALESCE(dense.text, lexical.text) AS text, "
+            "COALESCE(dense.metadata, lexical.metadata) AS metadata, "
+            "COALESCE(dense.chunk_id, lexical.chunk_id) AS chunk_id, "
+            f"{'COALESCE(dense.vector, lexical.vector) AS vector, ' if with_vectors else ''}"
+            "COALESCE(1.0 / (:rrf_k + dense.rank), 0) + COALESCE(1.0 / (:rrf_k + lexical.rank), 0) AS score "
+            "FROM dense FULL OUTER JOIN lexical ON dense.id = lexical.id "
+            "ORDER BY score DESC "
+            "LIMIT :top_k"
+        )
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                await self._prepare_scoped_search(session, project_id, filters)
+                results = await session.execute(search_sql, self._scoped_params({
+                    "vector": query_vector,
+                    "query_text": query_text,
+                    "prefetch": prefetch,
+                    "rrf_k": self.rrf_k,
+                    "top_k": top_k
+                }, project_id, filters))
+                results = results.fetchall()
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return [
+            RetrievedDocument(
+                text=res.text, 
+                score=res.score,
+                metadata=json.loads(res.metadata) if isinstance(res.metadata, str) else res.metadata,
+                record_id=res.chunk_id,
+                vector=json.loads(res.vector) if with_vectors else None
+            ) for res in results
+        ]
+    
+    async def scroll(self, 
+                     collection_name: str, 
+                     batch_size: int=1000, 
+                     offset: Optional[int]=None) -> Tuple[List[VectorRecord], Optional[int]]:
+        """Keyset pagination over the row id; the offset is the last id returned."""
+        if not await self.is_collection_existed(collection_name=collection_name):
+            return [], None
+        
+        table_name, project_id = self.resolve_collection(collection_name)
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                scroll_sql = sql_text(
+                    f"SELECT {PgVectorTableSchemaEnums.ID.value} AS id, "
+                    f"{PgVectorTableSchemaEnums.TEXT.value} AS text, "
+                    f"{PgVectorTableSchemaEnums.VECTOR.value}::text AS vector, "
+                    f"{PgVectorTableSchemaEnums.METADATA.value} AS metadata, "
+                    f"{PgVectorTableSchemaEnums.CHUNK_ID.value} AS chunk_id "
+                    f"FROM {table_name} "
+                    f"WHERE {PgVectorTableSchemaEnums.ID.value} > :offset "
+                    f"{self._project_filter(project_id, operator='AND')}"
+                    f"ORDER BY {PgVectorTableSchemaEnums.ID.value} "
+                    "LIMIT :batch_size"
+                )
+                results = await session.execute(scroll_sql, self._scoped_params({
+                    "offset": offset or 0,
+                    "batch_size": batch_size
+                }, project_id))
+                results = results.fetchall()
+        
+        records = [
+            VectorRecord(
+                text=res.text,
+                vector=json.loads(res.vector),
+                metadata=json.loads(res.metadata) if isinstance(res.metadata, str) else res.metadata,
+                record_id=res.chunk_id
+            ) for res in results
+        ]
+        
+        next_offset = results[-1].id if len(results) == batch_size else None
+        return records, next_offset
+    
+    async def list_per_project_tables(self) -> List[str]:
+        async with self.db_client() as session:
+            async with session.begin():
+                list_tables = sql_text(
+                    "SELECT tablename FROM pg_tables WHERE tablename ~ '^collection_[0-9]+_\\w+$' ORDER BY tablename;")
+                results = await session.execute(list_tables)
+                return list(results.scalars().all())
+    
+    async def migrate_collection_to_partitioned(self, collection_name: str) -> int:
+        """
+        Move one per-project table into its shared partitioned table and drop it.
+        The copy and the drop run in a single transaction.
+        
+        Returns:
+            Number of moved records
+        """
+        if not self.is_partitioned:
+            raise ValueError("PgVector must be configured with the partitioned table layout to migrate.")
+        
+        match = COLLECTION_NAME_PATTERN.match(collection_name)
+        if not match:
+            raise ValueError(f"Not a per-project collection table: {collection_name}")
+        
+        embedding_size = int(match.group(1))
+        table_name, project_id = self.resolve_collection(collection_name)
+        
+        await self.create_collection(collection_name=collection_name, embedding_size=embedding_size)
+        
+        columns = ", ".join([
+            PgVectorTableSchemaEnums.TEXT.value,
+            PgVectorTableSchemaEnums.VECTOR.value,
+            PgVectorTableSchemaEnums.METADATA.value,
+            PgVectorTableSchemaEnums.CHUNK_ID.value,
+        ])
+        
+        async with self.db_client() as session:
+            async with session.begin():
+                move_sql = sql_text(
+                    f"INSERT INTO {table_name} ({columns}, {PgVectorTableSchemaEnums.PROJECT_ID.value}) "
+                    f"SELECT {columns}, :project_id FROM {collection_name};"
+                )
+                result = await session.execute(move_sql, {"project_id": project_id})
+                await session.execute(sql_text(f"DROP TABLE {collection_name};"))
+                await self._refresh_stats(session, collection_name=collection_name)
+        
+        self.logger.info(f"Migrated {result.rowcount} records from {collection_name} into {table_name}")
+        return result.rowcount
@@ -1,10 +1,13 @@
-from typing import List
+from typing import List, Optional, Tuple, Union
 from qdrant_client import QdrantClient, models
 from ..VectorDBInterface import VectorDBInterface
 import logging
-from ..utils import get_distance_metrics
-from ..VectorDBEnums import VectorDBEnums
-from models.db_schemas import RetrievedDocument
+from ..utils import get_distance_metrics, build_sparse_vector
+from ..VectorDBEnums import VectorDBEnums, QdrantSparseVectorEnums
+from models.db_schemas import RetrievedDocument, VectorRecord
+
+# qdrant's default indexing_threshold (kB), restored when a collection reports none
+DEFAULT_INDEXING_THRESHOLD = 20000
 
 class Qdrant(VectorDBInterface):
     def __init__(self, 
@@ -12,6 +15,8 @@ class Qdrant(VectorDBInterface):
                  db_url: str,
                  distance_metric: str,
                  default_vector_size: int,
+                 language: str=None,
+                 hybrid_prefetch: int=50,
                  *args, **kwargs):
         
         self.client = None
@@ -19,6 +24,13 @@ class Qdrant(VectorDBInterface):
         self.db_url = db_url
         self.distance_metric = None
         self.default_vector_size = default_vector_size
+        self.language = language
+        self.hybrid_prefetch = hybrid_prefetch
+        self.sparse_vector_name = QdrantSparseVectorEnums.TEXT.value
+        # collection_name -> whether it was created with the sparse text vector
+        self._sparse_collections = {}
+        # collection_name -> indexing_threshold to restore after a bulk load
+        self._bulk_load_thresholds = {}
         
         metrics_map = get_distance_metrics(vectordb_type=VectorDBEnums.QDRANT.value)
         
@@ -39,6 +51,7 @@ class Qdrant(VectorDBInterface):
     
     async def disconnect(self):
         self.client = None
+        self._sparse_collections = {}
     
     async def is_collection_existed(self, collection_name: str) -> bool:
         return self.client.collection_exists(collection_name=collection_name)
@@ -46,12 +59,20 @@ class Qdrant(VectorDBInterface):
     async def list_collections(self) -> List:
         return self.client.get_collections()
     
-    async def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name).model_dump()
+    async def get_collection_info(self, collection_name: str, exact: bool=False) -> dict:
+        collection_info = self.client.get_collection(collection_name=collection_name).model_dump()
+        if exact:
+            # points_count reported by get_collection is approximate
+            collection_info["points_count"] = await self.count_records(collection_name=collection_name, exact=True)
+        return collection_info
+    
+    async def count_records(self, collection_name: str, exact: bool=False) -> int:
+        return self.client.count(collection_name=collection_name, exact=exact).count
     
     async def delete_collection(self, collection_name: str):
         if await self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
+            self._sparse_collections.pop(collection_name, None)
             return self.client.delete_collection(collection_name=collection_name)
     
     async def create_collection(self, 
@@ -66,11 +87,47 @@ class Qdrant(VectorDBInterface):
             _ = self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(size=embedding_size,
-                                                   distance=self.distance_metric))
+                                                   distance=self.distance_metric),
+                sparse_vectors_config={
+                    self.sparse_vector_name: models.SparseVectorParams(modifier=models.Modifier.IDF)
+                })
+            self._sparse_collections[collection_name] = True
             return True
         
         return False
     
+    def has_sparse_vectors(self, collection_name: str) -> bool:
+        """Collections created before hybrid search have no sparse text vector."""
+        if collection_name not in self._sparse_collections:
+            params = self.client.get_collection(collection_name=collection_name).config.params
+            self._sparse_collections[collection_name] = bool(
+                params.sparse_vectors and self.sparse_vector_name in params.sparse_vectors
+            )
+        return self._sparse_collections[collection_name]
+    
+    def build_point_vector(self, collection_name: str, text: str, vector: list):
+        if not self.has_sparse_vectors(collection_name):
+            return vector
+        
+        indices, values = build_sparse_vector(text, language=self.language)
+        return {
+            "": vector,
+            self.sparse_vector_name: models.SparseVector(indices=indices, values=values)
+        }
+    
+    def get_dense_vector(self, point) -> list:
+        # collections with sparse vectors return the dense one under the default name
+        return point.vector.get("") if isinstance(point.vector, dict) else point.vector
+    
+    def build_filter(self, filters: dict=None) -> Optional[models.Filter]:
+        if not filters:
+            return None
+        
+        return models.Filter(must=[
+            models.FieldCondition(key=f"metadata.{key}", match=models.MatchValue(value=value))
+            for key, value in filters.items()
+        ])
+    
     async def insert_one(self, 
                    collection_name: str, 
                    text: str,
@@ -88,7 +145,7 @@ class Qdrant(VectorDBInterface):
                 records=[
                     models.Record(
                         id=record_id, 
-                        vector=vector, 
+                        vector=self.build_point_vector(collection_name, text, vector), 
                         payload={
                             'text':text,'metadata':metadata
                             }
@@ -128,7 +185,7 @@ class Qdrant(VectorDBInterface):
             
             batch_records = [models.Record(
                 id=batch_record_ids[j],
-                vector=batch_vectors[j],
+                vector=self.build_point_vector(collection_name, batch_texts[j], batch_vectors[j]),
                 payload={
                     'text':batch_texts[j],
                     'metadata':batch_metadatas[j]
@@ -149,7 +206,9 @@ class Qdrant(VectorDBInterface):
     async def search_by_vector(self, 
                          collection_name: str, 
                          query_vector: list,
-                         top_k: int=5) -> List[RetrievedDocument]:
+                         top_k: int=5, 
+                         filters: dict=None, 
+                         with_vectors: bool=False) -> List[RetrievedDocument]:
         
         if not await self.is_collection_existed(collection_name):
             self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
@@ -158,9 +217,102 @@ class Qdrant(VectorDBInterface):
         results = self.client.search(
             collection_name=collection_name,
             query_vector=query_vector,
-            limit=top_k
+            query_filter=self.build_filter(filters),
+            limit=top_k,
+            with_vectors=with_vectors
+            )
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return [
+            RetrievedDocument(
+                text=res.payload.get('text', ''),
+                score=res.score,
+                metadata=res.payload.get('metadata'),
+                record_id=res.id,
+                vector=self.get_dense_vector(res) if with_vectors else None
+            ) for res in results
+        ]
+
+    
+    async def search_many(self, 
+                          collection_name: str, 
+                          query_vectors: List[list], 
+                          top_k: int=5, 
+                          filters: dict=None) -> List[List[RetrievedDocument]]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        if not query_vectors:
+            return []
+        
+        query_filter = self.build_filter(filters)
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(vector=query_vector, filter=query_filter, limit=top_k, with_payload=True)
+                for query_vector in query_vectors
+            ]
+        )
+        
+        return [
+            [
+                RetrievedDocument(
+                    text=res.payload.get('text', ''),
+                    score=res.score,
+                    metadata=res.payload.get('metadata'),
+                    record_id=res.id
+                ) for res in results
+            ] for results in batch_results
+        ]
+    
+    async def search_hybrid(self, 
+                            collection_name: str, 
+                            query_vector: list, 
+                            query_text: str, 
+                            top_k: int=5, 
+                            filters: dict=None, 
+                            with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        if not self.has_sparse_vectors(collection_name):
+            self.logger.warning(f"Collection: {collection_name} has no sparse vectors; falling back to dense search.")
+            return await self.search_by_vector(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                top_k=top_k,
+                filters=filters,
+                with_vectors=with_vectors
             )
         
+        indices, values = build_sparse_vector(query_text, language=self.language, is_query=True)
+        prefetch = max(self.hybrid_prefetch, top_k)
+        query_filter = self.build_filter(filters)
+        
+        # both candidate lists are fused server side with RRF in one query
+        results = self.client.query_points(
+            collection_name=collection_name,
+            prefetch=[
+                models.Prefetch(query=query_vector, filter=query_filter, limit=prefetch),
+                models.Prefetch(
+                    query=models.SparseVector(indices=indices, values=values),
+                    using=self.sparse_vector_name,
+                    filter=query_filter,
+                    limit=prefetch
+                ),
+            ],
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=top_k,
+            with_payload=True,
+            with_vectors=with_vectors
+        ).points
+        
         if not results or len(results) == 0:
             return None
         
@@ -168,5 +320,63 @@ class Qdrant(VectorDBInterface):
             RetrievedDocument(
                 text=res.payload.get('text', ''),
                 score=res.score,
+                metadata=res.payload.get('metadata'),
+                record_id=res.id,
+                vector=self.get_dense_vector(res) if with_vectors else None
             ) for res in results
         ]
+    
+    async def scroll(self, 
+                     collection_name: str, 
+                     batch_size: int=1000, 
+                     offset: Optional[Union[int, str]]=None) -> Tuple[List[VectorRecord], Optional[Union[int, str]]]:
+        
+        if not await self.is_collection_existed(collection_name):
+            return [], None
+        
+        points, next_offset = self.client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        
+        records = []
+        for point in points:
+            vector = self.get_dense_vector(point)
+            records.append(VectorRecord(
+                text=point.payload.get('text', ''),
+                vector=vector,
+                metadata=point.payload.get('metadata'),
+                record_id=point.id
+            ))
+        
+        return records, next_offset
+    
+    async def start_bulk_load(self, collection_name: str):
+        """Pause HNSW indexing while points are uploaded; the local mode keeps no index."""
+        if not self.db_url or not await self.is_collection_existed(collection_name):
+            return False
+        
+        optimizer_config = self.client.get_collection(collection_name=collection_name).config.optimizer_config
+        self._bulk_load_thresholds[collection_name] = optimizer_config.indexing_threshold or DEFAULT_INDEXING_THRESHOLD
+        
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0)
+        )
+        return True
+    
+    async def finish_bulk_load(self, collection_name: str, progress_callback=None):
+        if collection_name not in self._bulk_load_thresholds:
+            return False
+        
+        # the optimizer builds the index in the background once the threshold is back
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(
+                indexing_threshold=self._bulk_load_thresholds.pop(collection_name)
+            )
+        )
+        return True
@@ -0,0 +1,390 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMetricEnums, VectorDBEnums, VectorDBTierEnums
+from ..utils import get_distance_metrics, prepare_vectors, exact_top_k, match_metadata_filters
+from models.db_schemas import RetrievedDocument, VectorRecord
+from utils.index_version import IndexVersionStore
+
+# records fetched per scroll call while hydrating a collection into memory
+HYDRATION_BATCH_SIZE = 1000
+
+class TierState:
+    def __init__(self, 
+                 record_count: int, 
+                 checked_at: float, 
+                 index_version: Optional[int]=None, 
+                 vectors: np.ndarray=None, 
+                 texts: List[str]=None, 
+                 metadatas: List[dict]=None, 
+                 record_ids: list=None):
+        self.record_count = record_count
+        self.checked_at = checked_at
+        self.index_version = index_version
+        # None for collections served by the durable backend
+        self.vectors = vectors
+        self.texts = texts
+        self.metadatas = metadatas
+        self.record_ids = record_ids
+        # vectors and texts dominate, metadata is left out of the estimate
+        self.size_bytes = 0 if vectors is None else vectors.nbytes + sum(len(text) for text in texts)
+    
+    @property
+    def tier(self) -> str:
+        return VectorDBTierEnums.MEMORY.value if self.vectors is not None else VectorDBTierEnums.DURABLE.value
+
+class Tiered(VectorDBInterface):
+    """
+    Routes each collection by size: small ones are answered from an in-process
+    matrix hydrated from the durable backend, large ones by the durable backend.
+    
+    Routing is revalidated every revalidate_seconds against count_records of the
+    durable backend and the collection's index version, which every write through
+    this backend bumps in Redis, so all processes pick up a reindex. Without an
+    index version store, collections in memory are hydrated again on every
+    revalidation. All writes go to the durable backend.
+    
+    The memory tier holds at most max_memory_bytes of vectors and texts across
+    collections; the least recently used ones are dropped first.
+    """
+    def __init__(self, 
+                 durable_backend: VectorDBInterface, 
+                 distance_metric: str=None, 
+                 tier_threshold: int=20000, 
+                 revalidate_seconds: int=60, 
+                 cache_size: int=64, 
+                 max_memory_bytes: int=1024 * 1024 * 1024, 
+                 index_versions: IndexVersionStore=None, 
+                 *args, **kwargs):
+        
+        self.durable_backend = durable_backend
+        self.default_vector_size = durable_backend.default_vector_size
+        self.tier_threshold = tier_threshold
+        self.revalidate_seconds = revalidate_seconds
+        self.cache_size = cache_size
+        self.max_memory_bytes = max_memory_bytes
+        self.index_versions = index_versions
+        self.logger = logging.getLogger('uvicorn')
+        
+        # exact scoring supports the same metrics as the NumPy backend
+        metrics_map = get_distance_metrics(vectordb_type=VectorDBEnums.NUMPY.value)
+        self.distance_metric = metrics_map.get(distance_metric or DistanceMetricEnums.COSINE.value)
+        if self.distance_metric is None:
+            self.logger.warning(f"Distance metric {distance_metric} cannot be served in memory; all collections stay durable.")
+        
+        # collection_name -> TierState, least recently used first
+        self._states = OrderedDict()
+        self._locks = defaultdict(asyncio.Lock)
+    
+    async def connect(self):
+        await self.durable_backend.connect()
+    
+    async def disconnect(self):
+        self._states = OrderedDict()
+        if self.index_versions:
+            await self.index_versions.close()
+        await self.durable_backend.disconnect()
+    
+    def invalidate(self, collection_name: str):
+        self._states.pop(collection_name, None)
+    
+    async def _mark_written(self, collection_name: str):
+        """Drops the local state and moves every other process to a new index version."""
+        self.invalidate(collection_name)
+        if self.index_versions:
+            await self.index_versions.bump(collection_name)
+    
+    async def _get_index_version(self, collection_name: str) -> Optional[int]:
+        if self.index_versions is None:
+            return None
+        return await self.index_versions.get_version(collection_name)
+    
+    def _evict(self, keep_collection: str):
+        """Drops the least recently used states past cache_size or the memory budget."""
+        memory_bytes = sum(state.size_bytes for state in self._states.values())
+        for collection_name in list(self._states):
+            if len(self._states) <= self.cache_size and memory_bytes <= self.max_memory_bytes:
+                break
+            if collection_name == keep_collection:
+                continue
+            
+            memory_bytes -= self._states.pop(collection_name).size_bytes
+    
+    async def _hydrate(self, collection_name: str) -> Optional[Tuple[np.ndarray, List[str], List[dict], list]]:
+        vectors, texts, metadatas, record_ids = [], [], [], []
+        offset = None
+        
+        while True:
+            records, offset = await self.durable_backend.scroll(
+                collection_name=collection_name,
+                batch_size=HYDRATION_BATCH_SIZE,
+                offset=offset
+            )
+            vectors.extend(record.vector for record in records)
+            texts.extend(record.text for record in records)
+            metadatas.extend(record.metadata for record in records)
+            record_ids.extend(record.record_id for record in records)
+            
+            if len(texts) > self.tier_threshold:
+                # grew past the threshold since it was counted
+                return None
+            if offset is None:
+                break
+        
+        if not texts:
+            return None
+        return prepare_vectors(vectors, self.distance_metric), texts, metadatas, record_ids
+    
+    async def get_tier_state(self, collection_name: str) -> TierState:
+        """Route a collection, promoting or demoting it when its record count or index version moved."""
+        state = self._states.get(collection_name)
+        if state and time.monotonic() - state.checked_at < self.revalidate_seconds:
+            self._states.move_to_end(collection_name)
+            return state
+        
+        async with self._locks[collection_name]:
+            state = self._states.get(collection_name)
+            if state and time.monotonic() - state.checked_at < self.revalidate_seconds:
+                return state
+            
+            # read before hydrating, so a write during hydration is picked up on the next revalidation
+            index_version = await self._get_index_version(collection_name)
+            record_count = await self.durable_backend.count_records(collection_name=collection_name)
+            
+            is_in_memory = self.distance_metric and 0 < record_count <= self.tier_threshold
+            if (state and state.record_count == record_count
+                and (not is_in_memory or (index_version is not None and state.index_version == index_version))):
+                state.checked_at = time.monotonic()
+                return state
+            
+            vectors, texts, metadatas, record_ids = None, None, None, None
+            if is_in_memory:
+                hydrated = await self._hydrate(collection_name)
+                if hydrated:
+                    vectors, texts, metadatas, record_ids = hydrated
+                if vectors is not None and vectors.nbytes > self.max_memory_bytes:
+                    self.logger.warning(f"Collection: {collection_name} does not fit the memory tier budget.")
+                    vectors, texts, metadatas, record_ids = None, None, None, None
+            
+            new_state = TierState(
+                record_count=record_count,
+                checked_at=time.monotonic(),
+                index_version=index_version,
+                vectors=vectors,
+                texts=texts,
+                metadatas=metadatas,
+                record_ids=record_ids
+            )
+            if state is None or state.tier != new_state.tier:
+                self.logger.info(f"Collection: {collection_name} served from the {new_state.tier} tier ({record_count} records)")
+            
+            self._states[collection_name] = new_state
+            self._states.move_to_end(collection_name)
+            self._evict(keep_collection=collection_name)
+            
+            return new_state
+    
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return await self.durable_backend.is_collection_existed(collection_name=collection_name)
+    
+    async def list_collections(self) -> List:
+        return await self.durable_backend.list_collections()
+    
+    async def get_collection_info(self, collection_name: str, exact: bool=False) -> dict:
+        collection_info = await self.durable_backend.get_collection_info(collection_name=collection_name, exact=exact)
+        if collection_info is None:
+            return None
+        
+        if exact:
+            self.invalidate(collection_name)
+        state = await self.get_tier_state(collection_name)
+        collection_info["tier"] = state.tier
+        return collection_info
+    
+    async def count_records(self, collection_name: str, exact: bool=False) -> int:
+        return await self.durable_backend.count_records(collection_name=collection_name, exact=exact)
+    
+    async def delete_collection(self, collection_name: str):
+        self.invalidate(collection_name)
+        is_deleted = await self.durable_backend.delete_collection(collection_name=collection_name)
+        await self._mark_written(collection_name)
+        return is_deleted
+    
+    async def create_collection(self, 
+                          collection_name: str, 
+                          embedding_size: int, 
+                          do_reset: bool=False):
+        if do_reset:
+            self.invalidate(collection_name)
+        is_created = await self.durable_backend.create_collection(
+            collection_name=collection_name,
+            embedding_size=embedding_size,
+            do_reset=do_reset
+        )
+        if do_reset:
+            await self._mark_written(collection_name)
+        return is_created
+    
+    async def insert_one(self, 
+                   collection_name: str, 
+                   text: str, 
+                   vector: list, 
+                   metadata: dict=None, 
+                   record_id: str=None):
+        
+        is_inserted = await self.durable_backend.insert_one(
+            collection_name=collection_name,
+            text=text,
+            vector=vector,
+            metadata=metadata,
+            record_id=record_id
+        )
+        await self._mark_written(collection_name)
+        return is_inserted
+    
+    async def insert_many(self, 
+                    collection_name: str, 
+                    texts: list, 
+                    vectors: list, 
+                    metadatas: list=None, 
+                    record_ids: list=None, 
+                    batch_size: int=50):
+        
+        is_inserted = await self.durable_backend.insert_many(
+            collection_name=collection_name,
+            texts=texts,
+            vectors=vectors,
+            metadatas=metadatas,
+            record_ids=record_ids,
+            batch_size=batch_size
+        )
+        await self._mark_written(collection_name)
+        return is_inserted
+    
+    def _search_memory(self, 
+                       state: TierState, 
+                       queries: np.ndarray, 
+                       top_k: int, 
+                       filters: dict=None, 
+                       with_vectors: bool=False) -> List[List[RetrievedDocument]]:
+        excluded = None
+        if filters:
+            excluded = np.array([not match_metadata_filters(metadata, filters) for metadata in state.metadatas])
+        
+        positions, scores = exact_top_k(
+            vectors=state.vectors,
+            queries=queries,
+            top_k=top_k,
+            distance_metric=self.distance_metric,
+            excluded=excluded
+        )
+        return [
+            [
+                RetrievedDocument(
+                    text=state.texts[position],
+                    score=float(score),
+                    metadata=state.metadatas[position],
+                    record_id=state.record_ids[position],
+                    vector=state.vectors[position].tolist() if with_vectors else None
+                ) for position, score in zip(query_positions, query_scores) if np.isfinite(score)
+            ] for query_positions, query_scores in zip(positions, scores)
+        ]
+    
+    async def search_by_vector(self, 
+                         collection_name: str, 
+                         query_vector: list, 
+                         top_k: int=5, 
+                         filters: dict=None, 
+                         with_vectors: bool=False) -> List[RetrievedDocument]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        state = await self.get_tier_state(collection_name)
+        if state.vectors is None:
+            return await self.durable_backend.search_by_vector(
+                collection_name=collection_name,
+                query_vector=query_vector,
+                top_k=top_k,
+                filters=filters,
+                with_vectors=with_vectors
+            )
+        
+        results = self._search_memory(
+            state, prepare_vectors([query_vector], self.distance_metric), top_k, 
+            filters=filters, with_vectors=with_vectors)[0]
+        
+        if not results or len(results) == 0:
+            return None
+        
+        return results
+    
+    async def search_many(self, 
+                          collection_name: str, 
+                          query_vectors: List[list], 
+                          top_k: int=5, 
+                          filters: dict=None) -> List[List[RetrievedDocument]]:
+        
+        if not await self.is_collection_existed(collection_name):
+            self.logger.error(f"Cannot search Collection: {collection_name} does not exist.")
+            return []
+        
+        if not query_vectors:
+            return []
+        
+        state = await self.get_tier_state(collection_name)
+        if state.vectors is None:
+            return await self.durable_backend.search_many(
+                collection_name=collection_name,
+                query_vectors=query_vectors,
+                top_k=top_k,
+                filters=filters
+            )
+        
+        return self._search_memory(state, prepare_vectors(query_vectors, self.distance_metric), top_k, filters=filters)
+    
+    async def search_hybrid(self, 
+                            collection_name: str, 
+                            query_vector: list, 
+                            query_text: str, 
+                            top_k: int=5, 
+                            filters: dict=None, 
+                            with_vectors: bool=False) -> List[RetrievedDocument]:
+        # the lexical side needs the durable backend's text index
+        return await self.durable_backend.search_hybrid(
+            collection_name=collection_name,
+            query_vector=query_vector,
+            query_text=query_text,
+            top_k=top_k,
+            filters=filters,
+            with_vectors=with_vectors
+        )
+    
+    async def scroll(self, 
+                     collection_name: str, 
+                     batch_size: int=1000, 
+                     offset: Optional[Union[int, str]]=None) -> Tuple[List[VectorRecord], Optional[Union[int, str]]]:
+        return await self.durable_backend.scroll(
+            collection_name=collection_name,
+            batch_size=batch_size,
+            offset=offset
+        )
+    
+    async def start_bulk_load(self, collection_name: str):
+        self.invalidate(collection_name)
+        return await self.durable_backend.start_bulk_load(collection_name=collection_name)
+    
+    async def finish_bulk_load(self, collection_name: str, progress_callback=None):
+        is_finished = await self.durable_backend.finish_bulk_load(
+            collection_name=collection_name,
+            progress_callback=progress_callback
+        )
+        await self._mark_written(collection_name)
+        return is_finished
@@ -1,7 +1,15 @@
 from .Qdrant import Qdrant
 from .PgVector import PgVector
+from .Faiss import Faiss
+from .NumPy import NumPy
+from .Tiered import Tiered
+from .LanceDB import LanceDB
 
 __all__ = [
     "Qdrant",
     "PgVector",
+    "Faiss",
+    "NumPy",
+    "Tiered",
+    "LanceDB",
 ]
@@ -1,18 +1,34 @@
-from typing import Type, Dict, Union
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Type, Dict, Union, List, Tuple
 from .VectorDBEnums import (
     DistanceMetricEnums, 
     VectorDBEnums,
     PgVectorDistanceMetricEnums,
-    QdrantDistanceMetricEnums
+    QdrantDistanceMetricEnums,
+    FaissDistanceMetricEnums,
+    LanceDBDistanceMetricEnums,
+    TextSearchLanguageEnums
 )
+import numpy as np
 from qdrant_client import models
+from nltk.stem.snowball import SnowballStemmer
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# BM25 term-frequency saturation parameters (idf is applied by the backend)
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_AVG_DOC_LENGTH = 256
 
 def get_distance_metrics(vectordb_type: str) -> Dict[str, Union[Type[models.Distance], str]]:
     """
     Get distance metrics mapping for specified vector database.
     
     Args:
-        vectordb_type: Type of vector database ("QDRANT" or "PGVECTOR")
+        vectordb_type: Type of vector database ("QDRANT", "PGVECTOR", "FAISS", "NUMPY" or "LANCEDB")
         
     Returns:
         Dict mapping DistanceMetricEnums values to appropriate distance metrics
@@ -46,8 +62,194 @@ def get_distance_metrics(vectordb_type: str) -> Dict[str, Union[Type[models.Dist
             enum_value = enum_item.value
             if enum_value in pgvector_map:
                 mapping[enum_value] = pgvector_map[enum_value]
+    
+    elif vectordb_type == VectorDBEnums.FAISS.value:
+        # faiss indexes only support inner product and L2 across all index types
+        faiss_map = {
+            DistanceMetricEnums.COSINE.value: FaissDistanceMetricEnums.COSINE.value,
+            DistanceMetricEnums.DOT.value: FaissDistanceMetricEnums.DOT.value,
+            DistanceMetricEnums.EUCLIDEAN.value: FaissDistanceMetricEnums.EUCLIDEAN.value,
+        }
+        
+        for enum_item in DistanceMetricEnums:
+            enum_value = enum_item.value
+            if enum_value in faiss_map:
+                mapping[enum_value] = faiss_map[enum_value]
+    
+    elif vectordb_type == VectorDBEnums.NUMPY.value:
+        # scored directly with matrix products, so the generic names are kept
+        numpy_metrics = [
+            DistanceMetricEnums.COSINE.value,
+            DistanceMetricEnums.DOT.value,
+            DistanceMetricEnums.EUCLIDEAN.value,
+        ]
+        
+        for enum_value in numpy_metrics:
+            mapping[enum_value] = enum_value
+    
+    elif vectordb_type == VectorDBEnums.LANCEDB.value:
+        lancedb_map = {
+            DistanceMetricEnums.COSINE.value: LanceDBDistanceMetricEnums.COSINE.value,
+            DistanceMetricEnums.DOT.value: LanceDBDistanceMetricEnums.DOT.value,
+            DistanceMetricEnums.EUCLIDEAN.value: LanceDBDistanceMetricEnums.EUCLIDEAN.value,
+        }
+        
+        for enum_item in DistanceMetricEnums:
+            enum_value = enum_item.value
+            if enum_value in lancedb_map:
+                mapping[enum_value] = lancedb_map[enum_value]
         
     else:
         raise ValueError(f"Unsupported vector database type: {vectordb_type}")
     
     return mapping
+
+
+def get_text_search_language(language: str) -> str:
+    """
+    Map a template locale (e.g. "en", "ar") to a full-text search language.
+    
+    The returned name is valid both as a PostgreSQL text search config and
+    as an NLTK snowball stemmer language. Unknown locales map to "simple".
+    """
+    if not language:
+        return TextSearchLanguageEnums._DEFAULT.value
+    
+    language_enum = TextSearchLanguageEnums.__members__.get(language.upper())
+    if language_enum is None:
+        return TextSearchLanguageEnums._DEFAULT.value
+    
+    return language_enum.value
+
+
+@lru_cache(maxsize=None)
+def _get_stemmer(text_search_language: str):
+    if text_search_language == TextSearchLanguageEnums._DEFAULT.value:
+        return None
+    return SnowballStemmer(text_search_language)
+
+
+def tokenize_text(text: str, language: str = None) -> List[str]:
+    """Lowercase, split on word characters and stem with the locale stemmer."""
+    if not text:
+        return []
+    
+    stemmer = _get_stemmer(get_text_search_language(language))
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    
+    if stemmer is None:
+        return tokens
+    return [stemmer.stem(token) for token in tokens]
+
+
+def _token_index(token: str) -> int:
+    # crc32 is stable across processes, unlike the builtin hash()
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def build_sparse_vector(text: str, 
+                        language: str = None, 
+                        is_query: bool = False) -> Tuple[List[int], List[float]]:
+    """
+    Build a BM25-style sparse vector for the given text.
+    
+    Documents get saturated term frequencies; queries get a weight of 1.0
+    per unique term. The idf part is left to the backend (e.g. Qdrant's
+    IDF modifier), so the vectors stay valid as the collection grows.
+    
+    Returns:
+        (indices, values)
+    """
+    tokens = tokenize_text(text, language=language)
+    if not tokens:
+        return [], []
+    
+    weights: Dict[int, float] = {}
+    
+    if is_query:
+        for token in set(tokens):
+            weights[_token_index(token)] = 1.0
+    else:
+        doc_length = len(tokens)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_length / BM25_AVG_DOC_LENGTH)
+        for token, tf in Counter(tokens).items():
+            idx = _token_index(token)
+            weights[idx] = weights.get(idx, 0.0) + tf * (BM25_K1 + 1) / (tf + norm)
+    
+    indices = list(weights.keys())
+    return indices, [weights[i] for i in indices]
+
+
+def reciprocal_rank_fusion(ranked_lists: List[List[int]], 
+                           rrf_k: int = 60, 
+                           top_k: int = None) -> List[Tuple[int, float]]:
+    """
+    Fuse several ranked id lists with reciprocal rank fusion.
+    
+    Used by in-process backends; PgVector and Qdrant fuse on the server.
+    
+    Returns:
+        (id, score) pairs sorted by descending fused score
+    """
+    scores: Dict[int, float] = {}
+    for ranked_ids in ranked_lists:
+        for rank, record_id in enumerate(ranked_ids, start=1):
+            scores[record_id] = scores.get(record_id, 0.0) + 1.0 / (rrf_k + rank)
+    
+    fused = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return fused[:top_k] if top_k else fused
+
+
+def prepare_vectors(vectors: List[List[float]], distance_metric: str) -> np.ndarray:
+    """Contiguous float32 matrix, L2-normalized when scoring with cosine."""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if distance_metric == DistanceMetricEnums.COSINE.value:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+    return vectors
+
+
+def exact_top_k(vectors: np.ndarray, 
+                queries: np.ndarray, 
+                top_k: int, 
+                distance_metric: str, 
+                excluded: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every query against every row with a single matrix product.
+    
+    Both matrices come from prepare_vectors. Rows flagged in `excluded`
+    never make it into the results (their score is not finite).
+    
+    Returns:
+        (positions, scores) of shape (len(queries), k), best first; scores are
+        similarities, or distances for the euclidean metric
+    """
+    scores = queries @ vectors.T
+    if distance_metric == DistanceMetricEnums.EUCLIDEAN.value:
+        # -||x - q||^2, so that higher is better while selecting
+        scores = 2 * scores - np.einsum("ij,ij->i", vectors, vectors)[None, :] \
+            - np.einsum("ij,ij->i", queries, queries)[:, None]
+    if excluded is not None:
+        scores[:, excluded] = -np.inf
+    
+    k = min(top_k, vectors.shape[0])
+    positions = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, positions, axis=1)
+    
+    order = np.argsort(-top_scores, axis=1)
+    positions = np.take_along_axis(positions, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    
+    if distance_metric == DistanceMetricEnums.EUCLIDEAN.value:
+        top_scores = np.sqrt(np.maximum(0.0, -top_scores))
+    
+    return positions, top_scores
+
+
+def match_metadata_filters(metadata: dict, filters: dict) -> bool:
+    """Every filter key must be present in the metadata with an equal value."""
+    if not filters:
+        return True
+    
+    metadata = metadata or {}
+    return all(key in metadata and metadata[key] == value for key, value in filters.items())
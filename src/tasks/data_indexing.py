@@ -2,13 +2,18 @@ from celery_app import celery_app, get_setup_utils
 from helpers.config import get_settings
 import logging
 import asyncio
+import time
 
+from celery import states
 from tqdm.auto import tqdm
-from models import ModelFactory
 from controllers import NLPController
 from models.enums import ResponseMessage
 from helpers.utils import message_handler
 from utils.idempotency_manager import IdempotencyManager
+from utils.index_version import IndexVersionStore
+from utils.tracing import get_backend_name
+from utils.worker_metrics import CHUNKS_INDEXED
+from utils.task_progress import TaskProgressReporter
 
 logger = logging.getLogger("celery.task")
 
@@ -24,10 +29,21 @@ async def _index_data(task_instance, project_id, do_reset):
     
     ctx = await get_setup_utils()
     settings = get_settings()
+    progress = TaskProgressReporter(
+        channel=ctx.task_progress,
+        task_id=task_instance.request.id,
+        task_name=task_instance.name,
+        stage="indexing"
+    )
+    idempotency_manager = None
+    task_record_id = None
+    bulk_load_collection = None
     
     try:
         # Idempotency check
-        idempotency_manager = IdempotencyManager(db_client=ctx.db_client, db_engine=ctx.db_engine, db_type=ctx.DB_TYPE)
+        idempotency_manager = IdempotencyManager(db_client=ctx.db_client, db_engine=ctx.db_engine, db_type=ctx.DB_TYPE, 
+                                                 lease_store=ctx.lease_store, write_behind=True, 
+                                                 flush_interval=settings.IDEMPOTENCY_FLUSH_INTERVAL_SECONDS)
         task_args = {
             "project_id": project_id,
             "do_reset": do_reset
@@ -69,10 +85,7 @@ async def _index_data(task_instance, project_id, do_reset):
             status='STARTED'
         )
         
-        project_model = await ModelFactory.create_project_model(
-            db_type=ctx.DB_TYPE,
-            db_client=ctx.db_client
-        )
+        project_model = ctx.project_model
     
         project = await project_model.get_project_or_create_one(project_id=project_id)
         
@@ -88,10 +101,7 @@ async def _index_data(task_instance, project_id, do_reset):
             )
             raise Exception(f"Project with ID {project_id} not found for indexing.")
         
-        chunk_model = await ModelFactory.create_chunk_model(
-            db_type=ctx.DB_TYPE,
-            db_client=ctx.db_client
-        )
+        chunk_model = ctx.chunk_model
         
         nlp_controller = NLPController(
             vectordb_client=ctx.vectordb_client,
@@ -108,6 +118,12 @@ async def _index_data(task_instance, project_id, do_reset):
             do_reset=do_reset
         )
         
+        # defer vector index maintenance to a single build once every chunk is loaded
+        is_bulk_load = settings.VECTOR_DB_BULK_LOAD
+        if is_bulk_load:
+            await ctx.vectordb_client.start_bulk_load(collection_name=collection_name)
+            bulk_load_collection = collection_name
+        
         pg_num = 1
         pg_size = 50
         inserted_count = 0
@@ -122,6 +138,9 @@ async def _index_data(task_instance, project_id, do_reset):
             position=0,
         )
         
+        chunks_indexed = CHUNKS_INDEXED.labels(task=task_instance.name, backend=get_backend_name(ctx.vectordb_client))
+        indexing_start = time.perf_counter()
+        
         while True:
             paged_chunks = await chunk_model.get_project_chunks(project_id=project.project_id, page=pg_num, page_size=pg_size)
             
@@ -152,11 +171,27 @@ async def _index_data(task_instance, project_id, do_reset):
                 raise Exception(f"VectorDB indexing failed for project_id {project_id}")
             
             pbar.update(len(paged_chunks))
+            chunks_indexed.inc(len(paged_chunks))
+            await progress.update(processed=inserted_count + len(paged_chunks), total=total_chunks_count)
             inserted_count += len(paged_chunks)
             idx += len(paged_chunks)
             pg_num += 1
             is_first_batch = False
         
+        indexing_time = time.perf_counter() - indexing_start
+        logger.info(f"Indexed {inserted_count} chunks of project_id {project_id} in {indexing_time:.2f}s "
+                    f"({inserted_count / indexing_time if indexing_time else 0:.1f} chunks/s)")
+        
+        if is_bulk_load:
+            bulk_load_collection = None
+            await ctx.vectordb_client.finish_bulk_load(
+                collection_name=collection_name,
+                progress_callback=lambda progress: task_instance.update_state(
+                    state="PROGRESS",
+                    meta={"stage": "vector_index_build", "progress": progress}
+                )
+            )
+        
         message = message_handler(
             ResponseMessage.VECTOR_DB_INDEXING_SUCCESS.value.format(project_id=project_id), 
             inserted_count=inserted_count
@@ -173,6 +208,11 @@ async def _index_data(task_instance, project_id, do_reset):
             result=message
         )
         
+        # answers cached from the previous index are no longer read
+        await bump_index_version(settings=settings, collection_name=collection_name)
+        
+        await progress.finish(state=states.SUCCESS)
+        
         return message
 
     
@@ -182,13 +222,52 @@ async def _index_data(task_instance, project_id, do_reset):
             state="FAILURE", 
             meta={"error": str(e)}
         )
+        
+        # the stream stays open while the task is retried
+        will_retry = task_instance.request.retries < task_instance.max_retries
+        await progress.finish(state=states.RETRY if will_retry else states.FAILURE, error=str(e))
+        
+        # identical requests keep attaching to this job until its last retry failed
+        if task_record_id:
+            await idempotency_manager.update_task_status(
+                execution_id=task_record_id,
+                status=states.RETRY if will_retry else states.FAILURE,
+                result={"error": str(e)}
+            )
         raise e
     
     finally:
+            if bulk_load_collection:
+                # the chunks loaded before the failure are searched through the vector index
+                try:
+                    await ctx.vectordb_client.finish_bulk_load(collection_name=bulk_load_collection)
+                except Exception as bulk_load_error:
+                    logger.error(f"Failed to finish the bulk load of {bulk_load_collection}: {str(bulk_load_error)}")
+            
             try:
+                # pending task records are written before the database engine is disposed
+                if idempotency_manager:
+                    await idempotency_manager.close()
                 if ctx.db_engine:
                     await ctx.db_engine.dispose()
                 if ctx.vectordb_client:
                     await ctx.vectordb_client.disconnect()
+                if ctx.task_progress:
+                    await ctx.task_progress.close()
+                if ctx.lease_store:
+                    await ctx.lease_store.close()
             except Exception as cleanup_error:
                 logger.error(f"Error during cleanup: {str(cleanup_error)}")
+
+async def bump_index_version(settings, collection_name):
+    """Answers and responses cached by the server processes were generated from the previous index."""
+    redis_url = settings.INDEX_VERSION_REDIS_URL or settings.CELERY_RESULT_BACKEND
+    if not redis_url:
+        return
+    
+    index_versions = IndexVersionStore(redis_url=redis_url)
+    try:
+        index_version = await index_versions.bump(collection_name)
+        logger.info(f"Collection {collection_name} moved to index version {index_version}")
+    finally:
+        await index_versions.close()
@@ -3,13 +3,15 @@ from helpers.config import get_settings
 import logging
 import asyncio
 
+from celery import states
 from fastapi import status
 from controllers import ProcessController, NLPController
 from helpers.utils import message_handler
 from models.db_schemas.SchemaFactory import SchemaFactory
 from models.enums import ResponseMessage, AssetTypeEnum
-from models import ModelFactory
 from utils.idempotency_manager import IdempotencyManager
+from utils.worker_metrics import CHUNKS_PROCESSED
+from utils.task_progress import TaskProgressReporter
 
 logger = logging.getLogger("celery.task")
 
@@ -22,12 +24,24 @@ def process_data(self, project_id, asset_name, chunk_size, overlap_size, do_rese
     return asyncio.run(_process_data(self, project_id, asset_name, chunk_size, overlap_size, do_reset))
 
 async def _process_data(task_instance, project_id, asset_name, chunk_size, overlap_size, do_reset):
+    progress = None
+    idempotency_manager = None
+    task_record_id = None
     try:
         # Access Celery context for connections
         ctx = await get_setup_utils()
         settings = get_settings()
+        progress = TaskProgressReporter(
+            channel=ctx.task_progress,
+            task_id=task_instance.request.id,
+            task_name=task_instance.name,
+            stage="processing",
+            unit="file"
+        )
         
-        idempotency_manager = IdempotencyManager(db_client=ctx.db_client, db_engine=ctx.db_engine, db_type=ctx.DB_TYPE)
+        idempotency_manager = IdempotencyManager(db_client=ctx.db_client, db_engine=ctx.db_engine, db_type=ctx.DB_TYPE, 
+                                                 lease_store=ctx.lease_store, write_behind=True, 
+                                                 flush_interval=settings.IDEMPOTENCY_FLUSH_INTERVAL_SECONDS)
         task_args = {
             "project_id": project_id,
             "asset_name": asset_name,
@@ -72,15 +86,8 @@ async def _process_data(task_instance, project_id, asset_name, chunk_size, overl
             status='STARTED'
         )
     
-        project_model = await ModelFactory.create_project_model(
-            db_type=settings.DB_TYPE,
-            db_client=ctx.db_client
-        )
-        
-        asset_model = await ModelFactory.create_asset_model(
-            db_type=settings.DB_TYPE,
-            db_client=ctx.db_client
-        )
+        project_model = ctx.project_model
+        asset_model = ctx.asset_model
         
         project = await project_model.get_project_or_create_one(project_id=project_id)
         process_controller = ProcessController(project_id)
@@ -148,10 +155,7 @@ async def _process_data(task_instance, project_id, asset_name, chunk_size, overl
 
         # project_files_names = list(map(lambda x: x.asset_name, project_files))
 
-        chunk_model = await ModelFactory.create_chunk_model(
-                db_type=settings.DB_TYPE,
-                db_client=ctx.db_client
-            )
+        chunk_model = ctx.chunk_model
             
         if do_reset == 1:
             collection_name = nlp_controller.generate_collection_name(project.project_id)
@@ -201,11 +205,15 @@ async def _process_data(task_instance, project_id, asset_name, chunk_size, overl
                 ) for i, chunk in enumerate(file_chunks)
             ]
             
-            no_records += await chunk_model.insert_many_chunks(file_chunks_records)
+            inserted_records = await chunk_model.insert_many_chunks(file_chunks_records)
+            CHUNKS_PROCESSED.labels(task=task_instance.name).inc(inserted_records)
+            no_records += inserted_records
             
             no_files += 1
             files_names.append(asset_name)
             all_file_chunks.append(file_chunks)
+            
+            await progress.update(processed=idx + 1, total=len(project_files), records_count=no_records)
         
         if len(warnings['content']) > 0:
             warnings['count'] = len(warnings['content'])
@@ -231,6 +239,8 @@ async def _process_data(task_instance, project_id, asset_name, chunk_size, overl
             result=message
         )
         
+        await progress.finish(state=states.SUCCESS, records_count=no_records)
+        
         return message
     except Exception as e:
         logger.error(f"Error in processing data: {str(e)}")
@@ -242,14 +252,34 @@ async def _process_data(task_instance, project_id, asset_name, chunk_size, overl
                 )
             )
         )
+        
+        # the stream stays open while the task is retried
+        will_retry = task_instance.request.retries < task_instance.max_retries
+        if progress:
+            await progress.finish(state=states.RETRY if will_retry else states.FAILURE, error=str(e))
+        
+        # identical requests keep attaching to this job until its last retry failed
+        if task_record_id:
+            await idempotency_manager.update_task_status(
+                execution_id=task_record_id,
+                status=states.RETRY if will_retry else states.FAILURE,
+                result={"error": str(e)}
+            )
         raise e
     
     finally:
         try:
+            # pending task records are written before the database engine is disposed
+            if idempotency_manager:
+                await idempotency_manager.close()
             if ctx.db_engine:
                 await ctx.db_engine.dispose()
             if ctx.vectordb_client:
                 await ctx.vectordb_client.disconnect()
+            if ctx.task_progress:
+                await ctx.task_progress.close()
+            if ctx.lease_store:
+                await ctx.lease_store.close()
         except Exception as cleanup_error:
             logger.error(f"Error during cleanup: {str(cleanup_error)}")
 
@@ -0,0 +1,165 @@
+from celery_app import celery_app, get_setup_utils
+from helpers.config import get_settings
+import logging
+import asyncio
+
+from celery import states
+from celery.exceptions import Ignore
+from stores import VectorDBFactory
+from controllers import VectorMigrationController
+from utils.idempotency_manager import IdempotencyManager
+
+logger = logging.getLogger("celery.task")
+
+@celery_app.task(bind=True,
+                name="tasks.vector_migration.migrate_vectors",
+                autoretry_for=(Exception,),
+                retry_kwargs={'max_retries': 3, 'countdown': 60}
+            )
+def migrate_vectors(self, source_backend, target_backend, project_ids=None, batch_size=1000, do_reset=False):
+    return asyncio.run(_migrate_vectors(self, source_backend, target_backend, project_ids, batch_size, do_reset))
+
+async def _migrate_vectors(task_instance, source_backend, target_backend, project_ids, batch_size, do_reset):
+    
+    # vectors are copied as stored, so the llm clients are not needed
+    ctx = await get_setup_utils(with_llm_clients=False)
+    settings = get_settings()
+    source_client, target_client = None, None
+    idempotency_manager = None
+    task_record_id = None
+    
+    try:
+        if source_backend == target_backend:
+            raise ValueError("Source and target vector db backends must differ.")
+        
+        idempotency_manager = IdempotencyManager(db_client=ctx.db_client, db_engine=ctx.db_engine, db_type=ctx.DB_TYPE, 
+                                                 lease_store=ctx.lease_store, write_behind=True, 
+                                                 flush_interval=settings.IDEMPOTENCY_FLUSH_INTERVAL_SECONDS)
+        task_args = {
+            "source_backend": source_backend,
+            "target_backend": target_backend,
+            "project_ids": project_ids,
+            "do_reset": do_reset
+        }
+        task_name = "tasks.vector_migration.migrate_vectors"
+        
+        should_execute, existing_task = await idempotency_manager.should_execute_task(
+            task_name=task_name,
+            task_args=task_args,
+            task_id=task_instance.request.id,
+            task_time_limit=settings.CELERY_TASK_TIME_LIMIT
+        )
+        
+        if not should_execute:
+            logger.warning(f"Can not handle the task | status: {existing_task.status}")
+            return existing_task.result
+        
+        if existing_task:
+            await idempotency_manager.update_task_status(
+                execution_id=idempotency_manager.get_task_record_id(existing_task),
+                status='PENDING'
+            )
+            task_record = existing_task
+        else:
+            task_record = await idempotency_manager.create_task_record(
+                task_name=task_name,
+                task_args=task_args,
+                task_id=task_instance.request.id
+            )
+        
+        task_record_id = idempotency_manager.get_task_record_id(task_record)
+        
+        await idempotency_manager.update_task_status(
+            execution_id=task_record_id,
+            status='STARTED'
+        )
+        
+        vectordb_factory = VectorDBFactory(settings=settings, db_client=ctx.pg_session_factory)
+        source_client, target_client = [
+            # reuse the connected client of the active backend (local qdrant storage allows one client)
+            ctx.vectordb_client if backend == settings.VECTOR_DB_BACKEND
+            else vectordb_factory.create(provider_cls=backend)
+            for backend in (source_backend, target_backend)
+        ]
+        if not source_client or not target_client:
+            raise ValueError(f"Invalid vector db backend: {source_backend if not source_client else target_backend}")
+        
+        for vectordb_client in (source_client, target_client):
+            if vectordb_client is not ctx.vectordb_client:
+                await vectordb_client.connect()
+        
+        if not project_ids:
+            project_model = ctx.project_model
+            project_ids = await VectorMigrationController.get_all_project_ids(project_model)
+        
+        migration_controller = VectorMigrationController(source_client=source_client, target_client=target_client)
+        reports = await migration_controller.migrate_projects(
+            project_ids=project_ids,
+            batch_size=batch_size,
+            do_reset=do_reset,
+            progress_callback=lambda report: task_instance.update_state(
+                state="PROGRESS",
+                meta={"stage": "vector_migration", "progress": report}
+            )
+        )
+        
+        result = {
+            "source_backend": source_backend,
+            "target_backend": target_backend,
+            "migrated_count": sum(report["migrated_count"] for report in reports),
+            "verified": all(report["verified"] for report in reports),
+            "collections": reports
+        }
+        status = 'SUCCESS' if result["verified"] else 'FAILURE'
+        
+        task_instance.update_state(
+            state=status,
+            meta=result
+        )
+        
+        await idempotency_manager.update_task_status(
+            execution_id=task_record_id,
+            status=status,
+            result=result
+        )
+        
+        if not result["verified"]:
+            # returning would let celery overwrite the FAILURE state with SUCCESS
+            raise Ignore()
+        
+        return result
+    
+    except Ignore:
+        raise
+    
+    except Exception as e:
+        logger.error(f"Error in migrate_vectors task from {source_backend} to {target_backend}: {str(e)}")
+        task_instance.update_state(
+            state="FAILURE",
+            meta={"error": str(e)}
+        )
+        
+        # identical requests keep attaching to this job until its last retry failed
+        if task_record_id:
+            will_retry = task_instance.request.retries < task_instance.max_retries
+            await idempotency_manager.update_task_status(
+                execution_id=task_record_id,
+                status=states.RETRY if will_retry else states.FAILURE,
+                result={"error": str(e)}
+            )
+        raise e
+    
+    finally:
+        try:
+            # pending task records are written before the database engine is disposed
+            if idempotency_manager:
+                await idempotency_manager.close()
+            for vectordb_client in {id(client): client for client in (source_client, target_client, ctx.vectordb_client)}.values():
+                if vectordb_client:
+                    await vectordb_client.disconnect()
+            if ctx.db_engine:
+                await ctx.db_engine.dispose()
+            if ctx.lease_store:
+                await ctx.lease_store.close()
+        except Exception as cleanup_error:
+            logger.error(f"Error during cleanup: {str(cleanup_error)}")
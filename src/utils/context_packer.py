@@ -0,0 +1,139 @@
+import re
+import zlib
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from models.db_schemas import RetrievedDocument
+from stores.llm.token_utils import approximate_token_count
+
+# MinHash permutations per document; the Jaccard estimate error is about 1 / sqrt(MINHASH_PERMUTATIONS)
+MINHASH_PERMUTATIONS = 128
+SHINGLE_SIZE = 3
+
+# chunks of the same asset share this metadata key (the loader's file path)
+ADJACENCY_METADATA_KEY = "source"
+
+_rng = np.random.default_rng(seed=42)
+_HASH_A = _rng.integers(1, np.iinfo(np.uint64).max, size=MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, np.iinfo(np.uint64).max, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+class ContextPacker:
+    """
+    Prepares retrieved chunks for the prompt:
+    
+    1. drops near-duplicates (MinHash over word shingles, best ranked copy kept)
+    2. merges chunks that were consecutive in the same asset into one document
+    3. keeps documents, best first, while they fit the token budget
+    """
+    def __init__(self, 
+                 dedup_threshold: float=0.8, 
+                 merge_adjacent: bool=True, 
+                 token_counter: Callable[[str], int]=None):
+        
+        self.dedup_threshold = dedup_threshold
+        self.merge_adjacent = merge_adjacent
+        self.token_counter = token_counter or approximate_token_count
+    
+    def pack(self, documents: List[RetrievedDocument], token_budget: int) -> List[RetrievedDocument]:
+        documents = self.deduplicate(documents)
+        if self.merge_adjacent:
+            documents = self.merge_adjacent_chunks(documents)
+        return self.fit_budget(documents, token_budget=token_budget)
+    
+    def _signature(self, text: str) -> np.ndarray:
+        words = re.findall(r"\w+", text.lower())
+        shingles = {
+            " ".join(words[i: i + SHINGLE_SIZE])
+            for i in range(max(1, len(words) - SHINGLE_SIZE + 1))
+        }
+        hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+        
+        # one multiply-shift hash per permutation, uint64 arithmetic wraps around on purpose
+        with np.errstate(over="ignore"):
+            permuted = (_HASH_A[:, None] * hashes[None, :] + _HASH_B[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1)
+    
+    def deduplicate(self, documents: List[RetrievedDocument]) -> List[RetrievedDocument]:
+        if len(documents) <= 1 or self.dedup_threshold >= 1:
+            return documents
+        
+        kept, kept_signatures = [], []
+        for document in documents:
+            signature = self._signature(document.text)
+            if kept_signatures:
+                similarity = (np.asarray(kept_signatures) == signature).mean(axis=1).max()
+                if similarity >= self.dedup_threshold:
+                    continue
+            
+            kept.append(document)
+            kept_signatures.append(signature)
+        
+        return kept
+    
+    def _chunk_position(self, document: RetrievedDocument) -> Optional[int]:
+        # chunk ids are assigned in order while an asset is processed
+        try:
+            return int(document.record_id)
+        except (TypeError, ValueError):
+            return None
+    
+    def merge_adjacent_chunks(self, documents: List[RetrievedDocument]) -> List[RetrievedDocument]:
+        groups = {}
+        merged = []
+        for document in documents:
+            source = (document.metadata or {}).get(ADJACENCY_METADATA_KEY)
+            position = self._chunk_position(document)
+            if source is None or position is None:
+                merged.append([document])
+                continue
+            
+            groups.setdefault(source, []).append((position, document))
+        
+        for chunks in groups.values():
+            chunks.sort(key=lambda chunk: chunk[0])
+            run = [chunks[0]]
+            for chunk in chunks[1:]:
+                if chunk[0] == run[-1][0] + 1:
+                    run.append(chunk)
+                    continue
+                merged.append([document for _, document in run])
+                run = [chunk]
+            merged.append([document for _, document in run])
+        
+        documents = [
+            run[0] if len(run) == 1 else RetrievedDocument(
+                text="\n".join(document.text.strip() for document in run),
+                score=max(document.score for document in run),
+                metadata=run[0].metadata,
+                record_id=run[0].record_id
+            ) for run in merged
+        ]
+        return sorted(documents, key=lambda document: document.score, reverse=True)
+    
+    def fit_budget(self, documents: List[RetrievedDocument], token_budget: int) -> List[RetrievedDocument]:
+        packed = []
+        remaining_tokens = token_budget
+        if remaining_tokens <= 0:
+            return packed
+        
+        for document in documents:
+            tokens_count = self.token_counter(document.text)
+            if tokens_count <= remaining_tokens:
+                packed.append(document)
+                remaining_tokens -= tokens_count
+                continue
+            
+            if not packed:
+                # the best document alone is over budget, keep its head rather than nothing
+                keep_chars = int(len(document.text) * remaining_tokens / tokens_count)
+                packed.append(RetrievedDocument(
+                    text=document.text[:keep_chars],
+                    score=document.score,
+                    metadata=document.metadata,
+                    record_id=document.record_id
+                ))
+                break
+        
+        return packed
@@ -1,26 +1,67 @@
+import asyncio
 import hashlib
 import json
+import logging
+import uuid
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import select, delete
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from models.enums import DatabaseType
 from models.db_schemas import (
     CeleryTaskExecutionMongo, 
     CeleryTaskExecution as CeleryTaskExecutionPG
 )
+from utils.task_lease import TaskLeaseStore
+
+logger = logging.getLogger("celery.task")
 
 class IdempotencyManager:
+    
+    # databases whose collection indexes were checked by this process
+    _initialized_databases = set()
 
-    def __init__(self, db_client, db_engine, db_type: str = "postgres"):
+    def __init__(self, db_client, db_engine, db_type: str = "postgres", 
+                 lease_store: TaskLeaseStore = None, 
+                 write_behind: bool = False, 
+                 flush_interval: float = 1.0):
+        """
+        With a lease_store, a running job holds a Redis lease that the task state
+        is checked against, instead of the database records. With write_behind
+        too, the records are written asynchronously, in batches every
+        flush_interval seconds and on close.
+        """
         self.db_client = db_client
         self.db_engine = db_engine
         self.db_type = db_type
         self.collection = None
         self.counters_collection = None
+        
+        self.lease_store = lease_store
+        self.write_behind = write_behind and lease_store is not None
+        self.flush_interval = flush_interval
+        
+        # lease held by this task run: (args_hash, task_id), and its renewal
+        self._lease = None
+        self._lease_keeper = None
+        
+        # task_id -> fields only written when the record is created, and pending updates
+        self._records = {}
+        self._pending_writes = {}
+        # task_ids that ended in this run, their in-flight keys are released on close
+        self._completed_task_ids = set()
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
 
     def get_task_record_id(self, task_record):
         """Get the primary key ID from a task record, handling both DB types."""
         if task_record is None:
             return None
+        if self.write_behind:
+            # records written behind are updated by their celery task ID
+            return str(task_record.task_id)
         if self.db_type == DatabaseType.MONGODB.value:
             return task_record.id
         return task_record.execution_id
@@ -31,18 +72,25 @@ class IdempotencyManager:
             return
             
         collection_name = "celery_task_executions"
-        all_collections = await self.db_client.list_collection_names()
         self.collection = self.db_client[collection_name]
         self.counters_collection = self.db_client["counters"]
         
-        if collection_name not in all_collections:
-            indexes = CeleryTaskExecutionMongo.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["keys"],
-                    name=index["name"],
-                    unique=index.get("unique", False)
-                )
+        if self.db_client.name in IdempotencyManager._initialized_databases:
+            return
+        
+        # indexes added since the collection was created are created too
+        existing_indexes = await self.collection.index_information()
+        indexes = CeleryTaskExecutionMongo.get_indexes()
+        for index in indexes:
+            if index["name"] in existing_indexes:
+                continue
+            await self.collection.create_index(
+                index["keys"],
+                name=index["name"],
+                unique=index.get("unique", False),
+                sparse=index.get("sparse", False)
+            )
+        IdempotencyManager._initialized_databases.add(self.db_client.name)
 
     def create_args_hash(self, task_name: str, task_args: dict):
         combined_data = {
@@ -54,12 +102,16 @@ class IdempotencyManager:
     
     async def create_task_record(self, task_name: str, task_args: dict, task_id: str = None):
         """Create new task execution record."""
+        if self.write_behind:
+            return await self._create_task_record_behind(task_name, task_args, task_id)
         if self.db_type == DatabaseType.MONGODB.value:
             return await self._create_task_record_mongo(task_name, task_args, task_id)
         return await self._create_task_record_postgres(task_name, task_args, task_id)
     
     async def update_task_status(self, execution_id, status: str, result: dict = None):
         """Update task status and result."""
+        if self.write_behind:
+            return await self._update_task_status_behind(execution_id, status, result)
         if self.db_type == DatabaseType.MONGODB.value:
             return await self._update_task_status_mongo(execution_id, status, result)
         return await self._update_task_status_postgres(execution_id, status, result)
@@ -70,6 +122,111 @@ class IdempotencyManager:
             return await self._get_existing_task_mongo(task_name, task_args, task_id)
         return await self._get_existing_task_postgres(task_name, task_args, task_id)
     
+    async def reserve_task(self, task_name: str, task_args: dict, 
+                           task_time_limit: int = 600, 
+                           task_queue_timeout: int = 21600) -> tuple[any, bool]:
+        """
+        Reserve a job before it is enqueued, so identical requests coalesce.
+        The reserved record holds a new task_id to enqueue the task with; while it
+        is in flight, requests with the same name and args get it back instead.
+        Args:
+            task_time_limit: Time limit in seconds after which a stuck job is replaced
+            task_queue_timeout: Time in seconds after which a job never started by a worker is replaced
+        Returns (task_record, is_reserved)
+        """
+        in_flight_key = self.create_args_hash(task_name, task_args)
+        
+        # a conflicting job can finish, or be found stuck, between the insert and the read
+        for _ in range(3):
+            task_record = await self.create_reserved_task_record(task_name, task_args, in_flight_key)
+            if task_record is not None:
+                return task_record, True
+            
+            in_flight_task = await self.get_in_flight_task(in_flight_key)
+            if in_flight_task is None:
+                continue
+            
+            if await self.is_in_flight_task_completed(in_flight_task):
+                # its record update was not written, the key is released here instead
+                await self.release_in_flight_keys([str(in_flight_task.task_id)])
+                continue
+            
+            if not await self.is_in_flight_task_stuck(in_flight_task, task_time_limit, task_queue_timeout):
+                return in_flight_task, False
+            
+            await self.update_task_status(
+                execution_id=self.get_task_record_id(in_flight_task),
+                status='FAILURE',
+                result={"message": "Task was stuck and replaced by a new run."}
+            )
+        
+        raise RuntimeError(f"Could not reserve task {task_name}: identical jobs keep conflicting.")
+    
+    async def get_in_flight_task(self, in_flight_key: str):
+        """Get the reserved job holding the in-flight key, if any."""
+        if self.db_type == DatabaseType.MONGODB.value:
+            return await self._get_in_flight_task_mongo(in_flight_key)
+        return await self._get_in_flight_task_postgres(in_flight_key)
+    
+    async def create_reserved_task_record(self, task_name: str, task_args: dict, in_flight_key: str):
+        """Insert a PENDING record holding the in-flight key; None when another job holds it."""
+        if self.db_type == DatabaseType.MONGODB.value:
+            return await self._reserve_task_record_mongo(task_name, task_args, in_flight_key)
+        return await self._reserve_task_record_postgres(task_name, task_args, in_flight_key)
+    
+    def _seconds_since(self, timestamp: datetime) -> float:
+        # Handle both timezone-aware and naive datetimes
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - timestamp).total_seconds()
+    
+    def is_task_stuck(self, task_record, task_time_limit: int = 600, 
+                      task_queue_timeout: int = None) -> bool:
+        """
+        A task running longer than its time limit plus a grace period is stuck.
+        With a task_queue_timeout, a reserved job that no worker started yet is
+        stuck once it waited that long in the queue.
+        """
+        if task_record.status == 'PENDING' and task_queue_timeout is not None:
+            # reserved jobs have no start time until a worker picks them up
+            queued_at = task_record.started_at or task_record.created_at
+            return queued_at is not None and self._seconds_since(queued_at) > task_queue_timeout
+        
+        if not task_record.started_at:
+            return False
+        
+        time_gap = 60  # 60 seconds grace period
+        return self._seconds_since(task_record.started_at) > (task_time_limit + time_gap)
+    
+    async def is_in_flight_task_completed(self, task_record) -> bool:
+        """With leases, the task state in Redis tells a job that ended before its record was updated."""
+        if self.lease_store is None:
+            return False
+        state = await self.lease_store.get_state(str(task_record.task_id))
+        return state is not None and state["status"] in ['SUCCESS', 'FAILURE']
+    
+    async def release_in_flight_keys(self, task_ids: list):
+        """Clear the in-flight keys of ended jobs, without touching the rest of their records."""
+        if not task_ids:
+            return
+        if self.db_type == DatabaseType.MONGODB.value:
+            return await self._release_in_flight_keys_mongo(task_ids)
+        return await self._release_in_flight_keys_postgres(task_ids)
+    
+    async def is_in_flight_task_stuck(self, task_record, task_time_limit: int = 600, 
+                                      task_queue_timeout: int = 21600) -> bool:
+        """
+        With leases, a started job is stuck once its lease expired, a job holding
+        one never is. Otherwise started jobs are stuck after the time limit, and
+        jobs still waiting in the queue after the much longer queue timeout.
+        """
+        if self.lease_store is not None:
+            if await self.lease_store.get_holder(task_record.task_args_hash) is not None:
+                return False
+            if task_record.status == 'STARTED':
+                return True
+        return self.is_task_stuck(task_record, task_time_limit, task_queue_timeout)
+    
     async def should_execute_task(self, task_name: str, task_args: dict,
                                   task_id: str, 
                                   task_time_limit: int = 600) -> tuple[bool, any]:
@@ -79,6 +236,9 @@ class IdempotencyManager:
             task_time_limit: Time limit in seconds after which a stuck task can be re-executed
         Returns (should_execute, existing_task_or_none)
         """
+        if self.lease_store is not None:
+            return await self._should_execute_task_leased(task_name, task_args, task_id)
+        
         existing_task = await self.get_existing_task(task_name, task_args, task_id)
         
         if not existing_task:
@@ -88,22 +248,58 @@ class IdempotencyManager:
         if existing_task.status == 'SUCCESS':
             return False, existing_task
             
+        # Reserved by the route and not started yet, or retried by celery under the same task ID
+        if existing_task.status in ['PENDING', 'RETRY']:
+            return True, existing_task
+        
         # Check if task is stuck (running longer than time limit + 60 seconds)
-        if existing_task.status in ['PENDING', 'STARTED', 'RETRY']:
-            if existing_task.started_at:
-                started_at = existing_task.started_at
-                # Handle both timezone-aware and naive datetimes
-                if started_at.tzinfo is None:
-                    started_at = started_at.replace(tzinfo=timezone.utc)
-                time_elapsed = (datetime.now(timezone.utc) - started_at).total_seconds()
-                time_gap = 60  # 60 seconds grace period
-                if time_elapsed > (task_time_limit + time_gap):
-                    return True, existing_task  # Task is stuck, allow re-execution
+        if existing_task.status == 'STARTED':
+            if self.is_task_stuck(existing_task, task_time_limit):
+                return True, existing_task  # Task is stuck, allow re-execution
             return False, existing_task  # Task is still running within time limit
             
         # Re-execute if previous task failed
         return True, existing_task
     
+    async def flush(self):
+        """Write the pending record updates in one batch."""
+        async with self._flush_lock:
+            if not self._pending_writes:
+                return
+            pending_writes, self._pending_writes = self._pending_writes, {}
+            
+            try:
+                if self.db_type == DatabaseType.MONGODB.value:
+                    await self._flush_writes_mongo(pending_writes)
+                else:
+                    await self._flush_writes_postgres(pending_writes)
+            except Exception as e:
+                logger.error(f"Failed to write {len(pending_writes)} task records: {str(e)}")
+                # kept for the next batch, updates queued meanwhile win
+                for execution_id, write in pending_writes.items():
+                    self._pending_writes[execution_id] = {**write, **self._pending_writes.get(execution_id, {})}
+    
+    async def close(self):
+        """Write the pending records, then release the lease of this task run."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+        
+        # the batched record updates may have failed, identical requests must not keep attaching to this job
+        if self._completed_task_ids:
+            try:
+                await self.release_in_flight_keys(list(self._completed_task_ids))
+                self._completed_task_ids.clear()
+            except Exception as e:
+                logger.error(f"Failed to release the in-flight keys of {len(self._completed_task_ids)} tasks: {str(e)}")
+        
+        if self._lease_keeper:
+            self._lease_keeper.cancel()
+            self._lease_keeper = None
+        if self._lease:
+            await self.lease_store.release(*self._lease)
+            self._lease = None
+    
     async def cleanup_old_tasks(self, time_retention: int = 86400) -> int:
         """
         Delete old task records older than time_retention seconds.
@@ -158,6 +354,216 @@ class IdempotencyManager:
         task_record.id = result.inserted_id
         return task_record
 
+    async def _reserve_task_record_postgres(self, task_name: str, task_args: dict, in_flight_key: str) -> CeleryTaskExecutionPG:
+        """Insert a reserved task execution record in PostgreSQL."""
+        task_record = CeleryTaskExecutionPG(
+            task_name=task_name,
+            task_args_hash=self.create_args_hash(task_name, task_args),
+            in_flight_key=in_flight_key,
+            task_args=task_args,
+            task_id=uuid.uuid4(),
+            status='PENDING',
+            # set once a worker starts the job, NULL overrides the column default
+            started_at=None
+        )
+        
+        session = self.db_client()
+        try:
+            session.add(task_record)
+            await session.commit()
+            await session.refresh(task_record)
+            return task_record
+        except IntegrityError:
+            await session.rollback()
+            return None
+        finally:
+            await session.close()
+
+    async def _reserve_task_record_mongo(self, task_name: str, task_args: dict, in_flight_key: str) -> CeleryTaskExecutionMongo:
+        """Insert a reserved task execution record in MongoDB."""
+        await self.init_mongo_collection()
+        
+        task_record = CeleryTaskExecutionMongo(
+            task_name=task_name,
+            task_args_hash=self.create_args_hash(task_name, task_args),
+            in_flight_key=in_flight_key,
+            task_args=task_args,
+            task_id=str(uuid.uuid4()),
+            status='PENDING',
+            # set once a worker starts the job
+            started_at=None,
+            created_at=datetime.now(timezone.utc)
+        )
+        
+        try:
+            result = await self.collection.insert_one(task_record.model_dump(by_alias=True, exclude_unset=True))
+        except DuplicateKeyError:
+            return None
+        task_record.id = result.inserted_id
+        return task_record
+
+    async def _get_in_flight_task_postgres(self, in_flight_key: str) -> CeleryTaskExecutionPG:
+        """Get the reserved job holding the in-flight key in PostgreSQL."""
+        session = self.db_client()
+        try:
+            stmt = select(CeleryTaskExecutionPG).where(
+                CeleryTaskExecutionPG.in_flight_key == in_flight_key
+            )
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
+        finally:
+            await session.close()
+
+    async def _get_in_flight_task_mongo(self, in_flight_key: str) -> CeleryTaskExecutionMongo:
+        """Get the reserved job holding the in-flight key in MongoDB."""
+        await self.init_mongo_collection()
+        
+        record = await self.collection.find_one({"in_flight_key": in_flight_key})
+        if record:
+            return CeleryTaskExecutionMongo(**record)
+        return None
+
+    async def _should_execute_task_leased(self, task_name: str, task_args: dict, task_id: str) -> tuple[bool, any]:
+        """Check the task state and take the job's lease in Redis, without reading the records."""
+        state = await self.lease_store.get_state(task_id)
+        if state and state["status"] == 'SUCCESS':
+            return False, self._build_task_record(state)
+        
+        args_hash = self.create_args_hash(task_name, task_args)
+        holder = await self.lease_store.acquire(args_hash, task_id)
+        if holder is not None:
+            # an identical job, or a redelivery of this one, is still running
+            holder_state = await self.lease_store.get_state(holder) or {
+                "task_id": holder,
+                "task_name": task_name,
+                "task_args_hash": args_hash,
+                "status": 'STARTED'
+            }
+            return False, self._build_task_record(holder_state)
+        
+        self._lease = (args_hash, task_id)
+        self._lease_keeper = asyncio.create_task(self.lease_store.keep_alive(args_hash, task_id))
+        return True, None
+
+    def _build_task_record(self, fields: dict):
+        """Unsaved task record of the active DB type, from a Redis task state or pending fields."""
+        if self.db_type == DatabaseType.MONGODB.value:
+            return CeleryTaskExecutionMongo(**fields)
+        return CeleryTaskExecutionPG(**fields)
+
+    async def _create_task_record_behind(self, task_name: str, task_args: dict, task_id: str = None):
+        """Queue the creation of a task execution record."""
+        task_id = task_id or str(uuid.uuid4())
+        self._records[task_id] = {
+            "task_name": task_name,
+            "task_args_hash": self.create_args_hash(task_name, task_args),
+            "task_args": task_args,
+            "task_id": task_id
+        }
+        
+        await self._update_task_status_behind(task_id, 'PENDING')
+        return self._build_task_record({**self._records[task_id], "status": 'PENDING'})
+
+    async def _update_task_status_behind(self, execution_id: str, status: str, result: dict = None):
+        """Update the task state in Redis now, and queue the update of its record."""
+        now = datetime.now(timezone.utc)
+        write = self._pending_writes.setdefault(execution_id, {})
+        write["status"] = status
+        write["updated_at"] = now
+        if status == 'STARTED':
+            write["started_at"] = now
+        if result:
+            write["result"] = result
+        if status in ['SUCCESS', 'FAILURE']:
+            write["completed_at"] = now
+            self._completed_task_ids.add(execution_id)
+        
+        record_fields = self._records.get(execution_id, {})
+        await self.lease_store.set_state(execution_id, {
+            "task_id": execution_id,
+            "task_name": record_fields.get("task_name"),
+            "task_args_hash": record_fields.get("task_args_hash"),
+            "status": status,
+            "result": write.get("result")
+        })
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        # shielded, close cancels the wait but not a batch being written
+        await asyncio.shield(self.flush())
+
+    async def _flush_writes_postgres(self, pending_writes: dict):
+        """Upsert the pending records in PostgreSQL, in one transaction."""
+        session = self.db_client()
+        try:
+            for execution_id, write in pending_writes.items():
+                update_values = dict(write)
+                if write["status"] in ['SUCCESS', 'FAILURE']:
+                    update_values["in_flight_key"] = None
+                
+                if execution_id in self._records:
+                    # pending updates win over the creation fields, e.g. started_at
+                    stmt = pg_insert(CeleryTaskExecutionPG).values(
+                        **{**self._records[execution_id], **write}
+                    ).on_conflict_do_update(
+                        index_elements=[CeleryTaskExecutionPG.task_id],
+                        set_=update_values
+                    )
+                else:
+                    stmt = update(CeleryTaskExecutionPG).where(
+                        CeleryTaskExecutionPG.task_id == execution_id
+                    ).values(**update_values)
+                await session.execute(stmt)
+            await session.commit()
+        finally:
+            await session.close()
+
+    async def _flush_writes_mongo(self, pending_writes: dict):
+        """Upsert the pending records in MongoDB, in one bulk write."""
+        await self.init_mongo_collection()
+        
+        operations = []
+        for execution_id, write in pending_writes.items():
+            update_query = {"$set": dict(write)}
+            if write["status"] in ['SUCCESS', 'FAILURE']:
+                update_query["$unset"] = {"in_flight_key": ""}
+            
+            is_new = execution_id in self._records
+            if is_new:
+                # mongo rejects a path named by both $set and $setOnInsert
+                update_query["$setOnInsert"] = {
+                    key: value for key, value in self._records[execution_id].items() if key not in write
+                }
+                update_query["$setOnInsert"]["created_at"] = datetime.now(timezone.utc)
+            operations.append(UpdateOne({"task_id": execution_id}, update_query, upsert=is_new))
+        
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def _release_in_flight_keys_postgres(self, task_ids: list):
+        """Clear the in-flight keys of the given tasks in PostgreSQL."""
+        session = self.db_client()
+        try:
+            stmt = update(CeleryTaskExecutionPG).where(
+                CeleryTaskExecutionPG.task_id.in_(task_ids),
+                CeleryTaskExecutionPG.in_flight_key.is_not(None)
+            ).values(in_flight_key=None)
+            await session.execute(stmt)
+            await session.commit()
+        finally:
+            await session.close()
+
+    async def _release_in_flight_keys_mongo(self, task_ids: list):
+        """Clear the in-flight keys of the given tasks in MongoDB."""
+        await self.init_mongo_collection()
+        
+        await self.collection.update_many(
+            {"task_id": {"$in": task_ids}, "in_flight_key": {"$exists": True}},
+            {"$unset": {"in_flight_key": ""}}
+        )
+
     async def _update_task_status_postgres(self, execution_id: int, status: str, result: dict = None):
         """Update task status and result in PostgreSQL."""
         session = self.db_client()
@@ -165,10 +571,13 @@ class IdempotencyManager:
             task_record = await session.get(CeleryTaskExecutionPG, execution_id)
             if task_record:
                 task_record.status = status
+                if status == 'STARTED':
+                    task_record.started_at = datetime.now(timezone.utc)
                 if result:
                     task_record.result = result
                 if status in ['SUCCESS', 'FAILURE']:
                     task_record.completed_at = datetime.now(timezone.utc)
+                    task_record.in_flight_key = None
                 await session.commit()
         finally:
             await session.close()
@@ -181,14 +590,18 @@ class IdempotencyManager:
             "status": status,
             "updated_at": datetime.now(timezone.utc)
         }
+        if status == 'STARTED':
+            update_data["started_at"] = update_data["updated_at"]
         if result:
             update_data["result"] = result
+        update_query = {"$set": update_data}
         if status in ['SUCCESS', 'FAILURE']:
             update_data["completed_at"] = datetime.now(timezone.utc)
+            update_query["$unset"] = {"in_flight_key": ""}
         
         await self.collection.update_one(
             {"_id": execution_id},
-            {"$set": update_data}
+            update_query
         )
 
     async def _get_existing_task_postgres(self, task_name: str, task_args: dict, task_id: str) -> CeleryTaskExecutionPG:
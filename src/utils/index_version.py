@@ -0,0 +1,44 @@
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger('uvicorn')
+
+
+class IndexVersionStore:
+    """
+    Index version of every collection: a Redis counter bumped after its vectors
+    were written. In-process state built from a collection (the memory tier of
+    tiered routing, the semantic answer cache) compares it on revalidation, so a
+    reindex that ends with the same record count is still picked up by every
+    process.
+    """
+    def __init__(self, 
+                 redis_url: str, 
+                 key_prefix: str="minirag:index_version"):
+        
+        self.client = redis.from_url(redis_url)
+        self.key_prefix = key_prefix
+    
+    def _version_key(self, collection_name: str) -> str:
+        return f"{self.key_prefix}:{collection_name}"
+    
+    async def get_version(self, collection_name: str) -> Optional[int]:
+        """Returns None when Redis is unavailable, so callers treat the collection as changed."""
+        try:
+            index_version = await self.client.get(self._version_key(collection_name))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read the index version of {collection_name}: {str(e)}")
+            return None
+        return int(index_version) if index_version else 0
+    
+    async def bump(self, collection_name: str) -> Optional[int]:
+        try:
+            return await self.client.incr(self._version_key(collection_name))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to bump the index version of {collection_name}: {str(e)}")
+            return None
+    
+    async def close(self):
+        await self.client.aclose()
@@ -1,28 +1,72 @@
 import time
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi.responses import JSONResponse
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from fastapi import FastAPI, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Define Prometheus metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
+REQUESTS_IN_PROGRESS = Gauge('http_requests_in_progress', 'HTTP Requests being handled', ['method'])
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'HTTP Response body size', ['method', 'endpoint'],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+)
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response: JSONResponse = await call_next(request)
-        process_time = time.time() - start_time
+# stages of the RAG request path, labelled by backend (client class) and model
+STAGE_LATENCY = Histogram(
+    'rag_stage_duration_seconds', 'RAG request stage latency', ['stage', 'backend', 'model'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
 
-        REQUEST_COUNT.labels(method=request.method, endpoint=request.url.path, status=response.status_code).inc()
-        REQUEST_LATENCY.labels(method=request.method, endpoint=request.url.path).observe(process_time)
+# requests that match no route share one label instead of one per probed path
+UNMATCHED_ENDPOINT = "<unmatched>"
 
-        return response
+class PrometheusMiddleware:
+    """
+    Pure ASGI middleware, so streaming responses pass through untouched.
+    Requests are labelled by route template (e.g. /api/v1/nlp/index/answer/{project_id}),
+    which keeps the label set bounded by the number of routes, not of projects.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+        
+        REQUESTS_IN_PROGRESS.labels(method=method).inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_time = time.perf_counter() - start_time
+            REQUESTS_IN_PROGRESS.labels(method=method).dec()
+            
+            # the router stores the matched route in the scope
+            route = scope.get("route")
+            endpoint = getattr(route, "path", UNMATCHED_ENDPOINT)
+            
+            REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=status_code).inc()
+            REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(process_time)
+            RESPONSE_SIZE.labels(method=method, endpoint=endpoint).observe(response_size)
+
 
 def setup_metrics(app: FastAPI):
     app.add_middleware(PrometheusMiddleware)
-
+    
     @app.get("/minirag-metrics-monafe301", include_in_schema=False)
     async def metrics():
         return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Union
+
+from models.models.BaseDataModel import BaseDataModel
+
+
+class ProjectCache:
+    """
+    Bounded TTL cache of project records for the read paths; concurrent misses
+    for the same project share one database read. Missing projects are not
+    cached, and are never created from here.
+    """
+    def __init__(self, 
+                 project_model: BaseDataModel, 
+                 max_size: int=1024, 
+                 ttl_seconds: int=300):
+        
+        self.project_model = project_model
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        
+        # project_id -> (expires_at, project), least recently used first
+        self._projects = OrderedDict()
+        self._in_flight = {}
+    
+    async def _load_project(self, project_id: Union[int, str]):
+        try:
+            project = await self.project_model.get_project(project_id=project_id)
+        finally:
+            is_current = self._in_flight.get(project_id) is asyncio.current_task()
+            if is_current:
+                del self._in_flight[project_id]
+        
+        # a read that started before an invalidation is not cached
+        if is_current and project is not None:
+            self._projects[project_id] = (time.monotonic() + self.ttl_seconds, project)
+            while len(self._projects) > self.max_size:
+                self._projects.popitem(last=False)
+        
+        return project
+    
+    async def get_project(self, project_id: Union[int, str]):
+        entry = self._projects.get(project_id)
+        if entry is not None:
+            expires_at, project = entry
+            if expires_at > time.monotonic():
+                self._projects.move_to_end(project_id)
+                return project
+            del self._projects[project_id]
+        
+        in_flight = self._in_flight.get(project_id)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(self._load_project(project_id))
+            self._in_flight[project_id] = in_flight
+        
+        # shielded, a cancelled request must not cancel the read other requests wait for
+        return await asyncio.shield(in_flight)
+    
+    def invalidate(self, project_id: Union[int, str]):
+        self._projects.pop(project_id, None)
+        self._in_flight.pop(project_id, None)
+    
+    def clear(self):
+        self._projects.clear()
+        self._in_flight.clear()
@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+import redis.asyncio as redis
+from prometheus_client import Counter
+
+from models.enums import ResponseCacheResultEnum
+from utils.index_version import IndexVersionStore
+
+logger = logging.getLogger('uvicorn')
+
+RESPONSE_CACHE_LOOKUPS = Counter(
+    'response_cache_lookups_total',
+    'Exact-match answer response cache lookups',
+    ['result']
+)
+
+
+class ResponseCache:
+    """
+    Exact-match cache of answer responses: an in-process L1 tier in front of Redis.
+    
+    Keys hold the collection's index version (IndexVersionStore), which the
+    indexing task bumps once the project is reindexed, so stale responses are
+    never read again and expire with their TTL. Concurrent identical requests of
+    the process wait for a single computation, which runs in its own task so
+    that no cancelled request cancels it for the others.
+    """
+    def __init__(self, 
+                 redis_url: str, 
+                 index_versions: IndexVersionStore, 
+                 ttl_seconds: int=86400, 
+                 l1_max_entries: int=1024, 
+                 key_prefix: str="minirag:answer"):
+        
+        self.client = redis.from_url(redis_url)
+        self.index_versions = index_versions
+        self.ttl_seconds = ttl_seconds
+        self.l1_max_entries = l1_max_entries
+        self.key_prefix = key_prefix
+        
+        # key -> (expires_at, response), least recently used first
+        self._l1 = OrderedDict()
+        self._in_flight = {}
+    
+    def make_key(self, collection_name: str, index_version: int, **params) -> str:
+        params_hash = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.key_prefix}:{collection_name}:{index_version}:{params_hash}"
+    
+    def _get_l1(self, key: str) -> Optional[dict]:
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._l1[key]
+            return None
+        
+        self._l1.move_to_end(key)
+        return response
+    
+    def _set_l1(self, key: str, response: dict, ttl_seconds: float):
+        self._l1[key] = (time.monotonic() + ttl_seconds, response)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_max_entries:
+            self._l1.popitem(last=False)
+    
+    async def _get(self, key: str) -> Tuple[Optional[dict], Optional[str]]:
+        response = self._get_l1(key)
+        if response is not None:
+            return response, ResponseCacheResultEnum.L1_HIT.value
+        
+        raw_response = await self.client.get(key)
+        if raw_response is None:
+            return None, None
+        
+        response = json.loads(raw_response)
+        # never keep it in L1 past its Redis expiry
+        ttl_seconds = await self.client.ttl(key)
+        self._set_l1(key, response, ttl_seconds if ttl_seconds > 0 else self.ttl_seconds)
+        return response, ResponseCacheResultEnum.REDIS_HIT.value
+    
+    async def _set(self, key: str, response: dict):
+        self._set_l1(key, response, self.ttl_seconds)
+        await self.client.set(key, json.dumps(response, default=str), ex=self.ttl_seconds)
+    
+    async def _compute_and_store(self, 
+                                 key: str, 
+                                 compute: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        try:
+            response = await compute()
+            if response is not None:
+                try:
+                    await self._set(key, response)
+                except redis.RedisError as e:
+                    logger.warning(f"Could not store the answer response in Redis: {str(e)}")
+            return response
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+    
+    async def get_or_compute(self, 
+                             collection_name: str, 
+                             params: dict, 
+                             compute: Callable[[], Awaitable[Optional[dict]]]) -> Tuple[Optional[dict], str]:
+        """
+        Returns:
+            Tuple of (response, result); result is a ResponseCacheResultEnum value.
+            Responses computed as None are not cached.
+        """
+        try:
+            index_version = await self.index_versions.get_version(collection_name)
+            if index_version is None:
+                raise redis.RedisError(f"index version of {collection_name} is unavailable")
+            key = self.make_key(collection_name, index_version, **params)
+            response, result = await self._get(key)
+        except redis.RedisError as e:
+            # without the index version a cached response may be stale, answer uncached
+            logger.warning(f"Response cache unavailable, computing the answer uncached: {str(e)}")
+            RESPONSE_CACHE_LOOKUPS.labels(result=ResponseCacheResultEnum.BYPASS.value).inc()
+            return await compute(), ResponseCacheResultEnum.BYPASS.value
+        
+        if response is not None:
+            RESPONSE_CACHE_LOOKUPS.labels(result=result).inc()
+            return response, result
+        
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            result = ResponseCacheResultEnum.COALESCED.value
+        else:
+            result = ResponseCacheResultEnum.MISS.value
+            in_flight = asyncio.ensure_future(self._compute_and_store(key, compute))
+            self._in_flight[key] = in_flight
+        
+        RESPONSE_CACHE_LOOKUPS.labels(result=result).inc()
+        # shielded, a cancelled request must not cancel the computation other requests wait for
+        return await asyncio.shield(in_flight), result
+    
+    async def close(self):
+        await self.client.aclose()
+        await self.index_versions.close()
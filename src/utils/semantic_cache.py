@@ -0,0 +1,169 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional, Union
+
+import numpy as np
+from prometheus_client import Counter
+
+from utils.index_version import IndexVersionStore
+
+SEMANTIC_CACHE_LOOKUPS = Counter(
+    'semantic_cache_lookups_total',
+    'Semantic answer cache lookups',
+    ['result']
+)
+
+
+class ProjectCacheState:
+    def __init__(self, index_version: int):
+        # answers are only valid for the index they were generated from
+        self.index_version = index_version
+        self.vectors = None
+        self.params_keys = []
+        self.created_at = []
+        self.answers = []
+        self.hits = 0
+        self.misses = 0
+
+
+class SemanticAnswerCache:
+    """
+    Per-project cache of generated answers, looked up by the cosine similarity
+    of the query embedding against the embeddings of already answered queries.
+    
+    Entries expire after ttl_seconds, or the project's entry in
+    project_ttl_seconds. A project's entries are dropped when the index version
+    of its collection changes (the indexing task bumps it once the project was
+    reindexed) or when invalidate is called.
+    """
+    def __init__(self, 
+                 similarity_threshold: float=0.95, 
+                 ttl_seconds: int=3600, 
+                 max_entries: int=1000, 
+                 max_projects: int=256, 
+                 project_ttl_seconds: dict=None, 
+                 index_versions: IndexVersionStore=None):
+        
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_projects = max_projects
+        # project_id (as a string) -> TTL overriding ttl_seconds
+        self.project_ttl_seconds = project_ttl_seconds or {}
+        self.index_versions = index_versions
+        
+        # project_id -> ProjectCacheState, least recently used first
+        self._projects = OrderedDict()
+    
+    @staticmethod
+    def make_params_key(**params) -> str:
+        """Answers only match queries asked with the same generation and retrieval parameters."""
+        return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _normalize(self, vector: list) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    async def get_index_version(self, collection_name: str) -> Optional[int]:
+        """Returns None when the version cannot be read; the cache is then skipped."""
+        if self.index_versions is None:
+            return 0
+        return await self.index_versions.get_version(collection_name)
+    
+    def get_ttl_seconds(self, project_id: Union[int, str]) -> int:
+        return self.project_ttl_seconds.get(str(project_id), self.ttl_seconds)
+    
+    def _get_state(self, project_id: Union[int, str], index_version: int) -> ProjectCacheState:
+        state = self._projects.get(project_id)
+        if state is None or state.index_version != index_version:
+            state = ProjectCacheState(index_version=index_version)
+            self._projects[project_id] = state
+        
+        self._projects.move_to_end(project_id)
+        while len(self._projects) > self.max_projects:
+            self._projects.popitem(last=False)
+        return state
+    
+    def _drop_expired(self, state: ProjectCacheState, ttl_seconds: int):
+        now = time.monotonic()
+        keep = [idx for idx, created_at in enumerate(state.created_at) if now - created_at < ttl_seconds]
+        if len(keep) == len(state.created_at):
+            return
+        
+        state.vectors = state.vectors[keep] if keep else None
+        state.params_keys = [state.params_keys[idx] for idx in keep]
+        state.created_at = [state.created_at[idx] for idx in keep]
+        state.answers = [state.answers[idx] for idx in keep]
+    
+    def lookup(self, 
+               project_id: Union[int, str], 
+               query_vector: list, 
+               index_version: int, 
+               params_key: str) -> Optional[dict]:
+        
+        state = self._get_state(project_id, index_version)
+        self._drop_expired(state, self.get_ttl_seconds(project_id))
+        
+        answer = None
+        if state.vectors is not None:
+            similarities = state.vectors @ self._normalize(query_vector)
+            similarities[np.asarray(state.params_keys) != params_key] = -np.inf
+            
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.similarity_threshold:
+                answer = state.answers[best]
+        
+        if answer is None:
+            state.misses += 1
+            SEMANTIC_CACHE_LOOKUPS.labels(result="miss").inc()
+            return None
+        
+        state.hits += 1
+        SEMANTIC_CACHE_LOOKUPS.labels(result="hit").inc()
+        return answer
+    
+    def store(self, 
+              project_id: Union[int, str], 
+              query_vector: list, 
+              index_version: int, 
+              params_key: str, 
+              answer: dict):
+        
+        state = self._get_state(project_id, index_version)
+        self._drop_expired(state, self.get_ttl_seconds(project_id))
+        
+        vector = self._normalize(query_vector)[None, :]
+        state.vectors = vector if state.vectors is None else np.vstack([state.vectors, vector])
+        state.params_keys.append(params_key)
+        state.created_at.append(time.monotonic())
+        state.answers.append(answer)
+        
+        if len(state.answers) > self.max_entries:
+            # entries are appended in creation order, the oldest go first
+            state.vectors = state.vectors[-self.max_entries:]
+            state.params_keys = state.params_keys[-self.max_entries:]
+            state.created_at = state.created_at[-self.max_entries:]
+            state.answers = state.answers[-self.max_entries:]
+    
+    def invalidate(self, project_id: Union[int, str]):
+        self._projects.pop(project_id, None)
+    
+    def get_stats(self, project_id: Union[int, str]) -> dict:
+        state = self._projects.get(project_id)
+        if state is None:
+            return {"entries": 0, "hits": 0, "misses": 0, "hit_rate": 0.0}
+        
+        lookups = state.hits + state.misses
+        return {
+            "entries": len(state.answers),
+            "hits": state.hits,
+            "misses": state.misses,
+            "hit_rate": round(state.hits / lookups, 4) if lookups else 0.0
+        }
+    
+    async def close(self):
+        if self.index_versions:
+            await self.index_versions.close()
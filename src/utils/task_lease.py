@@ -0,0 +1,100 @@
+import json
+import asyncio
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger('celery.task')
+
+# SET NX PX that returns the holder when the lease is taken, in one round trip
+ACQUIRE_LEASE_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if holder then
+    return holder
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return false
+"""
+
+# only the holder of a lease renews or releases it
+RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class TaskLeaseStore:
+    """
+    Redis leases of running jobs, one per task name and args hash, and the last
+    known state of every task. A lease expires lease_ms after its last renewal,
+    so a job whose worker died is detected within seconds instead of after the
+    task time limit.
+    """
+    def __init__(self, 
+                 redis_url: str, 
+                 lease_ms: int=60000, 
+                 state_ttl_seconds: int=86400, 
+                 key_prefix: str="minirag:idempotency"):
+        
+        self.client = redis.from_url(redis_url, decode_responses=True)
+        self.lease_ms = lease_ms
+        self.state_ttl_seconds = state_ttl_seconds
+        self.key_prefix = key_prefix
+        
+        self._acquire_lease = self.client.register_script(ACQUIRE_LEASE_SCRIPT)
+        self._renew_lease = self.client.register_script(RENEW_LEASE_SCRIPT)
+        self._release_lease = self.client.register_script(RELEASE_LEASE_SCRIPT)
+    
+    def _lease_key(self, args_hash: str) -> str:
+        return f"{self.key_prefix}:lease:{args_hash}"
+    
+    def _state_key(self, task_id: str) -> str:
+        return f"{self.key_prefix}:state:{task_id}"
+    
+    async def acquire(self, args_hash: str, task_id: str) -> Optional[str]:
+        """Takes the lease for task_id; returns None when taken, else the task_id holding it."""
+        return await self._acquire_lease(keys=[self._lease_key(args_hash)], args=[task_id, self.lease_ms])
+    
+    async def renew(self, args_hash: str, task_id: str) -> bool:
+        return bool(await self._renew_lease(keys=[self._lease_key(args_hash)], args=[task_id, self.lease_ms]))
+    
+    async def release(self, args_hash: str, task_id: str):
+        await self._release_lease(keys=[self._lease_key(args_hash)], args=[task_id])
+    
+    async def get_holder(self, args_hash: str) -> Optional[str]:
+        return await self.client.get(self._lease_key(args_hash))
+    
+    async def keep_alive(self, args_hash: str, task_id: str):
+        """
+        Renews the lease every third of its duration until cancelled. The renewals
+        run on the task's event loop, so lease_ms has to outlast its longest
+        blocking step (e.g. embedding one batch).
+        """
+        while True:
+            await asyncio.sleep(self.lease_ms / 3000)
+            try:
+                if not await self.renew(args_hash, task_id):
+                    logger.warning(f"Lease of task {task_id} was lost, an identical job may start.")
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew the lease of task {task_id}: {str(e)}")
+    
+    async def set_state(self, task_id: str, state: dict):
+        await self.client.set(self._state_key(task_id), json.dumps(state, default=str), ex=self.state_ttl_seconds)
+    
+    async def get_state(self, task_id: str) -> Optional[dict]:
+        state = await self.client.get(self._state_key(task_id))
+        return json.loads(state) if state else None
+    
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,134 @@
+import json
+import time
+import logging
+from typing import AsyncIterator, Optional
+
+import redis.asyncio as redis
+from celery import states
+
+logger = logging.getLogger('celery.task')
+
+# state of the batch-level updates, before the task reaches one of celery's ready states
+PROGRESS_STATE = "PROGRESS"
+
+
+class TaskProgressChannel:
+    """
+    Batch-level progress of Celery tasks over Redis. Every update is published on
+    the task's pub/sub channel and kept as the task's latest progress for the TTL,
+    so clients that connect late, or only ask for the status, still get it.
+    """
+    def __init__(self, 
+                 redis_url: str, 
+                 ttl_seconds: int=3600, 
+                 key_prefix: str="minirag:task_progress"):
+        
+        self.client = redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+    
+    def _channel_name(self, task_id: str) -> str:
+        return f"{self.key_prefix}:channel:{task_id}"
+    
+    def _latest_key(self, task_id: str) -> str:
+        return f"{self.key_prefix}:latest:{task_id}"
+    
+    async def publish(self, task_id: str, progress: dict):
+        payload = json.dumps(progress, default=str)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(self._latest_key(task_id), payload, ex=self.ttl_seconds)
+            pipe.publish(self._channel_name(task_id), payload)
+            await pipe.execute()
+    
+    async def get_latest(self, task_id: str) -> Optional[dict]:
+        payload = await self.client.get(self._latest_key(task_id))
+        return json.loads(payload) if payload else None
+    
+    async def subscribe(self, task_id: str, heartbeat_seconds: float=15.0) -> AsyncIterator[Optional[dict]]:
+        """
+        Yields the latest progress, then every update until the task reaches a ready
+        state; yields None when no update came within heartbeat_seconds.
+        """
+        pubsub = self.client.pubsub()
+        
+        # subscribed before the latest progress is read, so no update falls in between
+        await pubsub.subscribe(self._channel_name(task_id))
+        try:
+            progress = await self.get_latest(task_id)
+            if progress is not None:
+                yield progress
+                if progress.get("state") in states.READY_STATES:
+                    return
+            
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat_seconds)
+                if message is None:
+                    yield None
+                    continue
+                
+                progress = json.loads(message["data"])
+                yield progress
+                if progress.get("state") in states.READY_STATES:
+                    return
+        finally:
+            await pubsub.unsubscribe(self._channel_name(task_id))
+            await pubsub.aclose()
+    
+    async def close(self):
+        await self.client.aclose()
+
+
+class TaskProgressReporter:
+    """
+    Publishes the progress of one task run, with its processing rate since the
+    reporter was created. Progress is best effort: a failed publish never fails
+    the task.
+    """
+    def __init__(self, 
+                 channel: TaskProgressChannel, 
+                 task_id: str, 
+                 task_name: str, 
+                 stage: str, 
+                 unit: str="chunk"):
+        
+        self.channel = channel
+        self.task_id = task_id
+        self.task_name = task_name
+        self.stage = stage
+        self.unit = unit
+        self.processed = 0
+        self.total = None
+        self.start_time = time.perf_counter()
+    
+    async def update(self, 
+                     processed: int, 
+                     total: int=None, 
+                     state: str=PROGRESS_STATE, 
+                     **extra):
+        
+        self.processed = processed
+        if total is not None:
+            self.total = total
+        
+        elapsed = time.perf_counter() - self.start_time
+        progress = {
+            "task_id": self.task_id,
+            "task_name": self.task_name,
+            "state": state,
+            "stage": self.stage,
+            "processed": self.processed,
+            "total": self.total,
+            "unit": self.unit,
+            "rate": round(self.processed / elapsed, 2) if elapsed > 0 else None,
+            "elapsed_seconds": round(elapsed, 2),
+            "updated_at": time.time(),
+            **extra
+        }
+        
+        try:
+            await self.channel.publish(self.task_id, progress)
+        except Exception as e:
+            logger.warning(f"Failed to publish the progress of task {self.task_id}: {str(e)}")
+    
+    async def finish(self, state: str=states.SUCCESS, **extra):
+        await self.update(processed=self.processed, state=state, **extra)
@@ -0,0 +1,73 @@
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+from fastapi import FastAPI
+
+from .metrics import STAGE_LATENCY
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+logger = logging.getLogger('uvicorn')
+
+_tracer = trace.get_tracer("minirag") if trace else None
+
+
+class StageTimer:
+    def __init__(self):
+        self.elapsed_ms = None
+
+
+def get_backend_name(client) -> str:
+    return type(client).__name__ if client is not None else ""
+
+
+@contextmanager
+def observe_stage(stage: str, backend: str="", model: str=""):
+    """
+    Times one stage of the request path into the rag_stage_duration_seconds
+    histogram and, with OpenTelemetry installed, wraps it in a span that is a
+    child of the current one (the route span when tracing is set up).
+    """
+    timer = StageTimer()
+    span = nullcontext()
+    if _tracer:
+        span = _tracer.start_as_current_span(
+            f"rag.{stage}",
+            attributes={"rag.stage": stage, "rag.backend": backend, "rag.model": model or ""}
+        )
+    
+    start_time = time.perf_counter()
+    with span:
+        try:
+            yield timer
+        finally:
+            elapsed = time.perf_counter() - start_time
+            timer.elapsed_ms = round(elapsed * 1000, 2)
+            STAGE_LATENCY.labels(stage=stage, backend=backend, model=model or "").observe(elapsed)
+
+
+def setup_tracing(app: FastAPI, settings):
+    """Exports route spans, with their stage spans, over OTLP when OTEL_ENABLED is set."""
+    if not settings.OTEL_ENABLED:
+        return
+    
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError:
+        logger.warning("OTEL_ENABLED is set but the OpenTelemetry packages are not installed; tracing is disabled.")
+        return
+    
+    tracer_provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT)))
+    trace.set_tracer_provider(tracer_provider)
+    
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=tracer_provider)
+    logger.info(f"✅ Tracing exported to: {settings.OTEL_EXPORTER_OTLP_ENDPOINT}")
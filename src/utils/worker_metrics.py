@@ -0,0 +1,140 @@
+import os
+import glob
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+
+from celery import signals
+from prometheus_client import Counter, Histogram, CollectorRegistry, REGISTRY, start_http_server
+
+from helpers.config import get_settings
+
+logger = logging.getLogger("celery.worker")
+
+# Define Prometheus metrics of the Celery workers
+TASK_DURATION = Histogram(
+    'celery_task_duration_seconds', 'Celery task run time', ['task', 'state'],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+)
+TASK_QUEUE_WAIT = Histogram(
+    'celery_task_queue_wait_seconds', 'Time a task waited in its queue before a worker started it', ['task', 'queue'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+)
+TASK_RETRIES = Counter('celery_task_retries_total', 'Celery task retries', ['task'])
+
+# chunks per second are rate() of these
+CHUNKS_PROCESSED = Counter('celery_chunks_processed_total', 'Chunks created from files and stored', ['task'])
+CHUNKS_INDEXED = Counter('celery_chunks_indexed_total', 'Chunks embedded and upserted into the vector db', ['task', 'backend'])
+
+# one observation per batch and stage (embedding, upsert)
+INDEXING_BATCH_LATENCY = Histogram(
+    'celery_indexing_batch_duration_seconds', 'Latency of one indexing batch stage', ['stage', 'backend'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+# header stamped when a task is published, read back when a worker starts it
+ENQUEUED_AT_HEADER = "enqueued_at"
+
+_task_start_times = {}
+
+
+@contextmanager
+def observe_indexing_batch(stage: str, backend: str=""):
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        INDEXING_BATCH_LATENCY.labels(stage=stage, backend=backend).observe(time.perf_counter() - start_time)
+
+
+def _get_ready_time(headers: dict) -> float:
+    """A task published with a countdown or eta only starts waiting at its eta."""
+    enqueued_at = headers.get(ENQUEUED_AT_HEADER)
+    eta = headers.get("eta")
+    if enqueued_at is None or not eta:
+        return enqueued_at
+    
+    try:
+        return max(enqueued_at, datetime.fromisoformat(eta).timestamp())
+    except (TypeError, ValueError):
+        return enqueued_at
+
+
+def _on_before_task_publish(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(ENQUEUED_AT_HEADER, time.time())
+
+
+def _on_task_prerun(task_id=None, task=None, **kwargs):
+    _task_start_times[task_id] = time.perf_counter()
+    
+    request = task.request
+    headers = {
+        ENQUEUED_AT_HEADER: getattr(request, ENQUEUED_AT_HEADER, None),
+        "eta": request.eta,
+    }
+    if headers[ENQUEUED_AT_HEADER] is None:
+        headers[ENQUEUED_AT_HEADER] = (request.headers or {}).get(ENQUEUED_AT_HEADER)
+    
+    ready_at = _get_ready_time(headers)
+    if ready_at is not None:
+        queue = (request.delivery_info or {}).get("routing_key") or ""
+        TASK_QUEUE_WAIT.labels(task=task.name, queue=queue).observe(max(time.time() - ready_at, 0.0))
+
+
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    start_time = _task_start_times.pop(task_id, None)
+    if start_time is not None:
+        TASK_DURATION.labels(task=task.name, state=state or "UNKNOWN").observe(time.perf_counter() - start_time)
+
+
+def _on_task_retry(sender=None, **kwargs):
+    TASK_RETRIES.labels(task=sender.name).inc()
+
+
+def _on_worker_init(**kwargs):
+    """
+    Serves the metrics of every pool process from the main worker process. Prefork
+    children write their samples under PROMETHEUS_MULTIPROC_DIR, which has to be
+    set in the worker environment before it starts.
+    """
+    settings = get_settings()
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        from prometheus_client import multiprocess
+        
+        # samples of a previous worker run would be summed in otherwise
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for db_file in glob.glob(os.path.join(multiproc_dir, "*.db")):
+            os.remove(db_file)
+        
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        logger.warning("PROMETHEUS_MULTIPROC_DIR is not set; only the metrics of the main worker process are served.")
+        registry = REGISTRY
+    
+    start_http_server(settings.CELERY_METRICS_PORT, registry=registry)
+    logger.info(f"✅ Worker metrics served on port: {settings.CELERY_METRICS_PORT}")
+
+
+def _on_worker_process_shutdown(pid=None, **kwargs):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def setup_worker_metrics(settings):
+    """
+    Task metrics are recorded wherever the Celery app is loaded (publishers stamp
+    the enqueue time); the worker serves them when CELERY_METRICS_PORT is set.
+    """
+    signals.before_task_publish.connect(_on_before_task_publish, weak=False)
+    signals.task_prerun.connect(_on_task_prerun, weak=False)
+    signals.task_postrun.connect(_on_task_postrun, weak=False)
+    signals.task_retry.connect(_on_task_retry, weak=False)
+    
+    if settings.CELERY_METRICS_PORT:
+        signals.worker_init.connect(_on_worker_init, weak=False)
+        signals.worker_process_shutdown.connect(_on_worker_process_shutdown, weak=False)